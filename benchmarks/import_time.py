@@ -0,0 +1,62 @@
+"""
+パッケージの読み込みにかかる時間を計測する
+
+    python benchmarks/import_time.py [-n 回数] [モジュール ...]
+
+モジュールごとに新しい Python プロセスで import し、読み込みにかかった時間の中央値と、
+requests が読み込まれたかどうかを表示する。
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+DEFAULT_MODULES = [
+    'pybacklogpy',
+    'pybacklogpy.Issue',
+    'pybacklogpy.BacklogClient',
+    'pybacklogpy.harvest',
+    'requests',
+]
+
+_SCRIPT = """
+import sys
+import time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, 'requests' in sys.modules)
+"""
+
+
+def measure(module: str, number: int) -> tuple:
+    """
+    :param module: 計測するモジュール
+    :param number: 計測する回数
+    :return: (読み込み時間の中央値(秒), requests が読み込まれたかどうか)
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    times = []
+    loaded = False
+    for _ in range(number):
+        output = subprocess.check_output([sys.executable, '-c', _SCRIPT.format(module=module)], env=env)
+        elapsed, loaded = output.decode('utf-8').split()
+        times.append(float(elapsed))
+    return statistics.median(times), loaded == 'True'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('-n', '--number', type=int, default=20, help='モジュールごとの計測回数')
+    args = parser.parse_args()
+    for module in args.modules:
+        elapsed, loaded = measure(module, args.number)
+        print('{module:<30} {elapsed:8.1f} ms  requests: {loaded}'.format(
+            module=module, elapsed=elapsed * 1000, loaded='loaded' if loaded else 'not loaded'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+ローカルのモックサーバーに対して課題の取得・更新を並行に行い、スループットを計測する
+
+    python benchmarks/mock_server.py [-n 件数] [-w スレッド数] [--latency 秒数] [--error-rate 割合]
+
+モックサーバーは同じプロセスで起動し、レート制限は無効にする (クライアント側の待ち時間を除いて計測する)。
+random_seed を固定しているため、同じ引数で実行すれば同じリクエストにエラーが返る。
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pybacklogpy.Issue import Issue, IssueType  # noqa: E402
+from pybacklogpy.mockserver import MockBacklogServer  # noqa: E402
+from pybacklogpy.modules import RequestSender  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--number', type=int, default=200, help='取得・更新する課題の件数')
+    parser.add_argument('-w', '--workers', type=int, default=8, help='同時にリクエストを送るスレッド数')
+    parser.add_argument('--latency', type=float, default=0.02, help='サーバーがレスポンスを返す前に待つ秒数')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='サーバーが 503 を返すリクエストの割合')
+    args = parser.parse_args()
+
+    server = MockBacklogServer(latency=args.latency, error_rate=args.error_rate, random_seed=0,
+                               rate_limits={'read': 10 ** 9, 'update': 10 ** 9, 'search': 10 ** 9})
+    with server:
+        project = server.state.add_project('BENCH', 'ベンチマーク')
+        config = server.configure()
+        config.request_sender = RequestSender(config)
+        config.request_sender.rate_limiter = None
+        issue = Issue(config)
+        issue_type_id = IssueType(config).get_issue_type_list(project_id_or_key='BENCH').json()[0]['id']
+        server.error_rate, error_rate = 0.0, server.error_rate
+        keys = [issue.add_issue(project_id=project['id'], summary='課題 {i}'.format(i=i),
+                                issue_type_id=issue_type_id, priority_id=3).json()['issueKey']
+                for i in range(args.number)]
+        server.error_rate = error_rate
+
+        for name, call in [('get_issue', lambda key: issue.get_issue(issue_id_or_key=key)),
+                           ('update_issue', lambda key: issue.update_issue(issue_id_or_key=key, status_id=2))]:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.workers) as executor:
+                responses = list(executor.map(call, keys))
+            elapsed = time.perf_counter() - start
+            print('{name:<14} {count} requests in {elapsed:.2f} s ({rate:.1f} req/s, {failed} failed)'.format(
+                name=name, count=len(keys), elapsed=elapsed, rate=len(keys) / elapsed,
+                failed=sum(1 for response in responses if not response.ok)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+カセットに記録したリクエストを再生し、通信を除いたライブラリの処理速度を計測する
+
+    python benchmarks/replay.py カセット [-n 回数] [-w スレッド数] [--latency 秒数] [--recorded-latency]
+
+カセットに記録された全てのリクエストを RequestSender から送り直し、1秒あたりのリクエスト数を表示する。
+通信は行わないため、ネットワークに繋がっていない環境でも実行できる。
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pybacklogpy.BacklogConfigure import BacklogConfigure  # noqa: E402
+from pybacklogpy.cassette import Cassette, ReplayTransport  # noqa: E402
+from pybacklogpy.modules import RequestSender  # noqa: E402
+
+
+def send(rs: RequestSender, request: dict):
+    """
+    :param rs: RequestSender
+    :param request: カセットに記録されたリクエスト
+    """
+    send_request = getattr(rs, 'send_{method}_request'.format(method=request['method'].lower()))
+    if request['method'] == 'GET':
+        send_request(request['path'], request['params'])
+    else:
+        send_request(request['path'], request['data'] or {})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('cassette')
+    parser.add_argument('-n', '--number', type=int, default=10, help='カセット全体を再生する回数')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='同時にリクエストを送るスレッド数')
+    parser.add_argument('--latency', type=float, default=0.0, help='レスポンスを返す前に待つ秒数')
+    parser.add_argument('--recorded-latency', action='store_true', help='記録した時にかかった秒数も待つ')
+    args = parser.parse_args()
+
+    cassette = Cassette(args.cassette)
+    requests = [interaction['request'] for interaction in cassette.interactions()] * args.number
+    transport = ReplayTransport(cassette, latency=args.latency, recorded_latency=args.recorded_latency)
+    rs = RequestSender(BacklogConfigure.from_host('example.backlog.com', 'dummy'),
+                       transport=transport)
+    rs.rate_limiter = None  # 記録した時の間隔ではなく、ライブラリの処理速度を計測する
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(lambda request: send(rs, request), requests))
+    elapsed = time.perf_counter() - start
+    print('{count} requests in {elapsed:.2f} s ({rate:.1f} req/s)'.format(
+        count=len(requests), elapsed=elapsed, rate=len(requests) / elapsed if elapsed else 0.0))
+
+
+if __name__ == '__main__':
+    main()
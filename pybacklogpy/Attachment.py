@@ -1,29 +1,77 @@
-from requests import Response
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+import os
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.modules import get_request_sender
+from pybacklogpy.upload import MultipartStream, Source, UploadProgress
 
 
 class Attachment:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'space'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def post_attachment_file(self,
-                             filepath: str,
-                             filename: str) -> Response:
+                             filepath: Source,
+                             filename: str,
+                             progress: Optional[UploadProgress] = None) -> 'Response':
         """
         添付ファイルの送信
         https://developer.nulab.com/ja/docs/backlog/api/2/post-attachment-file/
 
-        :param filepath: 添付ファイルのパス
+        ファイルは全体をメモリに読み込まず、少しずつ読み込みながら送信する
+
+        :param filepath: 添付ファイルのパス (ファイルオブジェクト、 bytes / memoryview も指定できる)
         :param filename: 任意のファイル名
+        :param progress: 進捗を受け取る関数 (送信済みのバイト数, 全体のバイト数) が渡される
 
         :return: レスポンス
         """
 
         path = self.base_path + '/attachment'
-        files = {'file': (filename, open(filepath, 'rb'))}
-        return self.rs.post_file(path=path, files=files)
+        body = MultipartStream('file', filename, filepath, progress=progress)
+        try:
+            return self.rs.post_multipart(path=path, body=body)
+        finally:
+            body.close()
+
+    def post_attachment_files(self,
+                              files: List[Union[str, Tuple[str, Source]]],
+                              max_workers: int = 4,
+                              progress: Optional[UploadProgress] = None) -> List[int]:
+        """
+        複数の添付ファイルを並行して送信し、添付ファイルの ID を返す
+        返り値は Issue.add_issue や IssueComment.add_comment の attachment_id にそのまま渡せる
+
+        :param files: 添付ファイルのパス、または (ファイル名, 添付ファイルのパス・ファイルオブジェクト・データ) のリスト
+        :param max_workers: 同時に送信するファイル数の上限
+        :param progress: 進捗を受け取る関数 全てのファイルを合わせた (送信済みのバイト数, 全体のバイト数) が渡される
+
+        :return: 添付ファイルの ID のリスト (files と同じ順番)
+        :raises requests.exceptions.HTTPError: 送信に失敗したファイルがあった場合
+        """
+        path = self.base_path + '/attachment'
+        entries = [(os.path.basename(f), f) if isinstance(f, str) else f for f in files]
+        bodies = [MultipartStream('file', filename, source) for filename, source in entries]
+        total = sum(len(body) for body in bodies)
+        sent = [0] * len(bodies)
+
+        def send(index):
+            def file_progress(sent_bytes, _):
+                sent[index] = sent_bytes
+                progress(sum(sent), total)
+
+            body = bodies[index]
+            body.progress = file_progress if progress else None
+            try:
+                response = self.rs.post_multipart(path=path, body=body)
+            finally:
+                body.close()
+            response.raise_for_status()
+            return response.json()['id']
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(send, range(len(bodies))))
@@ -0,0 +1,83 @@
+import copy
+import importlib
+from typing import Optional
+
+from pybacklogpy.BacklogConfigure import BacklogConfigure, get_default_configure
+from pybacklogpy.modules import RequestSender
+from pybacklogpy.transport import Transport
+
+# 属性名: (モジュール名, クラス名)
+RESOURCES = {
+    'attachments': ('Attachment', 'Attachment'),
+    'categories': ('Category', 'Category'),
+    'custom_fields': ('CustomField', 'CustomField'),
+    'list_type_custom_fields': ('CustomField', 'ListTypeCustomField'),
+    'git_repositories': ('GitRepository', 'GitRepository'),
+    'issues': ('Issue', 'Issue'),
+    'issue_attachments': ('Issue', 'IssueAttachment'),
+    'issue_comments': ('Issue', 'IssueComment'),
+    'issue_shared_files': ('Issue', 'IssueSharedFile'),
+    'issue_types': ('Issue', 'IssueType'),
+    'licence': ('Licence', 'Licence'),
+    'notifications': ('Notification', 'Notification'),
+    'priorities': ('Priority', 'Priority'),
+    'projects': ('Project', 'Project'),
+    'project_teams': ('Project', 'ProjectTeam'),
+    'pull_requests': ('PullRequest', 'PullRequest'),
+    'pull_request_attachments': ('PullRequest', 'PullRequestAttachment'),
+    'pull_request_comments': ('PullRequest', 'PullRequestComment'),
+    'resolutions': ('Resolution', 'Resolution'),
+    'shared_files': ('SharedFile', 'SharedFile'),
+    'space': ('Space', 'Space'),
+    'stars': ('Star', 'Project'),
+    'statuses': ('Status', 'Status'),
+    'teams': ('Team', 'Team'),
+    'users': ('User', 'User'),
+    'versions': ('Version', 'Version'),
+    'watches': ('Watch', 'Watch'),
+    'webhooks': ('Webhook', 'Webhook'),
+    'wiki': ('Wiki', 'Wiki'),
+    'wiki_attachments': ('Wiki', 'WikiAttachment'),
+    'wiki_shared_files': ('Wiki', 'WikiSharedFile'),
+}
+
+
+class BacklogClient:
+    """
+    全ての API のクラスを1か所から使うための入り口
+
+    設定は生成時に1度だけ解決し、全ての API のクラスで1つの RequestSender (とコネクションプール) を共有する。
+    API のクラスは、属性 (client.issues, client.wiki, ...) が最初に参照された時にモジュールごと読み込んで生成する。
+    """
+
+    def __init__(self,
+                 config: Optional[BacklogConfigure] = None,
+                 transport: Optional[Transport] = None,
+                 **options):
+        """
+        :param config: 設定 指定が無い場合は環境変数・設定ファイルから読み込む (プロセス内で1度だけ)
+        :param transport: 通信に使う Transport 指定が無い場合はプロセス内で共有されるコネクションプールを使う
+        :param options: RequestSender に渡す引数 (rate_limiter, retry_policy, cache, validator_store, coalescer, metrics,
+            tracer)
+        """
+        config = config if config else get_default_configure()
+        if transport or options:
+            # 他のクラスが使っている RequestSender を置き換えないように、このクライアント専用の設定にする
+            config = copy.copy(config)
+            config.async_request_sender = None
+            config.request_sender = RequestSender(config, transport=transport, **options)
+        self.config = config
+
+    def __getattr__(self, name: str):
+        if name not in RESOURCES:
+            raise AttributeError("'{cls}' object has no attribute '{name}'".format(cls=type(self).__name__,
+                                                                                   name=name))
+        module_name, class_name = RESOURCES[name]
+        module = importlib.import_module('pybacklogpy.' + module_name)
+        resource = getattr(module, class_name)(self.config)
+        # 2回目以降は __getattr__ を通らずに同じインスタンスを返す
+        self.__dict__[name] = resource
+        return resource
+
+    def __dir__(self):
+        return sorted(set(super(BacklogClient, self).__dir__()) | set(RESOURCES))
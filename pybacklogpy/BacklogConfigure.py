@@ -1,7 +1,65 @@
+import configparser
+import os
+import threading
+from typing import Optional
+
+# 設定ファイルの既定のPATH (カレントディレクトリからの相対PATH)
+DEFAULT_CONFIG_FILE = 'secrets'
+
+# 設定に使う環境変数
+ENV_HOST = 'BACKLOG_HOST'
+ENV_API_KEY = 'BACKLOG_API_KEY'
+
+
 class BacklogConfigure:
     def __init__(self, space_key: str, api_key: str, domain: str):
         self.api_url = space_key + domain
         self.api_key = api_key
+        # API の URL のスキーム (ローカルのモックサーバーに接続する場合は http)
+        self.scheme = 'https'
+        # この設定から作られたクラス間で共有される RequestSender (modules.get_request_sender で生成される)
+        self.request_sender = None
+        # 非同期版 (pybacklogpy.aio) のクラス間で共有される AsyncRequestSender
+        self.async_request_sender = None
+
+    @classmethod
+    def from_host(cls, host: str, api_key: str, scheme: str = 'https') -> 'BacklogConfigure':
+        """
+        :param host: Backlog のホスト名 e.g.) kitadakyou.backlog.com
+        :param api_key: API キー
+        :param scheme: https または http
+        :return: 設定
+        """
+        if scheme not in {'https', 'http'}:
+            raise ValueError('scheme は https または http のみが使用できます')
+        config = BacklogConfigure(host, api_key, '')
+        config.scheme = scheme
+        return config
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_CONFIG_FILE) -> 'BacklogConfigure':
+        """
+        設定ファイル ([backlog] セクションの Host と ApiKey) から設定を読み込む
+        :param path: 設定ファイルのPATH
+        :return: 設定
+        """
+        config_file = configparser.ConfigParser()
+        config_file.read(path)
+        if not config_file.has_option('backlog', 'Host') or not config_file.has_option('backlog', 'ApiKey'):
+            raise ValueError('設定ファイル {path} に [backlog] の Host と ApiKey がありません'.format(path=path))
+        return cls.from_host(config_file['backlog']['Host'], config_file['backlog']['ApiKey'])
+
+    @classmethod
+    def from_env(cls) -> Optional['BacklogConfigure']:
+        """
+        環境変数 BACKLOG_HOST と BACKLOG_API_KEY から設定を読み込む
+        :return: 設定 どちらかが設定されていない場合は None
+        """
+        host = os.environ.get(ENV_HOST)
+        api_key = os.environ.get(ENV_API_KEY)
+        if not host or not api_key:
+            return None
+        return cls.from_host(host, api_key)
 
 
 class BacklogComConfigure(BacklogConfigure):
@@ -17,3 +75,24 @@ class BacklogJpConfigure(BacklogConfigure):
 class BacklogToolConfigure(BacklogConfigure):
     def __init__(self, space_key: str, api_key: str):
         super(BacklogToolConfigure, self).__init__(space_key, api_key, '.backlogtool.com')
+
+
+_default_configure = None  # type: Optional[BacklogConfigure]
+_default_configure_lock = threading.Lock()
+
+
+def get_default_configure(reload: bool = False) -> BacklogConfigure:
+    """
+    設定を渡さなかった場合に使う設定を返す
+    環境変数 (BACKLOG_HOST, BACKLOG_API_KEY) が設定されていればそれを、無ければ設定ファイル secrets を読み込む
+    読み込むのはプロセス内で最初の1回だけで、以降は同じ設定 (と RequestSender) を共有する
+
+    :param reload: True の場合は読み込み直す
+    :return: 設定
+    """
+    global _default_configure
+    if _default_configure is None or reload:
+        with _default_configure_lock:
+            if _default_configure is None or reload:
+                _default_configure = BacklogConfigure.from_env() or BacklogConfigure.from_file()
+    return _default_configure
@@ -1,19 +1,19 @@
-from requests import Response
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.modules import get_request_sender
 
 
 class Category:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'projects'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_category_list(self,
                           project_id_or_key: str,
-                          ) -> Response:
+                          ) -> 'Response':
         """
         カテゴリー一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-category-list/
@@ -31,7 +31,7 @@ class Category:
                         project_id_or_key: str,
                         category_id: int,
                         name: str,
-                        ) -> Response:
+                        ) -> 'Response':
         """
         カテゴリー情報の更新
         https://developer.nulab.com/ja/docs/backlog/api/2/update-category/
@@ -52,7 +52,7 @@ class Category:
     def add_category(self,
                      project_id_or_key: str,
                      name: str,
-                     ) -> Response:
+                     ) -> 'Response':
         """
         カテゴリーの追加
         https://developer.nulab.com/ja/docs/backlog/api/2/add-category/
@@ -70,7 +70,7 @@ class Category:
 
     def delete_category(self,
                         project_id_or_key: str,
-                        category_id: int) -> Response:
+                        category_id: int) -> 'Response':
         """
         カテゴリーの削除
         https://developer.nulab.com/ja/docs/backlog/api/2/delete-category/
@@ -1,20 +1,20 @@
-from requests import Response
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.const import CUSTOM_FIELD_TYPE
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.modules import get_request_sender
 
 
 class CustomField:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'projects'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_custom_field_list(self,
                               project_id_or_key: Optional[str] = None,
-                              ) -> Response:
+                              ) -> 'Response':
 
         """
         カスタム属性一覧の取得
@@ -48,7 +48,7 @@ class CustomField:
                          items: List[str] = None,
                          allow_input: Optional[bool] = None,
                          allow_add_item: Optional[bool] = None,
-                         ) -> Response:
+                         ) -> 'Response':
 
         """
         カスタム属性の追加
@@ -137,7 +137,7 @@ class CustomField:
                             items: Optional[List[str]] = None,
                             allow_input: Optional[bool] = None,
                             allow_add_item: Optional[bool] = None,
-                            ) -> Response:
+                            ) -> 'Response':
 
         """
         カスタム属性の更新
@@ -207,7 +207,7 @@ class CustomField:
     def delete_custom_field(self,
                             project_id_or_key: Optional[str] = None,
                             custom_field_id: Optional[int] = None,
-                            ) -> Response:
+                            ) -> 'Response':
         """
         カスタム属性の削除
         https://developer.nulab.com/ja/docs/backlog/api/2/delete-custom-field/
@@ -227,14 +227,13 @@ class CustomField:
 class ListTypeCustomField:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'projects'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def add_list_item_for_list_type_custom_field(self,
                                                  project_id_or_key: Optional[str] = None,
                                                  custom_field_id: Optional[int] = None,
                                                  name: Optional[str] = None,
-                                                 ) -> Response:
+                                                 ) -> 'Response':
 
         """
         選択リストカスタム属性のリスト項目の追加
@@ -257,7 +256,7 @@ class ListTypeCustomField:
                                                     project_id_or_key: str,
                                                     custom_field_id: int,
                                                     item_id: int
-                                                    ) -> Response:
+                                                    ) -> 'Response':
 
         """
         選択リストカスタム属性のリスト項目の削除
@@ -280,7 +279,7 @@ class ListTypeCustomField:
                                                     custom_field_id: Optional[int] = None,
                                                     item_id: Optional[int] = None,
                                                     name: Optional[str] = None,
-                                                    ) -> Response:
+                                                    ) -> 'Response':
 
         """
         選択リストカスタム属性のリスト項目の更新
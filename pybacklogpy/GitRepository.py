@@ -1,19 +1,19 @@
-from requests import Response
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.modules import get_request_sender
 
 
 class GitRepository:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'projects'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_list_of_git_repositories(self,
                                      project_id_or_key: str,
-                                     ) -> Response:
+                                     ) -> 'Response':
         """
         Gitリポジトリ一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-list-of-git-repositories/
@@ -29,7 +29,7 @@ class GitRepository:
     def get_git_repository(self,
                            project_id_or_key: str,
                            repo_id_or_name: str,
-                           ) -> Response:
+                           ) -> 'Response':
         """
         Gitリポジトリの取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-git-repository/
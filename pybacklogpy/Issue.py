@@ -1,16 +1,19 @@
 import re
-from requests import Response
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.download import DEFAULT_CHUNK_SIZE, Destination, Progress
+from pybacklogpy.modules import get_request_sender
+from pybacklogpy.pagination import (ExportResult, IdLookupResult, fetch_by_ids_concurrently,
+                                    fetch_offset_pages_concurrently, iter_id_cursor_pages, iter_offset_pages)
 
 
 class Issue:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'issues'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_issue_list(self,
                        project_id: Optional[List[int]] = None,
@@ -44,7 +47,7 @@ class Issue:
                        custom_field_text: Dict[int, str] = None,
                        custom_field_num: Dict[int, Dict[str, int or None]] = None,
                        custom_field_date: Dict[int, Dict[str, int or None]] = None,
-                       custom_field_list: Dict[int, List[int]] = None) -> Response:
+                       custom_field_list: Dict[int, List[int]] = None) -> 'Response':
         """
         課題一覧の取得
         https://developer.nulab-inc.com/ja/docs/backlog/api/2/get-issue-list/
@@ -168,6 +171,79 @@ class Issue:
 
         return self.rs.send_get_request(path=path, url_param=payloads)
 
+    def iter_issue_list(self,
+                        count: int = 100,
+                        prefetch: bool = False,
+                        **kwargs) -> Iterator[dict]:
+        """
+        課題一覧を最後のページまで取得し、課題を1件ずつ返す
+        ページは必要になった時点で取得する
+
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param prefetch: True の場合、現在のページを処理している間に次のページを先読みする
+        :param kwargs: get_issue_list と同じ引数 (offset を指定した場合はそこから取得する)
+
+        :return: 課題のイテレーター
+        """
+        offset = kwargs.pop('offset', None) or 0
+        return iter_offset_pages(
+            fetch=lambda offset_, count_: self.get_issue_list(offset=offset_, count=count_, **kwargs),
+            count=count,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    def export_issue_list(self,
+                          max_workers: int = 4,
+                          count: int = 100,
+                          **kwargs) -> ExportResult:
+        """
+        条件に一致する課題を全て取得する
+        最初に count_issue で件数を数え、全ページを並行に取得してからソート順に結合する
+
+        :param max_workers: 同時に取得するページ数の上限
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param kwargs: get_issue_list と同じ引数 (offset は指定できない)
+
+        :return: ExportResult 取得中に課題が更新されてページがずれた場合は duplicate_ids, missing_count に現れる
+        """
+        if 'offset' in kwargs:
+            raise ValueError('export_issue_list では offset は指定できません')
+        if not 1 <= count <= 100:
+            raise ValueError('count(取得上限)は1-100の範囲で指定してください')
+        response_count = self.count_issue(**kwargs)
+        response_count.raise_for_status()
+        total = response_count.json()['count']
+        return fetch_offset_pages_concurrently(
+            fetch=lambda offset_, count_: self.get_issue_list(offset=offset_, count=count_, **kwargs),
+            total=total,
+            count=count,
+            max_workers=max_workers,
+        )
+
+    def get_issues_by_ids(self,
+                          ids: Iterable[int],
+                          chunk_size: int = 100,
+                          max_workers: int = 4) -> IdLookupResult:
+        """
+        ID を指定して課題をまとめて取得する
+        get_issue を1件ずつ呼ぶ代わりに、 get_issue_list の id[] で chunk_size 件ずつ並行に取得する
+
+        :param ids: 課題のID
+        :param chunk_size: 1回のリクエストで取得する課題の数(1-100)  指定が無い場合は100
+        :param max_workers: 同時に送るリクエスト数の上限
+
+        :return: IdLookupResult items は {課題のID: 課題} (ids の順), missing_ids は見つからなかった課題のID
+        """
+        if not 1 <= chunk_size <= 100:
+            raise ValueError('chunk_size は1-100の範囲で指定してください')
+        return fetch_by_ids_concurrently(
+            fetch=lambda chunk: self.get_issue_list(id_=chunk, count=len(chunk)),
+            ids=ids,
+            chunk_size=chunk_size,
+            max_workers=max_workers,
+        )
+
     def count_issue(self,
                     project_id: Optional[List[int]] = None,
                     issue_type_id: Optional[List[int]] = None,
@@ -200,7 +276,7 @@ class Issue:
                     custom_field_text: Dict[int, str] = None,
                     custom_field_num: Dict[int, Dict[str, int or None]] = None,
                     custom_field_date: Dict[int, Dict[str, int or None]] = None,
-                    custom_field_list: Dict[int, List[int]] = None) -> Response:
+                    custom_field_list: Dict[int, List[int]] = None) -> 'Response':
         """
         課題数の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/count-issue/
@@ -327,7 +403,7 @@ class Issue:
 
     def get_issue(self,
                   issue_id_or_key: str,
-                  ) -> Response:
+                  ) -> 'Response':
         """
         課題情報の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-issue/
@@ -360,7 +436,7 @@ class Issue:
                   List[int] = None,
                   attachment_id: Optional[List[int]] = None,
                   **kwargs,
-                  ) -> Response:
+                  ) -> 'Response':
         """
         課題の追加
         https://developer.nulab.com/ja/docs/backlog/api/2/add-issue/
@@ -448,7 +524,7 @@ class Issue:
                      attachment_id: Optional[List[int]] = None,
                      comment: Optional[str] = None,
                      **kwargs,
-                     ) -> Response:
+                     ) -> 'Response':
         """
         課題情報の更新
         https://developer.nulab.com/ja/docs/backlog/api/2/update-issue/
@@ -524,7 +600,7 @@ class Issue:
 
     def delete_issue(self,
                      issue_id_or_key: str,
-                     ) -> Response:
+                     ) -> 'Response':
         """
         課題の削除
         https://developer.nulab.com/ja/docs/backlog/api/2/delete-issue/
@@ -541,12 +617,11 @@ class Issue:
 class IssueAttachment:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'issues'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_list_of_issue_attachments(self,
                                       issue_id_or_key: str,
-                                      ) -> Response:
+                                      ) -> 'Response':
         """
         課題添付ファイル一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-list-of-issue-attachments/
@@ -563,25 +638,39 @@ class IssueAttachment:
     def get_issue_attachment(self,
                              issue_id_or_key: str,
                              attachment_id: int,
-                             ) -> Tuple[str, Response]:
+                             destination: Destination = None,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE,
+                             progress: Optional[Progress] = None,
+                             resume: bool = False,
+                             segments: int = 1,
+                             sha256: Optional[str] = None,
+                             ) -> Tuple[str, 'Response']:
         """
         課題添付ファイルのダウンロード
         https://developer.nulab.com/ja/docs/backlog/api/2/get-issue-attachment/
 
         :param issue_id_or_key: 課題のID または 課題キー
         :param attachment_id: 添付ファイルのID
-
-        :return: 保存されたファイルのPATH
+        :param destination: 保存先 (ファイルまたはディレクトリのPATH, ファイルオブジェクト, チャンクを受け取る関数)
+            指定が無い場合は tmp ディレクトリに保存する
+        :param chunk_size: 1度に読み書きするバイト数
+        :param progress: 進捗を受け取る関数 (ダウンロード済みのバイト数, 全体のバイト数) が渡される
+        :param resume: True の場合、中断したダウンロードを続きから再開できるようにする (destination は PATH のみ)
+        :param segments: 1つのファイルを何個の範囲に分けて並行してダウンロードするか
+        :param sha256: ダウンロードしたファイルの SHA-256 (16進数の文字列) 一致しない場合は ValueError
+
+        :return: (保存されたファイルのPATH, レスポンス)
         """
 
         path = self.base_path + '/{issue_id_or_key}/attachments/{attachment_id}' \
             .format(issue_id_or_key=issue_id_or_key, attachment_id=attachment_id)
-        return self.rs.get_file(path, {})
+        return self.rs.get_file(path, {}, destination=destination, chunk_size=chunk_size, progress=progress,
+                                resume=resume, segments=segments, sha256=sha256)
 
     def delete_issue_attachment(self,
                                 issue_id_or_key: str,
                                 attachment_id: int,
-                                ) -> Response:
+                                ) -> 'Response':
         """
         課題添付ファイルの削除
         https://developer.nulab.com/ja/docs/backlog/api/2/delete-issue-attachment/
@@ -601,8 +690,7 @@ class IssueAttachment:
 class IssueComment:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'issues'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_comment_list(self,
                          issue_id_or_key: Optional[str] = None,
@@ -610,7 +698,7 @@ class IssueComment:
                          max_id: Optional[int] = None,
                          count: int = 20,
                          order: str = 'desc',
-                         ) -> Response:
+                         ) -> 'Response':
         """
         課題コメントの取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-comment-list/
@@ -634,6 +722,7 @@ class IssueComment:
         if count is not None:
             if not 1 <= count <= 100:
                 raise ValueError('count(取得上限)は1-100の範囲で指定してください')
+            payloads['count'] = count
         if order is not None:
             if order not in {'desc', 'asc'}:
                 raise ValueError('order は desc または asc のみが使用できます')
@@ -641,12 +730,41 @@ class IssueComment:
 
         return self.rs.send_get_request(path=path, url_param=payloads)
 
+    def iter_comment_list(self,
+                          issue_id_or_key: str,
+                          min_id: Optional[int] = None,
+                          max_id: Optional[int] = None,
+                          count: int = 100,
+                          order: str = 'desc',
+                          **kwargs) -> Iterator[dict]:
+        """
+        課題コメントを最後まで取得し、コメントを1件ずつ返す
+        前のページの最後の ID を minId / maxId に渡して次のページを取得する
+
+        :param issue_id_or_key: 課題のID または 課題キー
+        :param min_id: 最小ID 降順の場合はこの ID まで取得する
+        :param max_id: 最大ID 昇順の場合はこの ID まで取得する
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param order: “asc”または”desc” 指定が無い場合は”desc”
+        :param kwargs: get_comment_list と同じ引数
+
+        :return: コメントのイテレーター
+        """
+        return iter_id_cursor_pages(
+            fetch=lambda min_id_, max_id_: self.get_comment_list(
+                issue_id_or_key=issue_id_or_key, min_id=min_id_, max_id=max_id_, count=count, order=order, **kwargs),
+            count=count,
+            order=order,
+            min_id=min_id,
+            max_id=max_id,
+        )
+
     def add_comment(self,
                     issue_id_or_key: str,
                     content: str,
                     notified_user_id: Optional[List[int]] = None,
                     attachment_id: Optional[List[int]] = None,
-                    ) -> Response:
+                    ) -> 'Response':
         """
         課題コメントの追加
         https://developer.nulab.com/ja/docs/backlog/api/2/add-comment/
@@ -671,7 +789,7 @@ class IssueComment:
     def get_comment(self,
                     issue_id_or_key: str,
                     comment_id: int,
-                    ) -> Response:
+                    ) -> 'Response':
         """
         課題コメント情報の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-comment/
@@ -691,7 +809,7 @@ class IssueComment:
                        issue_id_or_key: str,
                        comment_id: int,
                        content: Optional[str] = None,
-                       ) -> Response:
+                       ) -> 'Response':
         """
         課題コメント情報の更新
         https://developer.nulab.com/ja/docs/backlog/api/2/update-comment/
@@ -714,7 +832,7 @@ class IssueComment:
     def get_list_of_comment_notifications(self,
                                           issue_id_or_key: str,
                                           comment_id: int,
-                                          ) -> Response:
+                                          ) -> 'Response':
         """
         課題コメントのお知らせ一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-list-of-comment-notifications/
@@ -733,7 +851,7 @@ class IssueComment:
     def delete_comment(self,
                        issue_id_or_key: str,
                        comment_id: int,
-                       ) -> Response:
+                       ) -> 'Response':
         """
         課題コメントの削除
         https://developer.nulab.com/ja/docs/backlog/api/2/delete-comment/
@@ -751,7 +869,7 @@ class IssueComment:
 
     def count_comment(self,
                       issue_id_or_key: str,
-                      ) -> Response:
+                      ) -> 'Response':
         """
         課題コメント数の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/count-comment/
@@ -769,7 +887,7 @@ class IssueComment:
                                  issue_id_or_key: str,
                                  comment_id: int,
                                  notified_user_id: Optional[List[int]] = None,
-                                 ) -> Response:
+                                 ) -> 'Response':
         """
         課題コメントにお知らせを追加
         https://developer.nulab.com/ja/docs/backlog/api/2/add-comment-notification/
@@ -793,12 +911,11 @@ class IssueComment:
 class IssueSharedFile:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'issues'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_list_of_linked_shared_files(self,
                                         issue_id_or_key: str,
-                                        ) -> Response:
+                                        ) -> 'Response':
         """
         課題共有ファイル一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-list-of-linked-shared-files/
@@ -815,7 +932,7 @@ class IssueSharedFile:
     def remove_link_to_shared_file_from_issue(self,
                                               issue_id_or_key: str,
                                               shared_file_id: int,
-                                              ) -> Response:
+                                              ) -> 'Response':
         """
         課題の共有ファイルのリンクを解除
         https://developer.nulab.com/ja/docs/backlog/api/2/remove-link-to-shared-file-from-issue/
@@ -834,7 +951,7 @@ class IssueSharedFile:
     def link_shared_files_to_issue(self,
                                    issue_id_or_key: str,
                                    file_id: List[int]
-                                   ) -> Response:
+                                   ) -> 'Response':
         """
         課題に共有ファイルをリンク
         https://developer.nulab.com/ja/docs/backlog/api/2/link-shared-files-to-issue/
@@ -854,11 +971,10 @@ class IssueSharedFile:
 class IssueType:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'projects'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_issue_type_list(self,
-                            project_id_or_key: str) -> Response:
+                            project_id_or_key: str) -> 'Response':
         """
         種別一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-issue-type-list/
@@ -875,7 +991,7 @@ class IssueType:
                           project_id_or_key: str,
                           issue_id: int,
                           name: Optional[str] = None,
-                          color: Optional[str] = None) -> Response:
+                          color: Optional[str] = None) -> 'Response':
         """
         種別情報の更新
         https://developer.nulab.com/ja/docs/backlog/api/2/update-issue-type/
@@ -901,7 +1017,7 @@ class IssueType:
     def add_issue_type(self,
                        project_id_or_key: Optional[str] = None,
                        name: Optional[str] = None,
-                       color: Optional[str] = None) -> Response:
+                       color: Optional[str] = None) -> 'Response':
         """
         種別の追加
         https://developer.nulab.com/ja/docs/backlog/api/2/add-issue-type/
@@ -925,7 +1041,7 @@ class IssueType:
     def delete_issue_type(self,
                           project_id_or_key: Optional[str] = None,
                           issue_id: Optional[int] = None,
-                          substitute_issue_type_id: Optional[int] = None) -> Response:
+                          substitute_issue_type_id: Optional[int] = None) -> 'Response':
         """
         種別の削除
         https://developer.nulab.com/ja/docs/backlog/api/2/delete-issue-type/
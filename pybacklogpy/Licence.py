@@ -1,17 +1,17 @@
-from requests import Response
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.modules import get_request_sender
 
 
 class Licence:
     def __init__(self, config: Optional[BacklogConfigure] = None):
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_licence(self,
-                    ) -> Response:
+                    ) -> 'Response':
         """
         ライセンス情報の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-licence/
@@ -1,16 +1,16 @@
-from typing import Optional
-
-from requests import Response
+from typing import TYPE_CHECKING, Iterator, Optional
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.modules import get_request_sender
+from pybacklogpy.pagination import iter_id_cursor_pages
 
 
 class Notification:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'notifications'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_notification(self,
                          min_id: Optional[int] = None,
@@ -18,7 +18,7 @@ class Notification:
                          count: Optional[int] = 20,
                          order: Optional[str] = 'desc',
                          sender_id: Optional[int] = None,
-                         ) -> Response:
+                         ) -> 'Response':
         """
         お知らせ一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-notification/
@@ -41,6 +41,7 @@ class Notification:
         if count is not None:
             if not 1 <= count <= 100:
                 raise ValueError('count(取得上限)は1-100の範囲で指定してください')
+            payloads['count'] = count
         if order is not None:
             if order not in {'desc', 'asc'}:
                 raise ValueError('order は desc または asc のみが使用できます')
@@ -50,10 +51,37 @@ class Notification:
 
         return self.rs.send_get_request(path=path, url_param=payloads)
 
+    def iter_notification(self,
+                          min_id: Optional[int] = None,
+                          max_id: Optional[int] = None,
+                          count: int = 100,
+                          order: str = 'desc',
+                          **kwargs) -> Iterator[dict]:
+        """
+        お知らせ一覧を最後まで取得し、お知らせを1件ずつ返す
+        前のページの最後の ID を minId / maxId に渡して次のページを取得する
+
+        :param min_id: 最小ID 降順の場合はこの ID まで取得する
+        :param max_id: 最大ID 昇順の場合はこの ID まで取得する
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param order: “asc”または”desc” 指定が無い場合は”desc”
+        :param kwargs: get_notification と同じ引数
+
+        :return: お知らせのイテレーター
+        """
+        return iter_id_cursor_pages(
+            fetch=lambda min_id_, max_id_: self.get_notification(
+                min_id=min_id_, max_id=max_id_, count=count, order=order, **kwargs),
+            count=count,
+            order=order,
+            min_id=min_id,
+            max_id=max_id,
+        )
+
     def count_notification(self,
                            already_read: Optional[bool] = None,
                            resource_already_read: Optional[bool] = None,
-                           ) -> Response:
+                           ) -> 'Response':
         """
         お知らせ数の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/count-notification/
@@ -75,7 +103,7 @@ class Notification:
 
     def read_notification(self,
                           notification_id: int,
-                          ) -> Response:
+                          ) -> 'Response':
         """
         お知らせの既読化
         https://developer.nulab.com/ja/docs/backlog/api/2/read-notification/
@@ -87,7 +115,7 @@ class Notification:
 
         path = self.base_path + '/{notification_id}/markAsRead'.format(notification_id=str(notification_id))
 
-        return self.rs.send_post_request(path=path, request_param={})
+        return self.rs.send_post_request(path=path, request_param={}, idempotent=True)
 
     def reset_unread_notification_count(self,
                                         ):
@@ -100,4 +128,4 @@ class Notification:
 
         path = self.base_path + '/markAsRead'
 
-        return self.rs.send_post_request(path=path, request_param={})
+        return self.rs.send_post_request(path=path, request_param={}, idempotent=True)
@@ -1,16 +1,18 @@
 import re
-from requests import Response
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.download import DEFAULT_CHUNK_SIZE, Destination, Progress
+from pybacklogpy.modules import get_request_sender
+from pybacklogpy.pagination import iter_id_cursor_pages
 
 
 class Project:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'projects'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def add_project(self,
                     name: str,
@@ -19,7 +21,7 @@ class Project:
                     subtasking_enabled: bool,
                     text_formatting_rule: str,
                     project_leader_can_edit_project_leader: Optional[bool] = None,
-                    ) -> Response:
+                    ) -> 'Response':
         """
         プロジェクトの追加
         https://developer.nulab.com/ja/docs/backlog/api/2/add-project/
@@ -48,7 +50,7 @@ class Project:
         return self.rs.send_post_request(path=path, request_param=payloads)
 
     def get_project(self,
-                    project_id_or_key: str) -> Response:
+                    project_id_or_key: str) -> 'Response':
         """
         プロジェクト情報の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-project/
@@ -70,7 +72,7 @@ class Project:
                        subtasking_enabled: Optional[bool] = None,
                        project_leader_can_edit_project_leader: Optional[bool] = None,
                        text_formatting_rule: Optional[str] = None,
-                       archived: Optional[bool] = None) -> Response:
+                       archived: Optional[bool] = None) -> 'Response':
         """
         プロジェクト情報の更新
         https://developer.nulab.com/ja/docs/backlog/api/2/update-project/
@@ -111,7 +113,7 @@ class Project:
         return self.rs.send_patch_request(path=path, request_param=payloads)
 
     def delete_project(self,
-                       project_id_or_key: str) -> Response:
+                       project_id_or_key: str) -> 'Response':
         """
         プロジェクトの削除
         https://developer.nulab.com/ja/docs/backlog/api/2/delete-project/
@@ -127,7 +129,7 @@ class Project:
 
     def get_project_list(self,
                          archived: Optional[bool] = None,
-                         all_projects: Optional[bool] = None) -> Response:
+                         all_projects: Optional[bool] = None) -> 'Response':
         """
         プロジェクト一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-project-list/
@@ -148,19 +150,28 @@ class Project:
         return self.rs.send_get_request(path=path, url_param=payloads)
 
     def get_project_icon(self,
-                         project_id_or_key: Optional[str] = None) -> Tuple[str, Response]:
+                         project_id_or_key: Optional[str] = None,
+                         destination: Destination = None,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE,
+                         progress: Optional[Progress] = None,
+                         ) -> Tuple[str, 'Response']:
         """
         プロジェクトアイコンの取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-project-icon/
 
         :param project_id_or_key: プロジェクトのID または プロジェクトキー
+        :param destination: 保存先 (ファイルまたはディレクトリのPATH, ファイルオブジェクト, チャンクを受け取る関数)
+            指定が無い場合は tmp ディレクトリに保存する
+        :param chunk_size: 1度に読み書きするバイト数
+        :param progress: 進捗を受け取る関数 (ダウンロード済みのバイト数, 全体のバイト数) が渡される
 
-        :return: レスポンス
+        :return: (保存された画像のPATH, レスポンス)
         """
 
         path = self.base_path + '/{project_id_or_key}/image'.format(project_id_or_key=project_id_or_key)
 
-        return self.rs.get_file(path=path, url_param={})
+        return self.rs.get_file(path=path, url_param={},
+                                destination=destination, chunk_size=chunk_size, progress=progress)
 
     def get_project_recent_updates(self,
                                    project_id_or_key: str,
@@ -170,7 +181,7 @@ class Project:
                                    count: Optional[int] = 20,
                                    order: Optional[str] = 'desc',
                                    update_type: Optional[int] = None,
-                                   ) -> Response:
+                                   ) -> 'Response':
         """
         プロジェクトの最近の活動の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-project-recent-updates/
@@ -186,7 +197,7 @@ class Project:
         :return: レスポンス
         """
 
-        path = self.base_path + '/' + project_id_or_key
+        path = self.base_path + '/{project_id_or_key}/activities'.format(project_id_or_key=project_id_or_key)
         payloads = {}
         if activity_type_id is not None:
             payloads['activityTypeId[]'] = activity_type_id
@@ -207,9 +218,39 @@ class Project:
 
         return self.rs.send_get_request(path=path, url_param=payloads)
 
+    def iter_project_recent_updates(self,
+                                    project_id_or_key: str,
+                                    min_id: Optional[int] = None,
+                                    max_id: Optional[int] = None,
+                                    count: int = 100,
+                                    order: str = 'desc',
+                                    **kwargs) -> Iterator[dict]:
+        """
+        プロジェクトの最近の活動を最後まで取得し、活動を1件ずつ返す
+        前のページの最後の ID を minId / maxId に渡して次のページを取得する
+
+        :param project_id_or_key: プロジェクトのID または プロジェクトキー
+        :param min_id: 最小ID 降順の場合はこの ID まで取得する
+        :param max_id: 最大ID 昇順の場合はこの ID まで取得する
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param order: “asc”または”desc” 指定が無い場合は”desc”
+        :param kwargs: get_project_recent_updates と同じ引数
+
+        :return: 活動のイテレーター
+        """
+        return iter_id_cursor_pages(
+            fetch=lambda min_id_, max_id_: self.get_project_recent_updates(
+                project_id_or_key=project_id_or_key, min_id=min_id_, max_id=max_id_, count=count, order=order,
+                **kwargs),
+            count=count,
+            order=order,
+            min_id=min_id,
+            max_id=max_id,
+        )
+
     def get_project_user_list(self,
                               project_id_or_key: str,
-                              exclude_group_members: Optional[bool] = None) -> Response:
+                              exclude_group_members: Optional[bool] = None) -> 'Response':
         """
         プロジェクトユーザー一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-project-user-list/
@@ -229,7 +270,7 @@ class Project:
 
     def add_project_user(self,
                          project_id_or_key: str,
-                         user_id: int) -> Response:
+                         user_id: int) -> 'Response':
         """
         プロジェクトユーザーの追加
         https://developer.nulab.com/ja/docs/backlog/api/2/add-project-user/
@@ -248,7 +289,7 @@ class Project:
         return self.rs.send_post_request(path=path, request_param=payloads)
 
     def get_list_of_project_administrators(self,
-                                           project_id_or_key: str) -> Response:
+                                           project_id_or_key: str) -> 'Response':
         """
         プロジェクト管理者一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-list-of-project-administrators/
@@ -264,7 +305,7 @@ class Project:
 
     def delete_project_user(self,
                             project_id_or_key: str,
-                            user_id: int) -> Response:
+                            user_id: int) -> 'Response':
         """
         プロジェクトユーザーの削除
         https://developer.nulab.com/ja/docs/backlog/api/2/delete-project-user/
@@ -282,7 +323,7 @@ class Project:
 
     def add_project_administrator(self,
                                   project_id_or_key: str,
-                                  user_id: int) -> Response:
+                                  user_id: int) -> 'Response':
         """
         プロジェクト管理者の追加
         https://developer.nulab.com/ja/docs/backlog/api/2/add-project-administrator/
@@ -300,7 +341,7 @@ class Project:
 
     def delete_project_administrator(self,
                                      project_id_or_key: str,
-                                     user_id: int) -> Response:
+                                     user_id: int) -> 'Response':
         """
         プロジェクト管理者の削除
         https://developer.nulab.com/ja/docs/backlog/api/2/delete-project-administrator/
@@ -320,12 +361,11 @@ class Project:
 class ProjectTeam:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'projects'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_project_team_list(self,
                               project_id_or_key: str,
-                              ) -> Response:
+                              ) -> 'Response':
 
         """
         プロジェクトチーム一覧の取得
@@ -343,7 +383,7 @@ class ProjectTeam:
     def add_project_team(self,
                          project_id_or_key: str,
                          team_id: Optional[int] = None,
-                         ) -> Response:
+                         ) -> 'Response':
 
         """
         プロジェクトチームの追加
@@ -365,7 +405,7 @@ class ProjectTeam:
     def delete_project_team(self,
                             project_id_or_key: str,
                             team_id: Optional[int] = None,
-                            ) -> Response:
+                            ) -> 'Response':
 
         """
         プロジェクトチームの削除
@@ -386,7 +426,7 @@ class ProjectTeam:
 
     def get_project_disk_usage(self,
                                project_id_or_key: str,
-                               ) -> Response:
+                               ) -> 'Response':
 
         """
         プロジェクトの容量使用状況の取得
@@ -1,16 +1,17 @@
-from typing import List, Optional, Tuple
-
-from requests import Response
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.download import DEFAULT_CHUNK_SIZE, Destination, Progress
+from pybacklogpy.modules import get_request_sender
+from pybacklogpy.pagination import iter_offset_pages
 
 
 class PullRequest:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'projects'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_number_of_pull_requests(self,
                                     project_id_or_key: str,
@@ -21,7 +22,7 @@ class PullRequest:
                                     created_user_id: Optional[List[int]] = None,
                                     offset: Optional[int] = None,
                                     count: Optional[int] = 20,
-                                    ) -> Response:
+                                    ) -> 'Response':
 
         """
         プルリクエスト数の取得
@@ -67,7 +68,7 @@ class PullRequest:
                               created_user_id: Optional[List[int]] = None,
                               offset: Optional[int] = None,
                               count: int = 20,
-                              ) -> Response:
+                              ) -> 'Response':
 
         """
         プルリクエスト一覧の取得
@@ -101,14 +102,43 @@ class PullRequest:
         if count is not None:
             if not 1 <= count <= 100:
                 raise ValueError('count(取得上限)は1-100の範囲で指定してください')
+            payloads['count'] = count
 
         return self.rs.send_get_request(path=path, url_param=payloads)
 
+    def iter_pull_request_list(self,
+                               project_id_or_key: str,
+                               repo_id_or_name: str,
+                               count: int = 100,
+                               prefetch: bool = False,
+                               **kwargs) -> Iterator[dict]:
+        """
+        プルリクエスト一覧を最後のページまで取得し、プルリクエストを1件ずつ返す
+        ページは必要になった時点で取得する
+
+        :param project_id_or_key: プロジェクトのID または プロジェクトキー
+        :param repo_id_or_name: リポジトリのID または リポジトリ名
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param prefetch: True の場合、現在のページを処理している間に次のページを先読みする
+        :param kwargs: get_pull_request_list と同じ引数 (offset を指定した場合はそこから取得する)
+
+        :return: プルリクエストのイテレーター
+        """
+        offset = kwargs.pop('offset', None) or 0
+        return iter_offset_pages(
+            fetch=lambda offset_, count_: self.get_pull_request_list(project_id_or_key=project_id_or_key,
+                                                                     repo_id_or_name=repo_id_or_name,
+                                                                     offset=offset_, count=count_, **kwargs),
+            count=count,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
     def get_pull_request(self,
                          project_id_or_key: str,
                          repo_id_or_name: str,
                          number: int,
-                         ) -> Response:
+                         ) -> 'Response':
 
         """
         プルリクエストの取得
@@ -138,7 +168,7 @@ class PullRequest:
                          notified_user_id: Optional[List[int]] = None,
                          attachment_id:
                          List[int] = None,
-                         ) -> Response:
+                         ) -> 'Response':
 
         """
         プルリクエストの追加
@@ -181,7 +211,7 @@ class PullRequest:
                             assignee_id: Optional[int] = None,
                             notified_user_id: Optional[List[int]] = None,
                             comment: Optional[str] = None,
-                            ) -> Response:
+                            ) -> 'Response':
 
         """
         プルリクエストの更新
@@ -222,14 +252,13 @@ class PullRequest:
 class PullRequestAttachment:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'projects'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_list_of_pull_request_attachment(self,
                                             project_id_or_key: str,
                                             repo_id_or_name: str,
                                             number: int,
-                                            ) -> Response:
+                                            ) -> 'Response':
 
         """
         プルリクエスト添付ファイル一覧の取得
@@ -253,7 +282,13 @@ class PullRequestAttachment:
                                          repo_id_or_name: str,
                                          number: int,
                                          attachment_id: int,
-                                         ) -> Tuple[str, Response]:
+                                         destination: Destination = None,
+                                         chunk_size: int = DEFAULT_CHUNK_SIZE,
+                                         progress: Optional[Progress] = None,
+                                         resume: bool = False,
+                                         segments: int = 1,
+                                         sha256: Optional[str] = None,
+                                         ) -> Tuple[str, 'Response']:
 
         """
         プルリクエスト添付ファイルのダウンロード
@@ -263,8 +298,15 @@ class PullRequestAttachment:
         :param repo_id_or_name: リポジトリのID または リポジトリ名
         :param number: プルリクエストの番号
         :param attachment_id: 添付ファイルのID
-
-        :return: ダウンロードされたファイルのPATH
+        :param destination: 保存先 (ファイルまたはディレクトリのPATH, ファイルオブジェクト, チャンクを受け取る関数)
+            指定が無い場合は tmp ディレクトリに保存する
+        :param chunk_size: 1度に読み書きするバイト数
+        :param progress: 進捗を受け取る関数 (ダウンロード済みのバイト数, 全体のバイト数) が渡される
+        :param resume: True の場合、中断したダウンロードを続きから再開できるようにする (destination は PATH のみ)
+        :param segments: 1つのファイルを何個の範囲に分けて並行してダウンロードするか
+        :param sha256: ダウンロードしたファイルの SHA-256 (16進数の文字列) 一致しない場合は ValueError
+
+        :return: (ダウンロードされたファイルのPATH, レスポンス)
         """
 
         path = self.base_path + '/{project_id_or_key}/git/repositories/{repo_id_or_name}/' \
@@ -272,14 +314,16 @@ class PullRequestAttachment:
             .format(project_id_or_key=project_id_or_key, repo_id_or_name=repo_id_or_name,
                     number=number, attachment_id=attachment_id)
 
-        return self.rs.get_file(path=path, url_param={})
+        return self.rs.get_file(path=path, url_param={},
+                                destination=destination, chunk_size=chunk_size, progress=progress,
+                                resume=resume, segments=segments, sha256=sha256)
 
     def delete_pull_request_attachments(self,
                                         project_id_or_key: str,
                                         repo_id_or_name: str,
                                         number: int,
                                         attachment_id: int,
-                                        ) -> Response:
+                                        ) -> 'Response':
 
         """
         プルリクエスト添付ファイルの削除
@@ -304,8 +348,7 @@ class PullRequestAttachment:
 class PullRequestComment:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'projects'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_pull_request_comment(self,
                                  project_id_or_key: str,
@@ -315,7 +358,7 @@ class PullRequestComment:
                                  max_id: Optional[int] = None,
                                  count: int = 20,
                                  order: str = 'desc',
-                                 ) -> Response:
+                                 ) -> 'Response':
 
         """
         プルリクエストコメントの取得
@@ -355,7 +398,7 @@ class PullRequestComment:
                                  number: int,
                                  content: str,
                                  notified_user_id: Optional[List[int]] = None,
-                                 ) -> Response:
+                                 ) -> 'Response':
 
         """
         プルリクエストコメントの追加
@@ -382,7 +425,7 @@ class PullRequestComment:
                                             project_id_or_key: str,
                                             repo_id_or_name: str,
                                             number: int,
-                                            ) -> Response:
+                                            ) -> 'Response':
 
         """
         プルリクエストコメント数の取得
@@ -407,7 +450,7 @@ class PullRequestComment:
                                                 number: int,
                                                 comment_id: int,
                                                 content: Optional[str] = None,
-                                                ) -> Response:
+                                                ) -> 'Response':
 
         """
         プルリクエストコメント情報の更新
@@ -1,15 +1,17 @@
-from requests import Response
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, Optional, Tuple
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.download import DEFAULT_CHUNK_SIZE, Destination, Progress
+from pybacklogpy.modules import get_request_sender
+from pybacklogpy.pagination import iter_offset_pages
 
 
 class SharedFile:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'projects'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_list_of_shared_files(self,
                                  project_id_or_key: str,
@@ -17,7 +19,7 @@ class SharedFile:
                                  order: str = 'desc',
                                  offset: Optional[int] = None,
                                  count: int = 1000,
-                                 ) -> Response:
+                                 ) -> 'Response':
         """
         共有ファイル一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-list-of-shared-files/
@@ -43,24 +45,68 @@ class SharedFile:
         if count is not None:
             if not 1 <= count <= 1000:
                 raise ValueError('count(取得上限)は1-1000の範囲で指定してください')
+            payloads['count'] = count
 
         return self.rs.send_get_request(path=path, url_param=payloads)
 
+    def iter_list_of_shared_files(self,
+                                  project_id_or_key: str,
+                                  file_path: str,
+                                  count: int = 1000,
+                                  prefetch: bool = False,
+                                  **kwargs) -> Iterator[dict]:
+        """
+        共有ファイル一覧を最後のページまで取得し、共有ファイルを1件ずつ返す
+        ページは必要になった時点で取得する
+
+        :param project_id_or_key: プロジェクトのID または プロジェクトキー
+        :param file_path: ディレクトリのパス
+        :param count: 1ページあたりの取得件数(1-1000)  指定が無い場合は1000
+        :param prefetch: True の場合、現在のページを処理している間に次のページを先読みする
+        :param kwargs: get_list_of_shared_files と同じ引数 (offset を指定した場合はそこから取得する)
+
+        :return: 共有ファイルのイテレーター
+        """
+        offset = kwargs.pop('offset', None) or 0
+        return iter_offset_pages(
+            fetch=lambda offset_, count_: self.get_list_of_shared_files(project_id_or_key=project_id_or_key,
+                                                                        file_path=file_path,
+                                                                        offset=offset_, count=count_, **kwargs),
+            count=count,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
     def get_file(self,
                  project_id_or_key: Optional[str] = None,
                  shared_file_id: Optional[int] = None,
-                 ) -> Response:
+                 destination: Destination = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 progress: Optional[Progress] = None,
+                 resume: bool = False,
+                 segments: int = 1,
+                 sha256: Optional[str] = None,
+                 ) -> Tuple[str, 'Response']:
         """
         共有ファイルのダウンロード
         https://developer.nulab.com/ja/docs/backlog/api/2/get-file/
 
         :param project_id_or_key: プロジェクトのID または プロジェクトキー
         :param shared_file_id: 共有ファイルのID
+        :param destination: 保存先 (ファイルまたはディレクトリのPATH, ファイルオブジェクト, チャンクを受け取る関数)
+            指定が無い場合は tmp ディレクトリに保存する
+        :param chunk_size: 1度に読み書きするバイト数
+        :param progress: 進捗を受け取る関数 (ダウンロード済みのバイト数, 全体のバイト数) が渡される
+        :param resume: True の場合、中断したダウンロードを続きから再開できるようにする (destination は PATH のみ)
+        :param segments: 1つのファイルを何個の範囲に分けて並行してダウンロードするか
+        :param sha256: ダウンロードしたファイルの SHA-256 (16進数の文字列) 一致しない場合は ValueError
 
-        :return: レスポンス
+        :return: (保存されたファイルのPATH, レスポンス)
         """
 
         path = self.base_path + '/{project_id_or_key}/files/{shared_file_id}'\
             .format(project_id_or_key=project_id_or_key, shared_file_id=shared_file_id)
 
-        return self.rs.send_get_request(path=path, url_param={})
+        return self.rs.get_file(path=path, url_param={},
+                                destination=destination, chunk_size=chunk_size, progress=progress,
+                                resume=resume, segments=segments, sha256=sha256)
@@ -1,17 +1,19 @@
-from requests import Response
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.download import DEFAULT_CHUNK_SIZE, Destination, Progress
+from pybacklogpy.modules import get_request_sender
+from pybacklogpy.pagination import iter_id_cursor_pages
 
 
 class Space:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'space'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
-    def get_space(self) -> Response:
+    def get_space(self) -> 'Response':
         """
         スペース情報の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-space/
@@ -27,7 +29,7 @@ class Space:
                            max_id: Optional[int] = None,
                            count: Optional[int] = 20,
                            order: Optional[str] = 'desc',
-                           ) -> Response:
+                           ) -> 'Response':
         """
         最近の更新の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-recent-updates/
@@ -52,6 +54,7 @@ class Space:
         if count is not None:
             if not 1 <= count <= 100:
                 raise ValueError('count(取得上限)は1-100の範囲で指定してください')
+            payloads['count'] = count
         if order is not None:
             if order not in {'desc', 'asc'}:
                 raise ValueError('order は desc または asc のみが使用できます')
@@ -59,19 +62,56 @@ class Space:
 
         return self.rs.send_get_request(path=path, url_param=payloads)
 
-    def get_space_logo(self) -> Tuple[str, Response]:
+    def iter_recent_updates(self,
+                            min_id: Optional[int] = None,
+                            max_id: Optional[int] = None,
+                            count: int = 100,
+                            order: str = 'desc',
+                            **kwargs) -> Iterator[dict]:
+        """
+        最近の更新を最後まで取得し、更新を1件ずつ返す
+        前のページの最後の ID を minId / maxId に渡して次のページを取得する
+
+        :param min_id: 最小ID 降順の場合はこの ID まで取得する
+        :param max_id: 最大ID 昇順の場合はこの ID まで取得する
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param order: “asc”または”desc” 指定が無い場合は”desc”
+        :param kwargs: get_recent_updates と同じ引数
+
+        :return: 更新のイテレーター
+        """
+        return iter_id_cursor_pages(
+            fetch=lambda min_id_, max_id_: self.get_recent_updates(
+                min_id=min_id_, max_id=max_id_, count=count, order=order, **kwargs),
+            count=count,
+            order=order,
+            min_id=min_id,
+            max_id=max_id,
+        )
+
+    def get_space_logo(self,
+                       destination: Destination = None,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       progress: Optional[Progress] = None,
+                       ) -> Tuple[str, 'Response']:
         """
         スペースアイコン画像の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-space-logo/
 
-        :return: レスポンス
+        :param destination: 保存先 (ファイルまたはディレクトリのPATH, ファイルオブジェクト, チャンクを受け取る関数)
+            指定が無い場合は tmp ディレクトリに保存する
+        :param chunk_size: 1度に読み書きするバイト数
+        :param progress: 進捗を受け取る関数 (ダウンロード済みのバイト数, 全体のバイト数) が渡される
+
+        :return: (保存された画像のPATH, レスポンス)
         """
 
         path = self.base_path + '/image'
 
-        return self.rs.get_file(path=path, url_param={})
+        return self.rs.get_file(path=path, url_param={},
+                                destination=destination, chunk_size=chunk_size, progress=progress)
 
-    def get_space_notification(self) -> Response:
+    def get_space_notification(self) -> 'Response':
         """
         スペースのお知らせの取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-space-notification/
@@ -83,7 +123,7 @@ class Space:
 
         return self.rs.send_get_request(path=path, url_param={})
 
-    # def update_space_notification(self) -> Response:
+    # def update_space_notification(self) -> 'Response':
     #     """
     #     スペースのお知らせの更新
     #     https://developer.nulab.com/ja/docs/backlog/api/2/update-space-notification/
@@ -95,7 +135,7 @@ class Space:
     #
     #     return self.rs.send_patch_request(path=path, request_param={})
 
-    def get_space_disk_usage(self) -> Response:
+    def get_space_disk_usage(self) -> 'Response':
         """
         スペースの容量使用状況の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-space-disk-usage/
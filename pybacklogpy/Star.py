@@ -1,16 +1,15 @@
-from typing import Optional
-
-from requests import Response
+from typing import TYPE_CHECKING, Optional
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.modules import get_request_sender
 
 
 class Project:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'stars'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def add_star(self,
                  issue_id: Optional[int] = None,
@@ -18,7 +17,7 @@ class Project:
                  wiki_id: Optional[int] = None,
                  pull_request_id: Optional[int] = None,
                  pull_request_comment_id: Optional[int] = None,
-                 ) -> Response:
+                 ) -> 'Response':
         """
         スターの追加
         https://developer.nulab.com/ja/docs/backlog/api/2/add-star/
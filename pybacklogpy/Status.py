@@ -1,21 +1,21 @@
-from requests import Response
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.modules import get_request_sender
 
 
 class Status:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'projects/'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def add_status(self,
                    project_id_or_key: str,
                    name: str,
                    color: str,
-                   ) -> Response:
+                   ) -> 'Response':
         """
         権限メソッドURLURL パラメーターリクエストパラメーターレスポンス例
         https://developer.nulab.com/ja/docs/backlog/api/2/add-status/
@@ -36,7 +36,7 @@ class Status:
                       status_id: int = None,
                       name: str = None,
                       color: str = None,
-                      ) -> Response:
+                      ) -> 'Response':
         """
         権限メソッドURLURL パラメーターリクエストパラメーターレスポンス例
         https://developer.nulab.com/ja/docs/backlog/api/2/update-status/
@@ -62,7 +62,7 @@ class Status:
                       project_id_or_key: str,
                       status_id: int,
                       substitute_status_id: int,
-                      ) -> Response:
+                      ) -> 'Response':
         """
         権限メソッドURLURL パラメーターリクエストパラメーターレスポンス例
         https://developer.nulab.com/ja/docs/backlog/api/2/delete-status/
@@ -82,7 +82,7 @@ class Status:
     def update_order_of_status(self,
                                project_id_or_key: str,
                                status_id: List[int],
-                               ) -> Response:
+                               ) -> 'Response':
         """
         権限メソッドURLURL パラメーターリクエストパラメーターレスポンス例
         https://developer.nulab.com/ja/docs/backlog/api/2/update-order-of-status/
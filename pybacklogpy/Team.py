@@ -1,22 +1,23 @@
-from typing import List, Optional
-
-from requests import Response
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.download import DEFAULT_CHUNK_SIZE, Destination, Progress
+from pybacklogpy.modules import get_request_sender
+from pybacklogpy.pagination import iter_offset_pages
 
 
 class Team:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'teams'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_list_of_teams(self,
                           order: str = 'desc',
                           offset: Optional[int] = None,
                           count: int = 20,
-                          ) -> Response:
+                          ) -> 'Response':
         """
         チーム一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-list-of-teams/
@@ -39,13 +40,36 @@ class Team:
         if count is not None:
             if not 1 <= count <= 100:
                 raise ValueError('count(取得上限)は1-100の範囲で指定してください')
+            payloads['count'] = count
 
         return self.rs.send_get_request(path=path, url_param=payloads)
 
+    def iter_list_of_teams(self,
+                           count: int = 100,
+                           prefetch: bool = False,
+                           **kwargs) -> Iterator[dict]:
+        """
+        チーム一覧を最後のページまで取得し、チームを1件ずつ返す
+        ページは必要になった時点で取得する
+
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param prefetch: True の場合、現在のページを処理している間に次のページを先読みする
+        :param kwargs: get_list_of_teams と同じ引数 (offset を指定した場合はそこから取得する)
+
+        :return: チームのイテレーター
+        """
+        offset = kwargs.pop('offset', None) or 0
+        return iter_offset_pages(
+            fetch=lambda offset_, count_: self.get_list_of_teams(offset=offset_, count=count_, **kwargs),
+            count=count,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
     def add_team(self,
                  name: Optional[str] = None,
                  members: Optional[List[int]] = None,
-                 ) -> Response:
+                 ) -> 'Response':
 
         """
         チームの追加
@@ -70,7 +94,7 @@ class Team:
                     team_id: int,
                     name: Optional[str] = None,
                     members: Optional[List[int]] = None,
-                    ) -> Response:
+                    ) -> 'Response':
 
         """
         チーム情報の更新
@@ -94,7 +118,7 @@ class Team:
 
     def delete_team(self,
                     team_id: Optional[int] = None,
-                    ) -> Response:
+                    ) -> 'Response':
 
         """
         チームの削除
@@ -111,24 +135,32 @@ class Team:
 
     def get_team_icon(self,
                       team_id: Optional[int] = None,
-                      ) -> Response:
+                      destination: Destination = None,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      progress: Optional[Progress] = None,
+                      ) -> Tuple[str, 'Response']:
 
         """
         チームアイコンの取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-team-icon/
 
         :param team_id: チームのID
+        :param destination: 保存先 (ファイルまたはディレクトリのPATH, ファイルオブジェクト, チャンクを受け取る関数)
+            指定が無い場合は tmp ディレクトリに保存する
+        :param chunk_size: 1度に読み書きするバイト数
+        :param progress: 進捗を受け取る関数 (ダウンロード済みのバイト数, 全体のバイト数) が渡される
 
-        :return: レスポンス
+        :return: (保存された画像のPATH, レスポンス)
         """
 
-        path = self.base_path + '{team_id}/icon'.format(team_id=team_id)
+        path = self.base_path + '/{team_id}/icon'.format(team_id=team_id)
 
-        return self.rs.send_get_request(path=path, url_param={})
+        return self.rs.get_file(path=path, url_param={},
+                                destination=destination, chunk_size=chunk_size, progress=progress)
 
     def get_team(self,
                  team_id: Optional[int] = None,
-                 ) -> Response:
+                 ) -> 'Response':
 
         """
         チーム情報の取得
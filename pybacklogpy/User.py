@@ -1,19 +1,21 @@
 from datetime import datetime
 import re
-from requests import Response
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.download import DEFAULT_CHUNK_SIZE, Destination, Progress
+from pybacklogpy.modules import get_request_sender
+from pybacklogpy.pagination import iter_id_cursor_pages
 
 
 class User:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'users'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
-    def get_user_list(self) -> Response:
+    def get_user_list(self) -> 'Response':
         """
         ユーザー一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-user-list/
@@ -25,7 +27,7 @@ class User:
         return self.rs.send_get_request(path=path, url_param={})
 
     def get_user(self,
-                 user_id: int) -> Response:
+                 user_id: int) -> 'Response':
         """
         ユーザー情報の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-user/
@@ -39,7 +41,7 @@ class User:
 
         return self.rs.send_get_request(path=path, url_param={})
 
-    def get_own_user(self) -> Response:
+    def get_own_user(self) -> 'Response':
         """
         認証ユーザー情報の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-own-user/
@@ -51,27 +53,29 @@ class User:
         return self.rs.send_get_request(path=path, url_param={})
 
     def get_user_icon(self,
-                      user_id: int) -> Tuple[str, Response]:
+                      user_id: int,
+                      destination: Destination = None,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      progress: Optional[Progress] = None,
+                      ) -> Tuple[str, 'Response']:
         """
         ユーザーアイコンの取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-user-icon/
 
         :param user_id: ユーザーのID
+        :param destination: 保存先 (ファイルまたはディレクトリのPATH, ファイルオブジェクト, チャンクを受け取る関数)
+            指定が無い場合は tmp ディレクトリに保存する
+        :param chunk_size: 1度に読み書きするバイト数
+        :param progress: 進捗を受け取る関数 (ダウンロード済みのバイト数, 全体のバイト数) が渡される
 
-        :return: (保存された画像のPATH, backlog上の画像url)
+        :return: (保存された画像のPATH, レスポンス)
         """
 
         path = self.base_path + '/{user_id}/icon'.format(user_id=str(user_id))
 
-        response = self.rs.send_get_request(path=path, url_param={})
-        if not response.ok:
-            return '', response
-        # ユーザーアイコンだけ他と戻り値のパターンが違うので、個別対応
-        filename = response.url.split('/')[len(response.url.split('/')) - 1]
-        filepath = 'tmp/{filename}'.format(filename=filename)
-        with open(filepath, mode='wb') as save_file:
-            save_file.write(response.content)
-        return filepath, response
+        # ユーザーアイコンは Content-Disposition が無いので、 URL の最後の部分がファイル名になる
+        return self.rs.get_file(path=path, url_param={},
+                                destination=destination, chunk_size=chunk_size, progress=progress)
 
     def get_user_recent_updates(self,
                                 user_id: int,
@@ -80,7 +84,7 @@ class User:
                                 max_id: Optional[int] = None,
                                 count: Optional[int] = 20,
                                 order: Optional[str] = 'desc',
-                                ) -> Response:
+                                ) -> 'Response':
         """
         ユーザーの最近の活動の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-user-recent-updates/
@@ -108,6 +112,7 @@ class User:
         if count is not None:
             if not 1 <= count <= 100:
                 raise ValueError('count(取得上限)は1-100の範囲で指定してください')
+            payloads['count'] = count
         if order is not None:
             if order is not None:
                 if order not in {'desc', 'asc'}:
@@ -116,10 +121,39 @@ class User:
 
         return self.rs.send_get_request(path=path, url_param=payloads)
 
+    def iter_user_recent_updates(self,
+                                 user_id: int,
+                                 min_id: Optional[int] = None,
+                                 max_id: Optional[int] = None,
+                                 count: int = 100,
+                                 order: str = 'desc',
+                                 **kwargs) -> Iterator[dict]:
+        """
+        ユーザーの最近の活動を最後まで取得し、活動を1件ずつ返す
+        前のページの最後の ID を minId / maxId に渡して次のページを取得する
+
+        :param user_id: ユーザーのID
+        :param min_id: 最小ID 降順の場合はこの ID まで取得する
+        :param max_id: 最大ID 昇順の場合はこの ID まで取得する
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param order: “asc”または”desc” 指定が無い場合は”desc”
+        :param kwargs: get_user_recent_updates と同じ引数
+
+        :return: 活動のイテレーター
+        """
+        return iter_id_cursor_pages(
+            fetch=lambda min_id_, max_id_: self.get_user_recent_updates(
+                user_id=user_id, min_id=min_id_, max_id=max_id_, count=count, order=order, **kwargs),
+            count=count,
+            order=order,
+            min_id=min_id,
+            max_id=max_id,
+        )
+
     def count_user_received_stars(self,
                                   user_id: int,
                                   since: Optional[str] = None,
-                                  until: Optional[str] = None) -> Response:
+                                  until: Optional[str] = None) -> 'Response':
         """
         ユーザーの受け取ったスターの数の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/count-user-received-stars/
@@ -159,7 +193,7 @@ class User:
                                min_id: Optional[int] = None,
                                max_id: Optional[int] = None,
                                count: Optional[int] = 20,
-                               order: Optional[str] = 'desc') -> Response:
+                               order: Optional[str] = 'desc') -> 'Response':
         """
         ユーザーの受け取ったスター一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-received-star-list/
@@ -192,7 +226,7 @@ class User:
     def get_list_of_recently_viewed_issues(self,
                                            order: Optional[str] = 'desc',
                                            offset: Optional[int] = None,
-                                           count: Optional[int] = 20) -> Response:
+                                           count: Optional[int] = 20) -> 'Response':
         """
         自分が最近見た課題一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-list-of-recently-viewed-issues/
@@ -222,7 +256,7 @@ class User:
     def get_list_of_recently_viewed_projects(self,
                                              order: Optional[str] = 'desc',
                                              offset: Optional[int] = None,
-                                             count: Optional[int] = 20) -> Response:
+                                             count: Optional[int] = 20) -> 'Response':
         """
         自分が最近見たプロジェクト一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-list-of-recently-viewed-projects/
@@ -251,7 +285,7 @@ class User:
     def get_list_of_recently_viewed_wikis(self,
                                           order: Optional[str] = 'desc',
                                           offset: Optional[int] = None,
-                                          count: Optional[int] = 20) -> Response:
+                                          count: Optional[int] = 20) -> 'Response':
         """
         自分が最近見たWiki一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-list-of-recently-viewed-wikis/
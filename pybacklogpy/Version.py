@@ -1,19 +1,19 @@
-from requests import Response
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.modules import get_request_sender
 
 
 class Version:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'projects'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_version_milestone_list(self,
                                    project_id_or_key: Optional[str] = None,
-                                   ) -> Response:
+                                   ) -> 'Response':
 
         """
         バージョン(マイルストーン)一覧の取得
@@ -36,7 +36,7 @@ class Version:
                                  start_date: Optional[str] = None,
                                  release_due_date: Optional[str] = None,
                                  archived: Optional[bool] = None,
-                                 ) -> Response:
+                                 ) -> 'Response':
 
         """
         バージョン(マイルストーン)情報の更新
@@ -70,7 +70,7 @@ class Version:
     def delete_version(self,
                        project_id_or_key: Optional[str] = None,
                        version_id: Optional[int] = None,
-                       ) -> Response:
+                       ) -> 'Response':
 
         """
         バージョン(マイルストーン)の削除
@@ -93,7 +93,7 @@ class Version:
                               description: Optional[str] = None,
                               start_date: Optional[str] = None,
                               release_due_date: Optional[str] = None,
-                              ) -> Response:
+                              ) -> 'Response':
 
         """
         バージョン(マイルストーン)の追加
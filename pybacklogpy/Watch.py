@@ -1,22 +1,22 @@
-from typing import List, Optional
-
-from requests import Response
+from typing import TYPE_CHECKING, Iterator, List, Optional
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.modules import get_request_sender
+from pybacklogpy.pagination import iter_offset_pages
 
 
 class Watch:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'watchings'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def count_watching(self,
                        user_id: int,
                        resource_already_read: Optional[bool] = None,
                        already_read: Optional[bool] = None,
-                       ) -> Response:
+                       ) -> 'Response':
 
         """
         ウォッチ数の取得
@@ -40,7 +40,7 @@ class Watch:
 
     def mark_watching_as_read(self,
                               watching_id: int,
-                              ) -> Response:
+                              ) -> 'Response':
 
         """
         ウォッチの既読化
@@ -58,7 +58,7 @@ class Watch:
     def add_watching(self,
                      issue_id_or_key: Optional[str] = None,
                      note: Optional[str] = None,
-                     ) -> Response:
+                     ) -> 'Response':
 
         """
         ウォッチの追加
@@ -81,7 +81,7 @@ class Watch:
 
     def get_watching(self,
                      watching_id: int,
-                     ) -> Response:
+                     ) -> 'Response':
 
         """
         ウォッチ情報の取得
@@ -98,7 +98,7 @@ class Watch:
 
     def delete_watching(self,
                         watching_id: int,
-                        ) -> Response:
+                        ) -> 'Response':
 
         """
         ウォッチの削除
@@ -116,7 +116,7 @@ class Watch:
     def update_watching(self,
                         watching_id: int,
                         note: Optional[str] = None,
-                        ) -> Response:
+                        ) -> 'Response':
 
         """
         ウォッチの更新
@@ -143,7 +143,7 @@ class Watch:
                           offset: Optional[int] = None,
                           resource_already_read: Optional[bool] = None,
                           issue_id: Optional[List[int]] = None,
-                          ) -> Response:
+                          ) -> 'Response':
 
         """
         ウォッチ一覧の取得
@@ -181,3 +181,28 @@ class Watch:
             payloads['issueId[]'] = issue_id
 
         return self.rs.send_get_request(path=path, url_param=payloads)
+
+    def iter_watching_list(self,
+                           user_id: int,
+                           count: int = 100,
+                           prefetch: bool = False,
+                           **kwargs) -> Iterator[dict]:
+        """
+        ウォッチ一覧を最後のページまで取得し、ウォッチを1件ずつ返す
+        ページは必要になった時点で取得する
+
+        :param user_id: ユーザーのID
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param prefetch: True の場合、現在のページを処理している間に次のページを先読みする
+        :param kwargs: get_watching_list と同じ引数 (offset を指定した場合はそこから取得する)
+
+        :return: ウォッチのイテレーター
+        """
+        offset = kwargs.pop('offset', None) or 0
+        return iter_offset_pages(
+            fetch=lambda offset_, count_: self.get_watching_list(user_id=user_id, offset=offset_, count=count_,
+                                                                 **kwargs),
+            count=count,
+            offset=offset,
+            prefetch=prefetch,
+        )
@@ -1,19 +1,19 @@
-from requests import Response
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.modules import get_request_sender
 
 
 class Webhook:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'projects'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_list_of_webhooks(self,
                              project_id_or_key: str
-                             ) -> Response:
+                             ) -> 'Response':
         """
         Webhook一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-list-of-webhooks/
@@ -30,7 +30,7 @@ class Webhook:
     def get_webhook(self,
                     project_id_or_key: str,
                     webhook_id: str,
-                    ) -> Response:
+                    ) -> 'Response':
         """
         Webhookの取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-webhook/
@@ -54,7 +54,7 @@ class Webhook:
                        hook_url: Optional[str] = None,
                        all_event: Optional[bool] = None,
                        activity_type_ids: Optional[List[int]] = None,
-                       ) -> Response:
+                       ) -> 'Response':
         """
         Webhookの更新
         https://developer.nulab.com/ja/docs/backlog/api/2/update-webhook/
@@ -94,7 +94,7 @@ class Webhook:
                     hook_url: Optional[str] = None,
                     all_event: Optional[bool] = None,
                     activity_type_ids: Optional[List[int]] = None,
-                    ) -> Response:
+                    ) -> 'Response':
         """
         Webhookの追加
         https://developer.nulab.com/ja/docs/backlog/api/2/add-webhook/
@@ -128,7 +128,7 @@ class Webhook:
     def delete_webhook(self,
                        project_id_or_key: str,
                        webhook_id: str,
-                       ) -> Response:
+                       ) -> 'Response':
         """
         Webhookの削除
         https://developer.nulab.com/ja/docs/backlog/api/2/delete-webhook/
@@ -1,22 +1,24 @@
-from requests import Response
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+if TYPE_CHECKING:
+    from requests import Response
 
 from pybacklogpy.BacklogConfigure import BacklogConfigure
-from pybacklogpy.modules import RequestSender
+from pybacklogpy.download import DEFAULT_CHUNK_SIZE, Destination, Progress
+from pybacklogpy.modules import get_request_sender
+from pybacklogpy.pagination import iter_id_cursor_pages
 
 
 class Wiki:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'wikis'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def update_wiki_page(self,
                          wiki_id: int,
                          name: Optional[str] = None,
                          content: Optional[str] = None,
                          mail_notify: bool = False,
-                         ) -> Response:
+                         ) -> 'Response':
         """
         Wikiページ情報の更新
         https://developer.nulab-inc.com/ja/docs/backlog/api/2/update-wiki-page/
@@ -41,7 +43,7 @@ class Wiki:
 
     def get_wiki_page(self,
                       wiki_id: int,
-                      ) -> Response:
+                      ) -> 'Response':
         """
         Wikiページ情報の取得
         https://developer.nulab-inc.com/ja/docs/backlog/api/2/get-wiki-page/
@@ -59,7 +61,7 @@ class Wiki:
                       name: str,
                       content: str,
                       mail_notify: Optional[bool] = None,
-                      ) -> Response:
+                      ) -> 'Response':
         """
         Wikiページの追加
         https://developer.nulab.com/ja/docs/backlog/api/2/add-wiki-page/
@@ -82,7 +84,7 @@ class Wiki:
     def delete_wiki_page(self,
                          wiki_id: int,
                          mail_notify: Optional[bool] = None,
-                         ) -> Response:
+                         ) -> 'Response':
 
         """
         Wikiページの削除
@@ -103,7 +105,7 @@ class Wiki:
 
     def count_wiki_page(self,
                         project_id_or_key: str,
-                        ) -> Response:
+                        ) -> 'Response':
 
         """
         Wikiページ数の取得
@@ -124,7 +126,7 @@ class Wiki:
     def get_wiki_page_list(self,
                            project_id_or_key: Optional[str] = None,
                            keyword: Optional[str] = None,
-                           ) -> Response:
+                           ) -> 'Response':
 
         """
         Wikiページ一覧の取得
@@ -147,7 +149,7 @@ class Wiki:
 
     def get_wiki_page_tag_list(self,
                                project_id_or_key: Optional[int] = None,
-                               ) -> Response:
+                               ) -> 'Response':
 
         """
         Wikiページタグ一覧の取得
@@ -171,7 +173,7 @@ class Wiki:
                               max_id: Optional[int] = None,
                               count: int = 20,
                               order: str = 'desc',
-                              ) -> Response:
+                              ) -> 'Response':
         """
         Wikiページ更新履歴一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-wiki-page-history/
@@ -194,6 +196,7 @@ class Wiki:
         if count is not None:
             if not 1 <= count <= 100:
                 raise ValueError('count(取得上限)は1-100の範囲で指定してください')
+            payloads['count'] = count
         if order is not None:
             if order not in {'desc', 'asc'}:
                 raise ValueError('order は desc または asc のみが使用できます')
@@ -201,9 +204,38 @@ class Wiki:
 
         return self.rs.send_get_request(path=path, url_param=payloads)
 
+    def iter_wiki_page_history(self,
+                               wiki_id: int,
+                               min_id: Optional[int] = None,
+                               max_id: Optional[int] = None,
+                               count: int = 100,
+                               order: str = 'desc',
+                               **kwargs) -> Iterator[dict]:
+        """
+        Wikiページ更新履歴を最後まで取得し、更新履歴を1件ずつ返す
+        前のページの最後の ID を minId / maxId に渡して次のページを取得する
+
+        :param wiki_id: WikiページのID
+        :param min_id: 最小ID 降順の場合はこの ID まで取得する
+        :param max_id: 最大ID 昇順の場合はこの ID まで取得する
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param order: “asc”または”desc” 指定が無い場合は”desc”
+        :param kwargs: get_wiki_page_history と同じ引数
+
+        :return: 更新履歴のイテレーター
+        """
+        return iter_id_cursor_pages(
+            fetch=lambda min_id_, max_id_: self.get_wiki_page_history(
+                wiki_id=wiki_id, min_id=min_id_, max_id=max_id_, count=count, order=order, **kwargs),
+            count=count,
+            order=order,
+            min_id=min_id,
+            max_id=max_id,
+        )
+
     def get_wiki_page_star(self,
                            wiki_id: Optional[int] = None,
-                           ) -> Response:
+                           ) -> 'Response':
         """
         Wikiページのスター一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-wiki-page-star/
@@ -221,13 +253,12 @@ class Wiki:
 class WikiAttachment:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'wikis'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def attach_file_to_wiki(self,
                             wiki_id: int,
                             attachment_id: Optional[List[int]] = None,
-                            ) -> Response:
+                            ) -> 'Response':
         """
         Wiki添付ファイルの追加
         https://developer.nulab.com/ja/docs/backlog/api/2/attach-file-to-wiki/
@@ -248,25 +279,40 @@ class WikiAttachment:
     def get_wiki_page_attachment(self,
                                  wiki_id: int,
                                  attachment_id: Optional[int] = None,
-                                 ) -> Tuple[str, Response]:
+                                 destination: Destination = None,
+                                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                                 progress: Optional[Progress] = None,
+                                 resume: bool = False,
+                                 segments: int = 1,
+                                 sha256: Optional[str] = None,
+                                 ) -> Tuple[str, 'Response']:
         """
         Wiki添付ファイルのダウンロード
         https://developer.nulab.com/ja/docs/backlog/api/2/get-wiki-page-attachment/
 
         :param wiki_id: WikiページのID
         :param attachment_id: 添付ファイルのID
+        :param destination: 保存先 (ファイルまたはディレクトリのPATH, ファイルオブジェクト, チャンクを受け取る関数)
+            指定が無い場合は tmp ディレクトリに保存する
+        :param chunk_size: 1度に読み書きするバイト数
+        :param progress: 進捗を受け取る関数 (ダウンロード済みのバイト数, 全体のバイト数) が渡される
+        :param resume: True の場合、中断したダウンロードを続きから再開できるようにする (destination は PATH のみ)
+        :param segments: 1つのファイルを何個の範囲に分けて並行してダウンロードするか
+        :param sha256: ダウンロードしたファイルの SHA-256 (16進数の文字列) 一致しない場合は ValueError
 
-        :return: 保存されたファイルのPATH
+        :return: (保存されたファイルのPATH, レスポンス)
         """
 
         path = self.base_path + '/{wiki_id}/attachments/{attachment_id}'\
             .format(wiki_id=str(wiki_id), attachment_id=attachment_id)
 
-        return self.rs.get_file(path=path, url_param={})
+        return self.rs.get_file(path=path, url_param={},
+                                destination=destination, chunk_size=chunk_size, progress=progress,
+                                resume=resume, segments=segments, sha256=sha256)
 
     def get_list_of_wiki_attachments(self,
                                      wiki_id: int,
-                                     ) -> Response:
+                                     ) -> 'Response':
         """
         Wiki添付ファイル一覧の取得
         https://developer.nulab.com/ja/docs/backlog/api/2/get-list-of-wiki-attachments/
@@ -282,7 +328,7 @@ class WikiAttachment:
     def remove_wiki_attachment(self,
                                wiki_id: int,
                                attachment_id: Optional[int] = None,
-                               ) -> Response:
+                               ) -> 'Response':
 
         """
         Wiki添付ファイルの削除
@@ -303,12 +349,11 @@ class WikiAttachment:
 class WikiSharedFile:
     def __init__(self, config: Optional[BacklogConfigure] = None):
         self.base_path = 'wikis'
-        _config = config if config else None
-        self.rs = RequestSender(_config)
+        self.rs = get_request_sender(config)
 
     def get_list_of_shared_files_on_wiki(self,
                                          wiki_id: int,
-                                         ) -> Response:
+                                         ) -> 'Response':
 
         """
         Wiki共有ファイル一覧の取得
@@ -326,7 +371,7 @@ class WikiSharedFile:
     def link_shared_files_to_wiki(self,
                                   wiki_id: int,
                                   file_id: List[int],
-                                  ) -> Response:
+                                  ) -> 'Response':
         """
         Wikiに共有ファイルをリンク
         https://developer.nulab.com/ja/docs/backlog/api/2/link-shared-files-to-wiki/
@@ -347,7 +392,7 @@ class WikiSharedFile:
     def remove_link_to_shared_file_from_wiki(self,
                                              wiki_id: int,
                                              file_id: int,
-                                             ) -> Response:
+                                             ) -> 'Response':
 
         """
         Wikiの共有ファイルのリンクを解除
@@ -0,0 +1,34 @@
+import importlib
+
+# `import pybacklogpy` の後に属性として参照できるサブモジュール
+# 参照された時に初めて読み込む (PEP 562 Python 3.7 以降)
+_SUBMODULES = frozenset([
+    'Attachment', 'BacklogClient', 'BacklogConfigure', 'Category', 'CustomField', 'GitRepository', 'Issue', 'Licence',
+    'Notification', 'Priority', 'Project', 'PullRequest', 'Resolution', 'SharedFile', 'Space', 'Star', 'Status',
+    'Team', 'User', 'Version', 'Watch', 'Webhook', 'Wiki',
+    'aio', 'bulk', 'cache', 'cassette', 'coalesce', 'const', 'download', 'harvest', 'importer', 'metrics', 'mockserver',
+    'models', 'modules', 'pagination', 'ratelimit', 'response', 'retry', 'tracing', 'transport', 'upload',
+])
+
+# サブモジュールと名前が重ならないクラス: (モジュール名, クラス名)
+_CLASSES = {
+    'BacklogComConfigure': ('BacklogConfigure', 'BacklogComConfigure'),
+    'BacklogJpConfigure': ('BacklogConfigure', 'BacklogJpConfigure'),
+    'BacklogToolConfigure': ('BacklogConfigure', 'BacklogToolConfigure'),
+}
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module('{package}.{name}'.format(package=__name__, name=name))
+    if name in _CLASSES:
+        module_name, class_name = _CLASSES[name]
+        value = getattr(importlib.import_module('{package}.{name}'.format(package=__name__, name=module_name)),
+                        class_name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module '{package}' has no attribute '{name}'".format(package=__name__, name=name))
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES | set(_CLASSES))
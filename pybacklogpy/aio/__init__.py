@@ -0,0 +1,14 @@
+"""
+PyBacklogPy の非同期版
+
+同期版と同じクラス・メソッドを持ち、各メソッドは await できるコルーチンを返す。
+使用するには aiohttp が必要 (pip install pybacklogpy[aio])
+"""
+from pybacklogpy.aio.modules import AsyncRequestSender, get_async_request_sender
+from pybacklogpy.aio.resources import (Attachment, Category, CustomField, GitRepository, Issue, IssueAttachment,
+                                       IssueComment, IssueSharedFile, IssueType, Licence, ListTypeCustomField,
+                                       Notification, Priority, Project, ProjectTeam, PullRequest,
+                                       PullRequestAttachment, PullRequestComment, Resolution, SharedFile, Space,
+                                       Star, Status, Team, User, Version, Watch, Webhook, Wiki, WikiAttachment,
+                                       WikiSharedFile)
+from pybacklogpy.aio.transport import AsyncTransport
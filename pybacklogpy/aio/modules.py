@@ -0,0 +1,172 @@
+import asyncio
+import functools
+import os
+import threading
+import time
+from requests import Response
+from typing import Iterator, Optional, Tuple
+
+from pybacklogpy.BacklogConfigure import BacklogConfigure, get_default_configure
+from pybacklogpy.aio.transport import AsyncTransport, next_chunk
+from pybacklogpy.cache import ResponseCache, ValidatorStore
+from pybacklogpy.download import (DEFAULT_CHUNK_SIZE, Destination, Progress, file_sha256, get_content_length,
+                                  get_response_file_name, write_chunks)
+from pybacklogpy.metrics import RequestMetrics
+from pybacklogpy.modules import RequestSender, rewind_files
+from pybacklogpy.ratelimit import RateLimiter
+from pybacklogpy.response import BacklogResponse
+from pybacklogpy.retry import RetryPolicy, RetryState
+
+
+def iter_chunks_threadsafe(chunks, loop: asyncio.AbstractEventLoop) -> Iterator[bytes]:
+    """
+    ストリーミングのレスポンスのチャンクを、イベントループとは別のスレッドから1つずつ読む
+    読み込みはループで行い、読み終わるまで呼び出したスレッドを待たせる
+    :param chunks: aiohttp の StreamReader.iter_chunked が返す非同期イテレーター
+    :param loop: レスポンスを受け取ったイベントループ
+    :return: チャンクのイテレーター
+    """
+    while True:
+        chunk = asyncio.run_coroutine_threadsafe(next_chunk(chunks), loop).result()
+        if chunk is None:
+            return
+        yield chunk
+
+
+class AsyncRequestSender(RequestSender):
+    """
+    RequestSender の非同期版
+    send_*_request などのメソッドは await できるコルーチンを返す
+    Tracer はスパンをスレッドごとに管理するため、非同期版では使用できない
+    """
+
+    def __init__(self,
+                 config: Optional[BacklogConfigure] = None,
+                 transport: Optional[AsyncTransport] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 cache: Optional[ResponseCache] = None,
+                 validator_store: Optional[ValidatorStore] = None,
+                 metrics: Optional[RequestMetrics] = None):
+        super(AsyncRequestSender, self).__init__(config,
+                                                 transport=transport if transport else AsyncTransport(),
+                                                 rate_limiter=rate_limiter,
+                                                 retry_policy=retry_policy,
+                                                 cache=cache,
+                                                 validator_store=validator_store,
+                                                 metrics=metrics)
+
+    async def _send(self, method: str, path: str, idempotent: Optional[bool] = None, **kwargs) -> Response:
+        if self.metrics is None:
+            return await self._send_request(method, path, idempotent, **kwargs)
+        start = time.monotonic()
+        try:
+            response = await self._send_request(method, path, idempotent, **kwargs)
+        except Exception as e:
+            self.metrics.record_exception(method, path, time.monotonic() - start, e)
+            raise
+        self.metrics.record_response(method, path, time.monotonic() - start, response,
+                                     stream=bool(kwargs.get('stream')))
+        return response
+
+    async def _send_request(self, method: str, path: str, idempotent: Optional[bool] = None, **kwargs) -> Response:
+        # ストリーミングのレスポンスは本文を読み切っていないのでキャッシュしない
+        cacheable = not kwargs.get('stream')
+        cached = self._cache_lookup(method, path, kwargs.get('params')) if cacheable else None
+        if cached is not None:
+            return cached
+        if cacheable:
+            self._add_conditional_headers(method, path, kwargs)
+        state = RetryState(method, path,
+                           retry_policy=self.retry_policy,
+                           rate_limiter=self.rate_limiter,
+                           idempotent=idempotent)
+        while True:
+            wait = state.wait_before_send()
+            while wait:
+                await asyncio.sleep(wait)
+                wait = state.wait_before_send()
+            try:
+                response = BacklogResponse.wrap(
+                    await self.transport.request(method=method, url=self.api_url + path, **kwargs))
+            except Exception as e:
+                delay = state.on_exception(e)
+            else:
+                delay = state.on_response(response)
+                if delay is None:
+                    if cacheable:
+                        response = self._revalidate(method, path, kwargs.get('params'), response)
+                        self._cache_update(method, path, kwargs.get('params'), response)
+                    return state.finish(response)
+                response.close()
+            await asyncio.sleep(delay)
+            rewind_files(kwargs.get('files'), kwargs.get('data'))
+
+    async def get_file(self,
+                       path: str,
+                       url_param,
+                       destination: Destination = None,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       progress: Optional[Progress] = None,
+                       resume: bool = False,
+                       segments: int = 1,
+                       sha256: Optional[str] = None) -> Tuple[str, Response]:
+        """
+        RequestSender.get_file の非同期版
+        本文は chunk_size ごとにイベントループで読み、保存先への書き込みは別のスレッド (run_in_executor) で行う
+        そのため、 destination に渡した関数・ファイルオブジェクトと progress はイベントループとは別のスレッドから呼ばれる
+        resume と segments には対応していない
+        """
+        if resume or segments > 1:
+            raise ValueError('非同期版では再開可能なダウンロードには対応していません')
+        params = self.payload.copy()
+        if url_param:
+            for p in url_param:
+                params[p] = url_param[p]
+        response = await self._send('GET', path, params=params, stream=True)
+        loop = asyncio.get_event_loop()
+        try:
+            if not response.ok:
+                # エラーの内容を読めるように本文を読み込んでおく
+                response._content = await response.raw.read()
+                response._content_consumed = True
+                return '', response
+            chunks = iter_chunks_threadsafe(response.raw.content.iter_chunked(chunk_size), loop)
+            filepath = await loop.run_in_executor(None, functools.partial(write_chunks, chunks,
+                                                                          destination=destination,
+                                                                          filename=get_response_file_name(response),
+                                                                          total=get_content_length(response),
+                                                                          progress=progress))
+        finally:
+            response.close()
+        if sha256 and await loop.run_in_executor(None, file_sha256, filepath) != sha256.lower():
+            os.remove(filepath)
+            raise ValueError('ダウンロードしたファイルの SHA-256 が一致しません')
+        return filepath, response
+
+    async def close(self):
+        """
+        プールしているコネクションを全て閉じる
+        """
+        await self.transport.close()
+
+
+_async_request_sender_lock = threading.Lock()
+
+
+def get_async_request_sender(config: Optional[BacklogConfigure] = None) -> AsyncRequestSender:
+    """
+    設定に対応する AsyncRequestSender を返す
+    同じ BacklogConfigure から作られた非同期クラスは、1つの AsyncRequestSender を共有する
+
+    :param config: 設定 指定が無い場合は環境変数・設定ファイルから読み込んだ設定を使う
+
+    :return: AsyncRequestSender
+    """
+    if not config:
+        config = get_default_configure()
+    if config.async_request_sender is None:
+        with _async_request_sender_lock:
+            if config.async_request_sender is None:
+                config.async_request_sender = AsyncRequestSender(config)
+    return config.async_request_sender
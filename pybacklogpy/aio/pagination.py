@@ -0,0 +1,180 @@
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Iterable, List, Optional
+
+from pybacklogpy.pagination import (ExportResult, IdLookupResult, merge_id_pages, merge_offset_pages, response_to_list,
+                                    split_ids)
+
+
+class _AsyncPageIterator:
+    """
+    ページ単位で取得した要素を1件ずつ返す非同期イテレーター
+    async for で使用する
+    """
+
+    def __init__(self):
+        self._items = deque()  # type: deque
+        self._done = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        while not self._items:
+            if self._done:
+                raise StopAsyncIteration
+            self._items.extend(await self._fetch_page())
+        return self._items.popleft()
+
+    async def _fetch_page(self) -> list:
+        raise NotImplementedError
+
+
+class OffsetPageIterator(_AsyncPageIterator):
+    """
+    pybacklogpy.pagination.iter_offset_pages の非同期版
+    offset / count でページングする一覧 API を最後まで辿り、要素を1件ずつ返す
+    """
+
+    def __init__(self,
+                 fetch: Callable[[int, int], Awaitable],
+                 count: int,
+                 offset: int = 0,
+                 prefetch: bool = False):
+        """
+        :param fetch: (offset, count) を受け取って1ページ分のレスポンスを返すコルーチン関数
+        :param count: 1ページあたりの取得件数
+        :param offset: 取得を開始するオフセット
+        :param prefetch: True の場合、現在のページを返している間に次のページを取得する
+        """
+        super(OffsetPageIterator, self).__init__()
+        self.fetch = fetch
+        self.count = count
+        self.offset = offset
+        self.prefetch = prefetch
+        self._next_page = None  # type: Optional[asyncio.Future]
+
+    async def _fetch_offset(self, offset: int) -> list:
+        return response_to_list(await self.fetch(offset, self.count))
+
+    async def _fetch_page(self) -> list:
+        if self._next_page is not None:
+            next_page, self._next_page = self._next_page, None
+            page = await next_page
+        else:
+            page = await self._fetch_offset(self.offset)
+        if len(page) < self.count:
+            self._done = True
+            return page
+        self.offset += self.count
+        if self.prefetch:
+            self._next_page = asyncio.ensure_future(self._fetch_offset(self.offset))
+        return page
+
+    def close(self):
+        """
+        先読み中のページの取得を取り消す 最後まで辿らずに終了する場合に呼び出す
+        """
+        self._done = True
+        if self._next_page is not None:
+            self._next_page.cancel()
+            self._next_page = None
+
+
+class IdCursorPageIterator(_AsyncPageIterator):
+    """
+    pybacklogpy.pagination.iter_id_cursor_pages の非同期版
+    minId / maxId でページングする一覧 API を最後まで辿り、要素を1件ずつ返す
+    """
+
+    def __init__(self,
+                 fetch: Callable[[Optional[int], Optional[int]], Awaitable],
+                 count: int,
+                 order: str = 'desc',
+                 min_id: Optional[int] = None,
+                 max_id: Optional[int] = None):
+        """
+        :param fetch: (min_id, max_id) を受け取って1ページ分のレスポンスを返すコルーチン関数
+        :param count: 1ページあたりの取得件数
+        :param order: “asc”または”desc”
+        :param min_id: 最小ID 降順の場合はこの ID まで辿ったら終了する
+        :param max_id: 最大ID 昇順の場合はこの ID まで辿ったら終了する
+        """
+        if order not in {'desc', 'asc'}:
+            raise ValueError('order は desc または asc のみが使用できます')
+        super(IdCursorPageIterator, self).__init__()
+        self.fetch = fetch
+        self.count = count
+        self.order = order
+        self.min_id = min_id
+        self.max_id = max_id
+        self._last_id = None  # type: Optional[int]
+
+    async def _fetch_page(self) -> list:
+        page = response_to_list(await self.fetch(self.min_id, self.max_id))
+        new_items = []
+        for item in page:
+            # minId / maxId に一致する要素が返ってきても、前のページで返したものは飛ばす
+            if self._last_id is not None and (item['id'] >= self._last_id if self.order == 'desc'
+                                              else item['id'] <= self._last_id):
+                continue
+            new_items.append(item)
+            self._last_id = item['id']
+        if not new_items or len(page) < self.count:
+            self._done = True
+        elif self.order == 'desc':
+            self.max_id = self._last_id
+        else:
+            self.min_id = self._last_id
+        return new_items
+
+
+async def fetch_offset_pages_concurrently(fetch: Callable[[int, int], Awaitable],
+                                          total: int,
+                                          count: int,
+                                          max_workers: int = 4) -> ExportResult:
+    """
+    pybacklogpy.pagination.fetch_offset_pages_concurrently の非同期版
+    件数が分かっている一覧 API の全ページを並行に取得し、オフセット順に結合する
+
+    :param fetch: (offset, count) を受け取って1ページ分のレスポンスを返すコルーチン関数
+    :param total: 一覧の件数
+    :param count: 1ページあたりの取得件数
+    :param max_workers: 同時に取得するページ数の上限
+
+    :return: ExportResult
+    """
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def fetch_page(offset):
+        async with semaphore:
+            return response_to_list(await fetch(offset, count))
+
+    pages = await asyncio.gather(*[fetch_page(offset) for offset in range(0, total, count)])
+    return merge_offset_pages(list(pages), total)
+
+
+async def fetch_by_ids_concurrently(fetch: Callable[[List[int]], Awaitable],
+                                    ids: Iterable[int],
+                                    chunk_size: int = 100,
+                                    max_workers: int = 4) -> IdLookupResult:
+    """
+    pybacklogpy.pagination.fetch_by_ids_concurrently の非同期版
+    ID の配列 (id[]) で絞り込める一覧 API を使い、指定した ID の要素をまとめて取得する
+
+    :param fetch: ID のリストを受け取って、その ID の要素の一覧のレスポンスを返すコルーチン関数
+    :param ids: 取得する要素の ID (重複は1つにまとめる)
+    :param chunk_size: 1回のリクエストで取得する ID の数
+    :param max_workers: 同時に送るリクエスト数の上限
+
+    :return: IdLookupResult
+    """
+    unique_ids, chunks = split_ids(ids, chunk_size)
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def fetch_chunk(chunk):
+        async with semaphore:
+            return response_to_list(await fetch(chunk))
+
+    pages = await asyncio.gather(*[fetch_chunk(chunk) for chunk in chunks])
+    return merge_id_pages(list(pages), unique_ids)
@@ -0,0 +1,519 @@
+import asyncio
+import os
+from requests import Response
+from typing import Iterable, List, Optional, Tuple, Union
+
+from pybacklogpy import (Attachment as _Attachment, Category as _Category, CustomField as _CustomField,
+                         GitRepository as _GitRepository, Issue as _Issue, Licence as _Licence,
+                         Notification as _Notification, Priority as _Priority, Project as _Project,
+                         PullRequest as _PullRequest, Resolution as _Resolution, SharedFile as _SharedFile,
+                         Space as _Space, Star as _Star, Status as _Status, Team as _Team, User as _User,
+                         Version as _Version, Watch as _Watch, Webhook as _Webhook, Wiki as _Wiki)
+from pybacklogpy.BacklogConfigure import BacklogConfigure
+from pybacklogpy.aio.modules import get_async_request_sender
+from pybacklogpy.aio.pagination import (IdCursorPageIterator, OffsetPageIterator, fetch_by_ids_concurrently,
+                                        fetch_offset_pages_concurrently)
+from pybacklogpy.pagination import ExportResult, IdLookupResult
+from pybacklogpy.upload import MultipartStream, Source, UploadProgress
+
+
+class _AsyncResource:
+    """
+    同期版のクラスと同じメソッドを持ち、 RequestSender だけ非同期版に差し替える
+    各メソッドは await できるコルーチンを返す
+    """
+
+    def __init__(self, config: Optional[BacklogConfigure] = None):
+        super(_AsyncResource, self).__init__(config)
+        self.rs = get_async_request_sender(config)
+
+
+class Attachment(_AsyncResource, _Attachment.Attachment):
+    async def post_attachment_file(self,
+                                   filepath: Source,
+                                   filename: str,
+                                   progress: Optional[UploadProgress] = None) -> Response:
+        """
+        添付ファイルの送信
+        https://developer.nulab.com/ja/docs/backlog/api/2/post-attachment-file/
+
+        :param filepath: 添付ファイルのパス (ファイルオブジェクト、 bytes / memoryview も指定できる)
+        :param filename: 任意のファイル名
+        :param progress: 進捗を受け取る関数 (送信済みのバイト数, 全体のバイト数) が渡される
+
+        :return: レスポンス
+        """
+
+        path = self.base_path + '/attachment'
+        body = MultipartStream('file', filename, filepath, progress=progress)
+        try:
+            return await self.rs.post_multipart(path=path, body=body)
+        finally:
+            body.close()
+
+    async def post_attachment_files(self,
+                                    files: List[Union[str, Tuple[str, Source]]],
+                                    max_workers: int = 4,
+                                    progress: Optional[UploadProgress] = None) -> List[int]:
+        """
+        複数の添付ファイルを並行して送信し、添付ファイルの ID を返す
+
+        :param files: 添付ファイルのパス、または (ファイル名, 添付ファイルのパス・ファイルオブジェクト・データ) のリスト
+        :param max_workers: 同時に送信するファイル数の上限
+        :param progress: 進捗を受け取る関数 全てのファイルを合わせた (送信済みのバイト数, 全体のバイト数) が渡される
+
+        :return: 添付ファイルの ID のリスト (files と同じ順番)
+        :raises requests.exceptions.HTTPError: 送信に失敗したファイルがあった場合
+        """
+        entries = [(os.path.basename(f), f) if isinstance(f, str) else f for f in files]
+        total = sum(len(MultipartStream('file', filename, source)) for filename, source in entries)
+        sent = [0] * len(entries)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def send(index):
+            def file_progress(sent_bytes, _):
+                sent[index] = sent_bytes
+                progress(sum(sent), total)
+
+            filename, source = entries[index]
+            async with semaphore:
+                response = await self.post_attachment_file(source, filename,
+                                                           progress=file_progress if progress else None)
+            response.raise_for_status()
+            return response.json()['id']
+
+        return list(await asyncio.gather(*[send(index) for index in range(len(entries))]))
+
+
+class Category(_AsyncResource, _Category.Category):
+    pass
+
+
+class CustomField(_AsyncResource, _CustomField.CustomField):
+    pass
+
+
+class ListTypeCustomField(_AsyncResource, _CustomField.ListTypeCustomField):
+    pass
+
+
+class GitRepository(_AsyncResource, _GitRepository.GitRepository):
+    pass
+
+
+class Issue(_AsyncResource, _Issue.Issue):
+    def iter_issue_list(self,
+                        count: int = 100,
+                        prefetch: bool = False,
+                        **kwargs) -> OffsetPageIterator:
+        """
+        課題一覧を最後のページまで取得し、課題を1件ずつ返す (async for で使用する)
+
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param prefetch: True の場合、現在のページを処理している間に次のページを先読みする
+        :param kwargs: get_issue_list と同じ引数 (offset を指定した場合はそこから取得する)
+
+        :return: 課題の非同期イテレーター
+        """
+        offset = kwargs.pop('offset', None) or 0
+        return OffsetPageIterator(
+            fetch=lambda offset_, count_: self.get_issue_list(offset=offset_, count=count_, **kwargs),
+            count=count,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    async def export_issue_list(self,
+                                max_workers: int = 4,
+                                count: int = 100,
+                                **kwargs) -> ExportResult:
+        """
+        条件に一致する課題を全て取得する
+        最初に count_issue で件数を数え、全ページを並行に取得してからソート順に結合する
+
+        :param max_workers: 同時に取得するページ数の上限
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param kwargs: get_issue_list と同じ引数 (offset は指定できない)
+
+        :return: ExportResult 取得中に課題が更新されてページがずれた場合は duplicate_ids, missing_count に現れる
+        """
+        if 'offset' in kwargs:
+            raise ValueError('export_issue_list では offset は指定できません')
+        if not 1 <= count <= 100:
+            raise ValueError('count(取得上限)は1-100の範囲で指定してください')
+        response_count = await self.count_issue(**kwargs)
+        response_count.raise_for_status()
+        total = response_count.json()['count']
+        return await fetch_offset_pages_concurrently(
+            fetch=lambda offset_, count_: self.get_issue_list(offset=offset_, count=count_, **kwargs),
+            total=total,
+            count=count,
+            max_workers=max_workers,
+        )
+
+    async def get_issues_by_ids(self,
+                                ids: Iterable[int],
+                                chunk_size: int = 100,
+                                max_workers: int = 4) -> IdLookupResult:
+        """
+        ID を指定して課題をまとめて取得する
+        get_issue を1件ずつ呼ぶ代わりに、 get_issue_list の id[] で chunk_size 件ずつ並行に取得する
+
+        :param ids: 課題のID
+        :param chunk_size: 1回のリクエストで取得する課題の数(1-100)  指定が無い場合は100
+        :param max_workers: 同時に送るリクエスト数の上限
+
+        :return: IdLookupResult items は {課題のID: 課題} (ids の順), missing_ids は見つからなかった課題のID
+        """
+        if not 1 <= chunk_size <= 100:
+            raise ValueError('chunk_size は1-100の範囲で指定してください')
+        return await fetch_by_ids_concurrently(
+            fetch=lambda chunk: self.get_issue_list(id_=chunk, count=len(chunk)),
+            ids=ids,
+            chunk_size=chunk_size,
+            max_workers=max_workers,
+        )
+
+
+class IssueAttachment(_AsyncResource, _Issue.IssueAttachment):
+    pass
+
+
+class IssueComment(_AsyncResource, _Issue.IssueComment):
+    def iter_comment_list(self,
+                          issue_id_or_key: str,
+                          min_id: Optional[int] = None,
+                          max_id: Optional[int] = None,
+                          count: int = 100,
+                          order: str = 'desc',
+                          **kwargs) -> IdCursorPageIterator:
+        """
+        課題コメントを最後まで取得し、コメントを1件ずつ返す (async for で使用する)
+
+        :param issue_id_or_key: 課題のID または 課題キー
+        :param min_id: 最小ID 降順の場合はこの ID まで取得する
+        :param max_id: 最大ID 昇順の場合はこの ID まで取得する
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param order: “asc”または”desc” 指定が無い場合は”desc”
+        :param kwargs: get_comment_list と同じ引数
+
+        :return: コメントの非同期イテレーター
+        """
+        return IdCursorPageIterator(
+            fetch=lambda min_id_, max_id_: self.get_comment_list(
+                issue_id_or_key=issue_id_or_key, min_id=min_id_, max_id=max_id_, count=count, order=order, **kwargs),
+            count=count,
+            order=order,
+            min_id=min_id,
+            max_id=max_id,
+        )
+
+
+class IssueSharedFile(_AsyncResource, _Issue.IssueSharedFile):
+    pass
+
+
+class IssueType(_AsyncResource, _Issue.IssueType):
+    pass
+
+
+class Licence(_AsyncResource, _Licence.Licence):
+    pass
+
+
+class Notification(_AsyncResource, _Notification.Notification):
+    def iter_notification(self,
+                          min_id: Optional[int] = None,
+                          max_id: Optional[int] = None,
+                          count: int = 100,
+                          order: str = 'desc',
+                          **kwargs) -> IdCursorPageIterator:
+        """
+        お知らせ一覧を最後まで取得し、お知らせを1件ずつ返す (async for で使用する)
+
+        :param min_id: 最小ID 降順の場合はこの ID まで取得する
+        :param max_id: 最大ID 昇順の場合はこの ID まで取得する
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param order: “asc”または”desc” 指定が無い場合は”desc”
+        :param kwargs: get_notification と同じ引数
+
+        :return: お知らせの非同期イテレーター
+        """
+        return IdCursorPageIterator(
+            fetch=lambda min_id_, max_id_: self.get_notification(
+                min_id=min_id_, max_id=max_id_, count=count, order=order, **kwargs),
+            count=count,
+            order=order,
+            min_id=min_id,
+            max_id=max_id,
+        )
+
+
+class Priority(_AsyncResource, _Priority.Priority):
+    pass
+
+
+class Project(_AsyncResource, _Project.Project):
+    def iter_project_recent_updates(self,
+                                    project_id_or_key: str,
+                                    min_id: Optional[int] = None,
+                                    max_id: Optional[int] = None,
+                                    count: int = 100,
+                                    order: str = 'desc',
+                                    **kwargs) -> IdCursorPageIterator:
+        """
+        プロジェクトの最近の活動を最後まで取得し、活動を1件ずつ返す (async for で使用する)
+
+        :param project_id_or_key: プロジェクトのID または プロジェクトキー
+        :param min_id: 最小ID 降順の場合はこの ID まで取得する
+        :param max_id: 最大ID 昇順の場合はこの ID まで取得する
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param order: “asc”または”desc” 指定が無い場合は”desc”
+        :param kwargs: get_project_recent_updates と同じ引数
+
+        :return: 活動の非同期イテレーター
+        """
+        return IdCursorPageIterator(
+            fetch=lambda min_id_, max_id_: self.get_project_recent_updates(
+                project_id_or_key=project_id_or_key, min_id=min_id_, max_id=max_id_, count=count, order=order,
+                **kwargs),
+            count=count,
+            order=order,
+            min_id=min_id,
+            max_id=max_id,
+        )
+
+
+class ProjectTeam(_AsyncResource, _Project.ProjectTeam):
+    pass
+
+
+class PullRequest(_AsyncResource, _PullRequest.PullRequest):
+    def iter_pull_request_list(self,
+                               project_id_or_key: str,
+                               repo_id_or_name: str,
+                               count: int = 100,
+                               prefetch: bool = False,
+                               **kwargs) -> OffsetPageIterator:
+        """
+        プルリクエスト一覧を最後のページまで取得し、プルリクエストを1件ずつ返す (async for で使用する)
+
+        :param project_id_or_key: プロジェクトのID または プロジェクトキー
+        :param repo_id_or_name: リポジトリのID または リポジトリ名
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param prefetch: True の場合、現在のページを処理している間に次のページを先読みする
+        :param kwargs: get_pull_request_list と同じ引数 (offset を指定した場合はそこから取得する)
+
+        :return: プルリクエストの非同期イテレーター
+        """
+        offset = kwargs.pop('offset', None) or 0
+        return OffsetPageIterator(
+            fetch=lambda offset_, count_: self.get_pull_request_list(project_id_or_key=project_id_or_key,
+                                                                     repo_id_or_name=repo_id_or_name,
+                                                                     offset=offset_, count=count_, **kwargs),
+            count=count,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+
+class PullRequestAttachment(_AsyncResource, _PullRequest.PullRequestAttachment):
+    pass
+
+
+class PullRequestComment(_AsyncResource, _PullRequest.PullRequestComment):
+    pass
+
+
+class Resolution(_AsyncResource, _Resolution.Resolution):
+    pass
+
+
+class SharedFile(_AsyncResource, _SharedFile.SharedFile):
+    def iter_list_of_shared_files(self,
+                                  project_id_or_key: str,
+                                  file_path: str,
+                                  count: int = 1000,
+                                  prefetch: bool = False,
+                                  **kwargs) -> OffsetPageIterator:
+        """
+        共有ファイル一覧を最後のページまで取得し、共有ファイルを1件ずつ返す (async for で使用する)
+
+        :param project_id_or_key: プロジェクトのID または プロジェクトキー
+        :param file_path: ディレクトリのパス
+        :param count: 1ページあたりの取得件数(1-1000)  指定が無い場合は1000
+        :param prefetch: True の場合、現在のページを処理している間に次のページを先読みする
+        :param kwargs: get_list_of_shared_files と同じ引数 (offset を指定した場合はそこから取得する)
+
+        :return: 共有ファイルの非同期イテレーター
+        """
+        offset = kwargs.pop('offset', None) or 0
+        return OffsetPageIterator(
+            fetch=lambda offset_, count_: self.get_list_of_shared_files(project_id_or_key=project_id_or_key,
+                                                                        file_path=file_path,
+                                                                        offset=offset_, count=count_, **kwargs),
+            count=count,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+
+class Space(_AsyncResource, _Space.Space):
+    def iter_recent_updates(self,
+                            min_id: Optional[int] = None,
+                            max_id: Optional[int] = None,
+                            count: int = 100,
+                            order: str = 'desc',
+                            **kwargs) -> IdCursorPageIterator:
+        """
+        最近の更新を最後まで取得し、更新を1件ずつ返す (async for で使用する)
+
+        :param min_id: 最小ID 降順の場合はこの ID まで取得する
+        :param max_id: 最大ID 昇順の場合はこの ID まで取得する
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param order: “asc”または”desc” 指定が無い場合は”desc”
+        :param kwargs: get_recent_updates と同じ引数
+
+        :return: 更新の非同期イテレーター
+        """
+        return IdCursorPageIterator(
+            fetch=lambda min_id_, max_id_: self.get_recent_updates(
+                min_id=min_id_, max_id=max_id_, count=count, order=order, **kwargs),
+            count=count,
+            order=order,
+            min_id=min_id,
+            max_id=max_id,
+        )
+
+
+class Star(_AsyncResource, _Star.Project):
+    pass
+
+
+class Status(_AsyncResource, _Status.Status):
+    pass
+
+
+class Team(_AsyncResource, _Team.Team):
+    def iter_list_of_teams(self,
+                           count: int = 100,
+                           prefetch: bool = False,
+                           **kwargs) -> OffsetPageIterator:
+        """
+        チーム一覧を最後のページまで取得し、チームを1件ずつ返す (async for で使用する)
+
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param prefetch: True の場合、現在のページを処理している間に次のページを先読みする
+        :param kwargs: get_list_of_teams と同じ引数 (offset を指定した場合はそこから取得する)
+
+        :return: チームの非同期イテレーター
+        """
+        offset = kwargs.pop('offset', None) or 0
+        return OffsetPageIterator(
+            fetch=lambda offset_, count_: self.get_list_of_teams(offset=offset_, count=count_, **kwargs),
+            count=count,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+
+class User(_AsyncResource, _User.User):
+    def iter_user_recent_updates(self,
+                                 user_id: int,
+                                 min_id: Optional[int] = None,
+                                 max_id: Optional[int] = None,
+                                 count: int = 100,
+                                 order: str = 'desc',
+                                 **kwargs) -> IdCursorPageIterator:
+        """
+        ユーザーの最近の活動を最後まで取得し、活動を1件ずつ返す (async for で使用する)
+
+        :param user_id: ユーザーのID
+        :param min_id: 最小ID 降順の場合はこの ID まで取得する
+        :param max_id: 最大ID 昇順の場合はこの ID まで取得する
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param order: “asc”または”desc” 指定が無い場合は”desc”
+        :param kwargs: get_user_recent_updates と同じ引数
+
+        :return: 活動の非同期イテレーター
+        """
+        return IdCursorPageIterator(
+            fetch=lambda min_id_, max_id_: self.get_user_recent_updates(
+                user_id=user_id, min_id=min_id_, max_id=max_id_, count=count, order=order, **kwargs),
+            count=count,
+            order=order,
+            min_id=min_id,
+            max_id=max_id,
+        )
+
+
+class Version(_AsyncResource, _Version.Version):
+    pass
+
+
+class Watch(_AsyncResource, _Watch.Watch):
+    def iter_watching_list(self,
+                           user_id: int,
+                           count: int = 100,
+                           prefetch: bool = False,
+                           **kwargs) -> OffsetPageIterator:
+        """
+        ウォッチ一覧を最後のページまで取得し、ウォッチを1件ずつ返す (async for で使用する)
+
+        :param user_id: ユーザーのID
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param prefetch: True の場合、現在のページを処理している間に次のページを先読みする
+        :param kwargs: get_watching_list と同じ引数 (offset を指定した場合はそこから取得する)
+
+        :return: ウォッチの非同期イテレーター
+        """
+        offset = kwargs.pop('offset', None) or 0
+        return OffsetPageIterator(
+            fetch=lambda offset_, count_: self.get_watching_list(user_id=user_id, offset=offset_, count=count_,
+                                                                 **kwargs),
+            count=count,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+
+class Webhook(_AsyncResource, _Webhook.Webhook):
+    pass
+
+
+class Wiki(_AsyncResource, _Wiki.Wiki):
+    def iter_wiki_page_history(self,
+                               wiki_id: int,
+                               min_id: Optional[int] = None,
+                               max_id: Optional[int] = None,
+                               count: int = 100,
+                               order: str = 'desc',
+                               **kwargs) -> IdCursorPageIterator:
+        """
+        Wikiページ更新履歴を最後まで取得し、更新履歴を1件ずつ返す (async for で使用する)
+
+        :param wiki_id: WikiページのID
+        :param min_id: 最小ID 降順の場合はこの ID まで取得する
+        :param max_id: 最大ID 昇順の場合はこの ID まで取得する
+        :param count: 1ページあたりの取得件数(1-100)  指定が無い場合は100
+        :param order: “asc”または”desc” 指定が無い場合は”desc”
+        :param kwargs: get_wiki_page_history と同じ引数
+
+        :return: 更新履歴の非同期イテレーター
+        """
+        return IdCursorPageIterator(
+            fetch=lambda min_id_, max_id_: self.get_wiki_page_history(
+                wiki_id=wiki_id, min_id=min_id_, max_id=max_id_, count=count, order=order, **kwargs),
+            count=count,
+            order=order,
+            min_id=min_id,
+            max_id=max_id,
+        )
+
+
+class WikiAttachment(_AsyncResource, _Wiki.WikiAttachment):
+    pass
+
+
+class WikiSharedFile(_AsyncResource, _Wiki.WikiSharedFile):
+    pass
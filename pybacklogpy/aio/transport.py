@@ -0,0 +1,189 @@
+import asyncio
+from datetime import timedelta
+import time
+from typing import List, Optional, Tuple
+
+from requests import Response, exceptions
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    raise ImportError('pybacklogpy.aio を使うには aiohttp が必要です。 pip install pybacklogpy[aio] でインストールしてください')
+
+
+def to_query_items(param: Optional[dict]) -> List[Tuple[str, str]]:
+    """
+    requests と同じ形式の dict を aiohttp に渡せる (key, value) のリストに変換する
+    リストの値は同じキーで複数回送り、 bool は小文字の str にする
+    :param param: リクエストパラメーター
+    :return: (key, value) のリスト
+    """
+    items = []
+    if not param:
+        return items
+    for key, value in param.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for v in values:
+            if isinstance(v, bool):
+                v = str(v).lower()
+            items.append((key, str(v)))
+    return items
+
+
+async def next_chunk(chunks) -> Optional[bytes]:
+    """
+    ストリーミングのレスポンスの本文から次のチャンクを読む
+    :param chunks: aiohttp の StreamReader.iter_chunked が返す非同期イテレーター
+    :return: チャンク 最後まで読んだ場合は None
+    :raises requests.exceptions.Timeout: タイムアウトした場合
+    :raises requests.exceptions.ConnectionError: 途中で接続が切れた場合
+    """
+    try:
+        return await chunks.__anext__()
+    except StopAsyncIteration:
+        return None
+    except asyncio.TimeoutError as e:
+        raise exceptions.Timeout(e)
+    except aiohttp.ClientError as e:
+        raise exceptions.ConnectionError(e)
+
+
+class AsyncTransport:
+    """
+    aiohttp のコネクションプールを使う非同期 HTTP 通信層
+
+    aiohttp.ClientSession はイベントループに紐づくため、最初のリクエスト時に生成する。
+    別のイベントループ (asyncio.run を繰り返し呼んだ場合など) から使われた時は、前のループのセッションを閉じてから作り直す。
+    """
+
+    def __init__(self,
+                 pool_maxsize: int = 100,
+                 pool_maxsize_per_host: int = 10,
+                 keep_alive: bool = True,
+                 keepalive_timeout: float = 15,
+                 timeout: Optional[float] = None):
+        """
+        :param pool_maxsize: 全体での最大コネクション数
+        :param pool_maxsize_per_host: 1ホストあたりの最大コネクション数
+        :param keep_alive: False の場合、リクエストごとにコネクションを閉じる
+        :param keepalive_timeout: 使われていないコネクションを保持しておく秒数
+        :param timeout: 1リクエストあたりのタイムアウト(秒) 指定が無い場合は無制限
+        """
+        self.pool_maxsize = pool_maxsize
+        self.pool_maxsize_per_host = pool_maxsize_per_host
+        self.keep_alive = keep_alive
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._session = None  # type: Optional[aiohttp.ClientSession]
+        self._loop = None
+
+    async def _get_session(self) -> 'aiohttp.ClientSession':
+        loop = asyncio.get_event_loop()
+        if self._session is not None and self._loop is not loop:
+            await self._close_previous_session()
+        if self._session is None or self._session.closed:
+            if self.keep_alive:
+                connector = aiohttp.TCPConnector(limit=self.pool_maxsize,
+                                                 limit_per_host=self.pool_maxsize_per_host,
+                                                 keepalive_timeout=self.keepalive_timeout)
+            else:
+                connector = aiohttp.TCPConnector(limit=self.pool_maxsize,
+                                                 limit_per_host=self.pool_maxsize_per_host,
+                                                 force_close=True)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._loop = loop
+        return self._session
+
+    async def _close_previous_session(self):
+        """
+        別のイベントループで作ったセッションを閉じる
+        """
+        session, loop = self._session, self._loop
+        self._session = None
+        if session.closed:
+            return
+        if loop.is_running():
+            # 別のスレッドで動いているループのセッションは、そのループで閉じる
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        elif not loop.is_closed():
+            # 止まっているループは、このスレッドでは動かせない (実行中のループがある) ため、別のスレッドで動かして閉じる
+            await asyncio.get_event_loop().run_in_executor(None, loop.run_until_complete, session.close())
+        else:
+            # 閉じられたループのコネクションは閉じる処理を待てないため、セッションだけを閉じる
+            # (ソケットはトランスポートが解放された時に閉じられる)
+            await session.close()
+
+    async def request(self, method: str, url: str,
+                      params: Optional[dict] = None,
+                      data=None,
+                      files: Optional[dict] = None,
+                      headers: Optional[dict] = None,
+                      stream: bool = False) -> Response:
+        """
+        リクエストを送信する
+        引数は requests と同じ形式で受け取り、 requests の Response に詰め替えて返す
+        stream が True の場合は本文を読まずに返し、 aiohttp の ClientResponse を Response.raw に入れておく
+        (本文は raw.content から読み、読み終わったら Response.close を呼ぶ)
+
+        :param method: HTTP メソッド
+        :param url: リクエスト先のURL
+        :param params: URL パラメーター
+        :param data: フォームで送るパラメーター または 送信する本文のストリーム
+        :param files: 送信するファイル {'フィールド名': (ファイル名, ファイルオブジェクト)}
+        :param headers: 追加のリクエストヘッダー
+        :param stream: True の場合、本文を読み込まずに返す
+
+        :return: レスポンス
+        :raises requests.exceptions.Timeout: タイムアウトした場合
+        :raises requests.exceptions.ConnectionError: 接続に失敗した場合
+        """
+        body = None
+        if files:
+            body = aiohttp.FormData()
+            for key, value in to_query_items(data):
+                body.add_field(key, value)
+            for field_name, (filename, file_object) in files.items():
+                body.add_field(field_name, file_object, filename=filename)
+        elif hasattr(data, 'read'):
+            body = data  # MultipartStream などのストリームは aiohttp が少しずつ読み込んで送信する
+        elif data:
+            body = to_query_items(data)
+
+        started = time.monotonic()
+        session = await self._get_session()
+        # 再送の判断を同期版と共通にするため、例外は requests のものに変換する
+        try:
+            resp = await session.request(method, url, params=to_query_items(params), data=body, headers=headers)
+            if not stream:
+                try:
+                    content = await resp.read()
+                finally:
+                    resp.release()
+        except asyncio.TimeoutError as e:
+            raise exceptions.Timeout(e)
+        except aiohttp.ClientConnectionError as e:
+            raise exceptions.ConnectionError(e)
+
+        response = Response()
+        response.status_code = resp.status
+        response.reason = resp.reason
+        response.headers = CaseInsensitiveDict(resp.headers)
+        response.url = str(resp.url)
+        response.encoding = resp.charset
+        if stream:
+            response.raw = resp
+        else:
+            response._content = content
+            response._content_consumed = True
+        response.elapsed = timedelta(seconds=time.monotonic() - started)
+        return response
+
+    async def close(self):
+        """
+        プールしているコネクションを全て閉じる
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
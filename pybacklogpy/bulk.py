@@ -0,0 +1,223 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from pybacklogpy.BacklogConfigure import BacklogConfigure
+from pybacklogpy.Issue import Issue
+
+# 課題のID または 課題キー
+IssueIdOrKey = Union[int, str]
+
+# 1件ごとの結果
+# key: 課題のID または 課題キー, status: 'updated', 'unchanged', 'skipped', 'failed' のいずれか,
+# changes: 実際に送信した変更 (送信しなかった場合は {}), error: 失敗した場合の例外
+BulkItemResult = namedtuple('BulkItemResult', ['key', 'status', 'changes', 'error'])
+
+# 一括更新の結果
+# items: 1件ごとの結果 (指定した順), updated: 更新した課題, unchanged: 変更が無かったため更新しなかった課題,
+# skipped: チェックポイントに完了と記録されていたため処理しなかった課題, failed: 失敗した課題の (課題, 例外)
+BulkUpdateResult = namedtuple('BulkUpdateResult', ['items', 'updated', 'unchanged', 'skipped', 'failed'])
+
+# 進捗を受け取る関数: (処理済みの件数, 全体の件数)
+BulkProgress = Callable[[int, int], None]
+
+
+def _id(value: Optional[dict]) -> Optional[int]:
+    return value['id'] if value else None
+
+
+def _ids(values: Optional[List[dict]]) -> List[int]:
+    return sorted(v['id'] for v in values or [])
+
+
+def _date(value: Optional[str]) -> Optional[str]:
+    return value[:10] if value else None
+
+
+# update_issue の引数と、課題の JSON から現在の値を取り出す関数
+# ここに無い引数 (comment, notified_user_id, attachment_id, カスタム属性) は比較せずに送信する
+CURRENT_VALUES = {
+    'summary': lambda issue: issue.get('summary'),
+    'parent_issue_id': lambda issue: issue.get('parentIssueId'),
+    'description': lambda issue: issue.get('description'),
+    'status_id': lambda issue: _id(issue.get('status')),
+    'resolution_id': lambda issue: _id(issue.get('resolution')),
+    'start_date': lambda issue: _date(issue.get('startDate')),
+    'due_date': lambda issue: _date(issue.get('dueDate')),
+    'estimated_hours': lambda issue: issue.get('estimatedHours'),
+    'actual_hours': lambda issue: issue.get('actualHours'),
+    'issue_type_id': lambda issue: _id(issue.get('issueType')),
+    'category_id': lambda issue: _ids(issue.get('category')),
+    'version_id': lambda issue: _ids(issue.get('versions')),
+    'milestone_id': lambda issue: _ids(issue.get('milestone')),
+    'priority_id': lambda issue: _id(issue.get('priority')),
+    'assignee_id': lambda issue: _id(issue.get('assignee')),
+}
+
+
+def diff_issue_changes(issue: dict, changes: dict) -> dict:
+    """
+    変更のうち、課題の現在の値と異なるものだけを返す
+
+    比較できない項目 (コメント、通知先など) は、指定されていれば常にそのまま返す。
+
+    :param issue: 課題情報の取得 API が返す課題
+    :param changes: update_issue に渡す引数
+    :return: 送信する変更
+    """
+    result = {}
+    for name, value in changes.items():
+        if name not in CURRENT_VALUES:
+            result[name] = value
+            continue
+        expected = sorted(value) if isinstance(value, (list, tuple)) else value
+        if expected != CURRENT_VALUES[name](issue):
+            result[name] = value
+    return result
+
+
+class BulkCheckpoint:
+    """
+    一括処理の進捗を JSON Lines のファイルに記録する
+    処理した要素ごとに {"key": 要素, "status": 結果, ...} を1行追記する
+    """
+
+    def __init__(self, filepath: str):
+        """
+        :param filepath: チェックポイントのファイルのPATH
+        """
+        self.filepath = filepath
+        self._lock = threading.Lock()
+
+    def entries(self) -> Iterator[dict]:
+        """
+        :return: 記録された行のイテレーター (書き込み途中で中断された行は除く)
+        """
+        if not os.path.exists(self.filepath):
+            return
+        with open(self.filepath, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def completed(self) -> Set[str]:
+        """
+        :return: 前回までに完了した (更新した、または変更が無かった) 課題 (str にしたもの)
+        """
+        return set(str(entry['key']) for entry in self.entries() if entry.get('status') in ('updated', 'unchanged'))
+
+    def record(self, key: IssueIdOrKey, status: str, **fields):
+        """
+        :param key: 要素のキー
+        :param status: 結果
+        :param fields: 一緒に記録する値
+        """
+        entry = dict(fields, key=key, status=status)
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            with open(self.filepath, mode='a', encoding='utf-8') as f:
+                f.write(line + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+
+class BulkIssueUpdater:
+    """
+    多数の課題を並行して更新する
+
+    更新は max_workers 個のスレッドで行い、リクエストの間隔は RequestSender のレート制限に従う。
+    skip_unchanged が True の場合は、現在の値と同じ項目を送らず、変更が無い課題にはリクエストを送らない。
+    checkpoint を指定すると、完了した課題を記録し、同じファイルを指定して再実行した時にその課題を飛ばす。
+    """
+
+    def __init__(self,
+                 config: Optional[BacklogConfigure] = None,
+                 max_workers: int = 4):
+        """
+        :param config: 設定 指定が無い場合は環境変数・設定ファイルから読み込んだ設定を使う
+        :param max_workers: 同時に更新する課題数の上限
+        """
+        self.issue = Issue(config)
+        self.max_workers = max_workers
+
+    def update(self,
+               items: Iterable[Tuple[IssueIdOrKey, dict]],
+               skip_unchanged: bool = True,
+               checkpoint: Optional[str] = None,
+               progress: Optional[BulkProgress] = None) -> BulkUpdateResult:
+        """
+        課題を一括で更新する
+
+        :param items: (課題のID または 課題キー, update_issue に渡す引数の dict) のリスト
+            e.g.) [('TEST-1', {'status_id': 4, 'comment': '完了'}), ('TEST-2', {'assignee_id': 12345})]
+        :param skip_unchanged: True の場合、現在の値と比較して変更がある項目だけを送信する
+        :param checkpoint: 進捗を記録するファイルのPATH (JSON Lines) 前回と同じファイルを指定すると続きから処理する
+        :param progress: 進捗を受け取る関数 (処理済みの件数, 全体の件数) が渡される
+
+        :return: BulkUpdateResult
+        """
+        items = list(items)
+        store = BulkCheckpoint(checkpoint) if checkpoint else None
+        completed = store.completed() if store else set()
+        pending = [(key, changes) for key, changes in items if str(key) not in completed]
+        current = self._prefetch([key for key, _ in pending]) if skip_unchanged else {}
+        lock = threading.Lock()
+        done = [len(items) - len(pending)]
+
+        def run(item):
+            key, changes = item
+            try:
+                result = self._update(key, changes, skip_unchanged, current.get(key))
+            except Exception as e:
+                result = BulkItemResult(key=key, status='failed', changes={}, error=e)
+            if store and result.status != 'failed':
+                store.record(key, result.status)
+            if progress:
+                with lock:
+                    done[0] += 1
+                    progress(done[0], len(items))
+            return result
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = dict(zip((str(key) for key, _ in pending), executor.map(run, pending)))
+
+        report = BulkUpdateResult(items=[], updated=[], unchanged=[], skipped=[], failed=[])
+        for key, _ in items:
+            result = results.get(str(key))
+            if result is None:
+                result = BulkItemResult(key=key, status='skipped', changes={}, error=None)
+            report.items.append(result)
+            if result.status == 'failed':
+                report.failed.append((key, result.error))
+            else:
+                getattr(report, result.status).append(key)
+        return report
+
+    def _prefetch(self, keys: List[IssueIdOrKey]) -> Dict[int, dict]:
+        """
+        課題のIDで指定された課題の現在の値を、課題一覧の API でまとめて取得する
+        課題キーで指定された課題は、更新する直前に1件ずつ取得する
+        """
+        ids = [key for key in keys if isinstance(key, int)]
+        if not ids:
+            return {}
+        return self.issue.get_issues_by_ids(ids).items
+
+    def _update(self, key: IssueIdOrKey, changes: dict, skip_unchanged: bool,
+                current: Optional[dict]) -> BulkItemResult:
+        if skip_unchanged:
+            if current is None:
+                response = self.issue.get_issue(issue_id_or_key=str(key))
+                response.raise_for_status()
+                current = response.json()
+            changes = diff_issue_changes(current, changes)
+            if not changes:
+                return BulkItemResult(key=key, status='unchanged', changes={}, error=None)
+        response = self.issue.update_issue(issue_id_or_key=str(key), **changes)
+        response.raise_for_status()
+        return BulkItemResult(key=key, status='updated', changes=changes, error=None)
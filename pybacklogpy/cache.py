@@ -0,0 +1,191 @@
+from collections import OrderedDict
+import copy
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+if TYPE_CHECKING:
+    from requests import Response
+
+# ほとんど変更されない参照系 API と、キャッシュしておく秒数
+DEFAULT_CACHE_TTLS = {
+    r'priorities': 3600,
+    r'resolutions': 3600,
+    r'projects/[^/]+/issueTypes': 600,
+    r'projects/[^/]+/categories': 600,
+    r'projects/[^/]+/versions': 600,
+    r'projects/[^/]+/customFields': 600,
+    r'users': 600,
+}
+
+
+def _is_related_path(path: str, other: str) -> bool:
+    """
+    一方のパスがもう一方と同じか、その親・子孫のパスであるかどうか
+    """
+    return path == other or path.startswith(other + '/') or other.startswith(path + '/')
+
+
+class ResponseCache:
+    """
+    GET のレスポンスを保持するキャッシュ
+
+    パスの正規表現ごとに有効期限(秒)を指定し、一致するパスのレスポンスだけをキャッシュする。
+    件数が max_entries を超えた場合は、最も長く使われていないものから捨てる (LRU)。
+    同じ RequestSender で追加・更新・削除のリクエストを送ると、関係するパスのキャッシュは捨てられる。
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = 256):
+        """
+        :param ttls: {パスの正規表現: 有効期限(秒)} 指定が無い場合は DEFAULT_CACHE_TTLS
+        :param max_entries: キャッシュしておくレスポンスの最大件数
+        """
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in (ttls or DEFAULT_CACHE_TTLS).items()]
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl(self, path: str) -> Optional[float]:
+        """
+        :param path: API のパス
+        :return: パスに対応する有効期限(秒) キャッシュしない場合は None
+        """
+        path = path.strip('/')
+        for pattern, ttl in self.ttls:
+            if pattern.fullmatch(path):
+                return ttl
+        return None
+
+    @staticmethod
+    def key(api_url: str, path: str, params: Optional[dict]) -> tuple:
+        """
+        :param api_url: API の URL
+        :param path: API のパス
+        :param params: URL パラメーター (apiKey は含めない)
+        :return: キャッシュのキー
+        """
+        items = []
+        for name, value in (params or {}).items():
+            if name == 'apiKey':
+                continue
+            items.append((name, tuple(value) if isinstance(value, list) else value))
+        return api_url, path.strip('/'), tuple(sorted(items, key=lambda item: item[0]))
+
+    def get(self, key: tuple) -> Optional['Response']:
+        """
+        :param key: キャッシュのキー
+        :return: 期限内のレスポンスの複製 無い場合は None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        cached = copy.copy(response)
+        cached.from_cache = True
+        return cached
+
+    def set(self, key: tuple, response: 'Response', ttl: float):
+        """
+        :param key: キャッシュのキー
+        :param response: キャッシュするレスポンス
+        :param ttl: 有効期限(秒)
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, api_url: str, path: str):
+        """
+        パスと同じか、その親・子孫のパスのキャッシュを捨てる
+        :param api_url: API の URL
+        :param path: 追加・更新・削除したリソースのパス
+        """
+        path = path.strip('/')
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == api_url and _is_related_path(k[1], path)]:
+                del self._entries[key]
+
+    def clear(self):
+        """
+        全てのキャッシュを捨てる
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ValidatorStore:
+    """
+    GET のレスポンスを ETag / Last-Modified と一緒に保持し、条件付きリクエストで再検証するためのストア
+
+    次に同じ GET を送る時に If-None-Match / If-Modified-Since を付け、
+    304 Not Modified が返ってきた場合は保持していたレスポンスを返す。
+    件数が max_entries を超えた場合は、最も長く使われていないものから捨てる (LRU)。
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        :param max_entries: 保持しておくレスポンスの最大件数
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def conditional_headers(self, key: tuple) -> dict:
+        """
+        :param key: キャッシュのキー (ResponseCache.key)
+        :return: 条件付きリクエストのヘッダー 保持していない場合は空の dict
+        """
+        with self._lock:
+            response = self._entries.get(key)
+        if response is None:
+            return {}
+        headers = {}
+        if 'ETag' in response.headers:
+            headers['If-None-Match'] = response.headers['ETag']
+        if 'Last-Modified' in response.headers:
+            headers['If-Modified-Since'] = response.headers['Last-Modified']
+        return headers
+
+    def resolve(self, key: tuple, response: 'Response') -> 'Response':
+        """
+        レスポンスを受け取り、 304 の場合は保持していたレスポンスに置き換える
+        バリデーターを持つ 200 のレスポンスは次回の再検証のために保持する
+        :param key: キャッシュのキー (ResponseCache.key)
+        :param response: 受け取ったレスポンス
+        :return: 呼び出し元に返すレスポンス
+        """
+        with self._lock:
+            if response.status_code == 304:
+                stored = self._entries.get(key)
+                if stored is None:
+                    return response
+                self._entries.move_to_end(key)
+                revalidated = copy.copy(stored)
+                revalidated.from_cache = True
+                return revalidated
+            if response.status_code == 200 and ('ETag' in response.headers or 'Last-Modified' in response.headers):
+                self._entries[key] = response
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return response
+
+    def clear(self):
+        """
+        保持している全てのレスポンスを捨てる
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,256 @@
+import base64
+from collections import deque
+from datetime import timedelta
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Deque, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+if TYPE_CHECKING:
+    from requests import Response
+
+from pybacklogpy.transport import Transport, get_default_transport, set_default_transport
+
+# 記録しないパラメーター
+SECRET_PARAMS = frozenset(['apiKey'])
+
+# 記録しないレスポンスヘッダー (小文字で比べる)
+SECRET_HEADERS = frozenset(['set-cookie'])
+
+# API のパスの前の部分
+API_PREFIX = '/api/v2/'
+
+
+def _normalize(values) -> Optional[Dict[str, List[str]]]:
+    """
+    パラメーター・フォームの値を {名前: [値の文字列, ...]} にする (辞書以外の本文は None)
+    """
+    if not isinstance(values, dict):
+        return None
+    result = {}
+    for name, value in values.items():
+        if name in SECRET_PARAMS or value is None:
+            continue
+        items = value if isinstance(value, (list, tuple)) else [value]
+        result[name] = [str(item) for item in items]
+    return result
+
+
+def request_to_dict(method: str, url: str, **kwargs) -> dict:
+    """
+    リクエストを記録する形式にする (API キーは含めない)
+
+    :param method: HTTP メソッド
+    :param url: リクエスト先のURL
+    :param kwargs: Transport.request に渡された引数
+    :return: {'method': ..., 'path': ..., 'params': ..., 'data': ..., 'files': ...}
+    """
+    path = urlsplit(url).path
+    if path.startswith(API_PREFIX):
+        path = path[len(API_PREFIX):]
+    files = kwargs.get('files')
+    return {
+        'method': method,
+        'path': path,
+        'params': _normalize(kwargs.get('params')) or {},
+        'data': _normalize(kwargs.get('data')),
+        'files': sorted(files) if files else None,
+    }
+
+
+def request_key(request: dict, match_data: bool = True) -> str:
+    """
+    :param request: request_to_dict で作ったリクエスト
+    :param match_data: False の場合、フォームの値とファイルを比べない
+    :return: 同じリクエストかどうかを比べるためのキー
+    """
+    if not match_data:
+        request = dict(request, data=None, files=None)
+    return json.dumps(request, sort_keys=True, ensure_ascii=False)
+
+
+def response_to_dict(response: 'Response', elapsed: float) -> dict:
+    """
+    レスポンスを記録する形式にする (本文は読み込まれる Cookie は含めない)
+
+    :param response: レスポンス
+    :param elapsed: 送信してから本文を受け取るまでにかかった秒数
+    :return: {'status_code': ..., 'headers': ..., 'body': ... または 'body_base64': ..., 'elapsed': ...}
+    """
+    recorded = {
+        'status_code': response.status_code,
+        'headers': {name: value for name, value in response.headers.items() if name.lower() not in SECRET_HEADERS},
+        'elapsed': elapsed,
+    }
+    content = response.content or b''
+    try:
+        recorded['body'] = content.decode('utf-8')
+    except UnicodeDecodeError:
+        recorded['body_base64'] = base64.b64encode(content).decode('ascii')
+    return recorded
+
+
+def dict_to_response(recorded: dict, url: str) -> 'Response':
+    """
+    記録したレスポンスから Response を作る
+
+    :param recorded: response_to_dict で作ったレスポンス
+    :param url: リクエスト先のURL
+    :return: 本文を読み込んだ状態の Response
+    """
+    from http.client import responses
+    from requests import Response
+    from requests.structures import CaseInsensitiveDict
+
+    response = Response()
+    response.status_code = recorded['status_code']
+    response.reason = responses.get(response.status_code, '')
+    response.headers = CaseInsensitiveDict(recorded['headers'])
+    if 'body_base64' in recorded:
+        response._content = base64.b64decode(recorded['body_base64'])
+    else:
+        response._content = recorded['body'].encode('utf-8')
+    response._content_consumed = True
+    response.encoding = 'utf-8'
+    response.url = url
+    response.elapsed = timedelta(seconds=recorded['elapsed'])
+    return response
+
+
+class Cassette:
+    """
+    リクエストとレスポンスの組を JSON Lines のファイルに記録する
+    1行に {"request": request_to_dict の結果, "response": response_to_dict の結果} を1つ書く
+    """
+
+    def __init__(self, filepath: str):
+        """
+        :param filepath: カセットのファイルのPATH
+        """
+        self.filepath = filepath
+        self._lock = threading.Lock()
+
+    def interactions(self) -> Iterator[dict]:
+        """
+        :return: 記録した順のリクエストとレスポンスの組のイテレーター
+        """
+        if not os.path.exists(self.filepath):
+            return
+        with open(self.filepath, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def append(self, request: dict, response: dict):
+        """
+        :param request: request_to_dict で作ったリクエスト
+        :param response: response_to_dict で作ったレスポンス
+        """
+        line = json.dumps({'request': request, 'response': response}, ensure_ascii=False)
+        with self._lock:
+            with open(self.filepath, mode='a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+    def clear(self):
+        """
+        記録を全て消す
+        """
+        with self._lock:
+            if os.path.exists(self.filepath):
+                os.remove(self.filepath)
+
+
+class RecordingTransport(Transport):
+    """
+    実際に通信し、リクエストとレスポンスの組をカセットに記録する Transport
+    """
+
+    def __init__(self, cassette: Cassette, transport: Optional[Transport] = None):
+        """
+        :param cassette: 記録先のカセット
+        :param transport: 実際に通信する Transport 指定が無い場合はプロセス内で共有されるコネクションプールを使う
+        """
+        super(RecordingTransport, self).__init__()
+        self.cassette = cassette
+        self.transport = transport if transport else get_default_transport()
+
+    def request(self, method: str, url: str, **kwargs) -> 'Response':
+        start = time.monotonic()
+        response = self.transport.request(method=method, url=url, **kwargs)
+        recorded = response_to_dict(response, time.monotonic() - start)
+        self.cassette.append(request_to_dict(method, url, **kwargs), recorded)
+        return response
+
+
+class ReplayTransport(Transport):
+    """
+    通信せずに、カセットに記録したレスポンスを返す Transport
+
+    リクエストはメソッド・パス・パラメーター・フォームの値が一致する記録と対応させ、同じリクエストが複数回記録されている場合は
+    記録した順に返す。記録した回数より多く送られた場合は、最後のレスポンスを繰り返し返す。
+    ホスト名と API キーは比べないため、記録した時と違う設定でも再生できる。
+    """
+
+    def __init__(self,
+                 cassette: Cassette,
+                 latency: float = 0.0,
+                 recorded_latency: bool = False,
+                 match_data: bool = True):
+        """
+        :param cassette: 再生するカセット
+        :param latency: レスポンスを返す前に待つ秒数
+        :param recorded_latency: True の場合、記録した時にかかった秒数も待つ
+        :param match_data: False の場合、フォームの値とファイルを比べない (日時などを含むリクエストを再生する場合)
+        """
+        super(ReplayTransport, self).__init__()
+        self.cassette = cassette
+        self.latency = latency
+        self.recorded_latency = recorded_latency
+        self.match_data = match_data
+        self._responses = {}  # type: Dict[str, Deque[dict]]
+        for interaction in cassette.interactions():
+            key = request_key(interaction['request'], match_data)
+            self._responses.setdefault(key, deque()).append(interaction['response'])
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, **kwargs) -> 'Response':
+        request = request_to_dict(method, url, **kwargs)
+        with self._lock:
+            responses = self._responses.get(request_key(request, self.match_data))
+            if not responses:
+                raise ValueError('カセットに記録されていないリクエストです: {method} {path}'.format(**request))
+            recorded = responses.popleft() if len(responses) > 1 else responses[0]
+        wait = self.latency + (recorded['elapsed'] if self.recorded_latency else 0.0)
+        if wait > 0:
+            time.sleep(wait)
+        return dict_to_response(recorded, url)
+
+
+def use_cassette(filepath: str,
+                 mode: str = 'replay',
+                 latency: float = 0.0,
+                 recorded_latency: bool = False,
+                 match_data: bool = True) -> Transport:
+    """
+    Transport を明示しなかった場合に共有される Transport を、カセットを記録・再生する Transport にする
+
+    :param filepath: カセットのファイルのPATH
+    :param mode: 'record' (記録し直す) または 'replay' (再生する)
+    :param latency: 再生する時に、レスポンスを返す前に待つ秒数
+    :param recorded_latency: True の場合、再生する時に記録した時にかかった秒数も待つ
+    :param match_data: False の場合、再生する時にフォームの値とファイルを比べない
+    :return: 設定した Transport
+    """
+    if mode not in {'record', 'replay'}:
+        raise ValueError('mode は record または replay のみが使用できます')
+    cassette = Cassette(filepath)
+    if mode == 'record':
+        cassette.clear()
+        # 共有されている Transport が前に設定したカセットの Transport の場合もあるため、新しく作ったものを使う
+        transport = RecordingTransport(cassette, Transport())  # type: Transport
+    else:
+        transport = ReplayTransport(cassette, latency=latency, recorded_latency=recorded_latency,
+                                    match_data=match_data)
+    set_default_transport(transport)
+    return transport
@@ -0,0 +1,75 @@
+import copy
+import threading
+from typing import TYPE_CHECKING, Callable, Dict
+if TYPE_CHECKING:
+    from requests import Response
+
+
+class _Call:
+    """
+    送信中のリクエスト 完了すると結果 (レスポンスまたは例外) を保持する
+    """
+    __slots__ = ('done', 'response', 'exception')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.exception = None
+
+
+class RequestCoalescer:
+    """
+    同時に送られた同じ GET リクエスト (パスとパラメーターが同じもの) を1回の通信にまとめる
+
+    最初のスレッドだけがリクエストを送り、送信中に同じリクエストを送ろうとしたスレッドは、その結果を待って受け取る。
+    受け取るレスポンスは複製 (copy.copy) で、本文は最初のスレッドのレスポンスと共有し、デコードは複製ごとに行う。
+    リクエストが例外で終わった場合は、待っていた全てのスレッドで同じ例外を送出する。
+    完了したリクエストの結果は保持しないため、後から送られたリクエストは改めて送信される。
+    """
+
+    def __init__(self):
+        self._calls = {}  # type: Dict[tuple, _Call]
+        self._lock = threading.Lock()
+        # まとめられたリクエストの数 (送信せずに結果を受け取った回数)
+        self.coalesced = 0
+
+    def do(self, key: tuple, send: Callable[[], 'Response']) -> 'Response':
+        """
+        :param key: リクエストのキー (ResponseCache.key と同じ形式)
+        :param send: リクエストを送信する関数
+        :return: レスポンス
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.exception is not None:
+                raise call.exception
+            response = copy.copy(call.response)
+            response.coalesced = True
+            return response
+
+        try:
+            call.response = send()
+            return call.response
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """
+        :return: 送信中のリクエストの数
+        """
+        with self._lock:
+            return len(self._calls)
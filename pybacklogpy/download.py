@@ -0,0 +1,355 @@
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterable, List, Optional, Union
+if TYPE_CHECKING:
+    from requests import Response
+
+from pybacklogpy.retry import RetryPolicy
+
+# ダウンロード時に1度に読み書きするバイト数
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# 保存先を指定しなかった場合のディレクトリ
+DEFAULT_DOWNLOAD_DIRECTORY = 'tmp'
+
+# 再開可能なダウンロードで、途中経過を記録するまでに書き込むバイト数
+DEFAULT_CHECKPOINT_SIZE = 8 * 1024 * 1024
+
+# 保存先: ファイルまたはディレクトリのPATH、書き込み可能なファイルオブジェクト、チャンクを受け取る関数
+Destination = Union[None, str, BinaryIO, Callable[[bytes], None]]
+
+# 進捗を受け取る関数: (ダウンロード済みのバイト数, 全体のバイト数 不明な場合は None)
+Progress = Callable[[int, Optional[int]], None]
+
+
+def get_file_name(content_disposition_header: str) -> str:
+    """
+    Content-Disposition ヘッダーからファイル名を取り出す
+    :param content_disposition_header:
+    :return:
+    """
+    # ↓ホントにこんなダラダラ書く必要あんのかな・・？
+    fn = content_disposition_header[
+         content_disposition_header.find('filename') + len('filename'):len(content_disposition_header)]
+    m = fn.find('*=')
+    fn2 = fn
+    if not m == -1:
+        fn2 = fn[:m] + fn[m + 2:]
+    m = re.search("UTF-8''", fn2)
+    if not m:
+        return fn2
+    return fn2[:m.start()] + fn2[m.end():]
+
+
+def get_response_file_name(response: 'Response') -> str:
+    """
+    レスポンスのファイル名を返す
+    Content-Disposition ヘッダーが無い場合 (ユーザーアイコンなど) は URL の最後の部分を使う
+    :param response: ファイルのレスポンス
+    :return: ファイル名
+    """
+    if 'Content-Disposition' in response.headers:
+        return get_file_name(response.headers['Content-Disposition'])
+    return response.url.split('?')[0].rstrip('/').split('/')[-1]
+
+
+def get_content_length(response: 'Response') -> Optional[int]:
+    """
+    :param response: ファイルのレスポンス
+    :return: Content-Length 不明な場合は None
+    """
+    try:
+        return int(response.headers['Content-Length'])
+    except (KeyError, ValueError):
+        return None
+
+
+def resolve_destination_path(destination: Optional[str], filename: str) -> str:
+    """
+    保存先のファイルのPATHを決める
+    :param destination: ファイルまたはディレクトリのPATH 指定が無い場合は tmp ディレクトリ
+    :param filename: レスポンスのファイル名
+    :return: 保存するファイルのPATH
+    """
+    if destination is None:
+        return '{directory}/{filename}'.format(directory=DEFAULT_DOWNLOAD_DIRECTORY, filename=filename)
+    if os.path.isdir(destination) or destination.endswith(('/', os.sep)):
+        return os.path.join(destination, filename)
+    return destination
+
+
+def write_chunks(chunks: Iterable[bytes],
+                 destination: Destination,
+                 filename: str,
+                 total: Optional[int] = None,
+                 progress: Optional[Progress] = None) -> str:
+    """
+    ダウンロードしたデータをチャンクごとに保存先に書き込む
+    ファイルに保存する場合は、書き込みが完了するまで PATH + '.part' に書き込み、完了後に名前を変える
+
+    :param chunks: データのチャンク
+    :param destination: 保存先 (PATH, ファイルオブジェクト, チャンクを受け取る関数) 指定が無い場合は tmp ディレクトリ
+    :param filename: レスポンスのファイル名
+    :param total: 全体のバイト数
+    :param progress: 進捗を受け取る関数
+
+    :return: 保存されたファイルのPATH (ファイルオブジェクト・関数に書き込んだ場合はファイル名)
+    """
+    downloaded = 0
+    if destination is None or isinstance(destination, str):
+        filepath = resolve_destination_path(destination, filename)
+        part_path = filepath + '.part'
+        with open(part_path, mode='wb') as save_file:
+            for chunk in chunks:
+                save_file.write(chunk)
+                downloaded += len(chunk)
+                if progress:
+                    progress(downloaded, total)
+        os.replace(part_path, filepath)
+        return filepath
+
+    write = destination.write if hasattr(destination, 'write') else destination
+    for chunk in chunks:
+        write(chunk)
+        downloaded += len(chunk)
+        if progress:
+            progress(downloaded, total)
+    return getattr(destination, 'name', filename) if hasattr(destination, 'write') else filename
+
+
+def iter_bytes(content: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterable[bytes]:
+    """
+    メモリ上のデータを chunk_size ごとに区切って返す
+    :param content: データ
+    :param chunk_size: チャンクのバイト数
+    :return: チャンクのイテレーター
+    """
+    view = memoryview(content)
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size].tobytes()
+
+
+def parse_content_range(content_range: Optional[str]) -> Optional[int]:
+    """
+    Content-Range ヘッダー (bytes 0-0/12345) からファイル全体のバイト数を取り出す
+    :param content_range: Content-Range ヘッダー
+    :return: 全体のバイト数 不明な場合は None
+    """
+    m = re.match(r'bytes\s+\d+-\d+/(\d+)', content_range or '')
+    if not m:
+        return None
+    return int(m.group(1))
+
+
+def split_ranges(total: int, segments: int) -> List[List[int]]:
+    """
+    ファイルを segments 個の範囲に分ける
+    :param total: 全体のバイト数
+    :param segments: 分割数
+    :return: [開始位置, 終了位置(含まない), ダウンロード済みのバイト数] のリスト
+    """
+    if not total:
+        return [[0, 0, 0]]
+    segments = max(1, min(segments, total))
+    size = -(-total // segments)
+    return [[start, min(start + size, total), 0] for start in range(0, total, size)]
+
+
+def file_sha256(filepath: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """
+    :param filepath: ファイルのPATH
+    :param chunk_size: 1度に読み込むバイト数
+    :return: ファイルの SHA-256 (16進数の文字列)
+    """
+    digest = hashlib.sha256()
+    with open(filepath, mode='rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PartialDownload:
+    """
+    途中までダウンロードしたファイル
+
+    データは PATH + '.part' に書き込み、各範囲のダウンロード済みのバイト数を PATH + '.part.json' に記録する。
+    中断した後に同じファイルをダウンロードすると、サーバー上のファイルが変わっていなければ残りの範囲だけを取得する。
+    """
+
+    def __init__(self, filepath: str, total: int, validator: Optional[str], segments: List[List[int]]):
+        """
+        :param filepath: 保存するファイルのPATH
+        :param total: 全体のバイト数
+        :param validator: サーバー上のファイルを識別する ETag または Last-Modified
+        :param segments: [開始位置, 終了位置(含まない), ダウンロード済みのバイト数] のリスト
+        """
+        self.filepath = filepath
+        self.part_path = filepath + '.part'
+        self.state_path = filepath + '.part.json'
+        self.total = total
+        self.validator = validator
+        self.segments = segments
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, filepath: str, total: int, validator: Optional[str], segments: int = 1) -> 'PartialDownload':
+        """
+        途中経過が残っていて、サーバー上のファイルと一致する場合は続きから、そうでなければ最初からダウンロードする
+        :param filepath: 保存するファイルのPATH
+        :param total: 全体のバイト数
+        :param validator: サーバー上のファイルを識別する ETag または Last-Modified
+        :param segments: 最初からダウンロードする場合の分割数
+        :return: PartialDownload
+        """
+        download = cls(filepath, total, validator, split_ranges(total, segments))
+        try:
+            with open(download.state_path, mode='r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state['total'] == total and state['validator'] == validator \
+                    and os.path.getsize(download.part_path) == total:
+                download.segments = state['segments']
+                return download
+        except (OSError, ValueError, KeyError):
+            pass
+        with open(download.part_path, mode='wb') as f:
+            f.truncate(total)
+        download.checkpoint()
+        return download
+
+    @property
+    def downloaded(self) -> int:
+        """
+        :return: ダウンロード済みのバイト数
+        """
+        return sum(done for _, _, done in self.segments)
+
+    def pending(self) -> List[int]:
+        """
+        :return: ダウンロードが終わっていない範囲の番号
+        """
+        return [i for i, (start, end, done) in enumerate(self.segments) if start + done < end]
+
+    def advance(self, index: int, done: int):
+        """
+        範囲のダウンロード済みのバイト数を更新し、途中経過を記録する
+        データはこれを呼ぶ前にファイルに書き出しておくこと
+        :param index: 範囲の番号
+        :param done: その範囲のダウンロード済みのバイト数
+        """
+        with self._lock:
+            self.segments[index][2] = done
+            self.checkpoint()
+
+    def checkpoint(self):
+        """
+        途中経過を PATH + '.part.json' に記録する
+        """
+        state = {'total': self.total, 'validator': self.validator, 'segments': self.segments}
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, mode='w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def complete(self, sha256: Optional[str] = None) -> str:
+        """
+        サイズ (と指定された場合は SHA-256) を検査し、 PATH + '.part' を PATH に置き換える
+        検査に失敗した場合は途中経過を捨てる
+        :param sha256: ファイルの SHA-256 (16進数の文字列)
+        :return: 保存されたファイルのPATH
+        """
+        if self.pending() or os.path.getsize(self.part_path) != self.total:
+            self.discard()
+            raise ValueError('ダウンロードしたファイルのサイズが一致しません')
+        if sha256 and file_sha256(self.part_path) != sha256.lower():
+            self.discard()
+            raise ValueError('ダウンロードしたファイルの SHA-256 が一致しません')
+        os.replace(self.part_path, self.filepath)
+        os.remove(self.state_path)
+        return self.filepath
+
+    def discard(self):
+        """
+        途中までダウンロードしたファイルと途中経過を削除する
+        """
+        for path in (self.part_path, self.state_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def download_ranges(fetch: Callable[[int, int], 'Response'],
+                    download: PartialDownload,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    progress: Optional[Progress] = None,
+                    retry_policy: Optional[RetryPolicy] = None,
+                    checkpoint_size: int = DEFAULT_CHECKPOINT_SIZE):
+    """
+    ダウンロードが終わっていない範囲を Range リクエストで取得し、 PartialDownload に書き込む
+    範囲が複数ある場合は並行して取得する
+    通信が途中で切れた場合は、 retry_policy に従って切れた位置から取得し直す
+
+    :param fetch: (開始位置, 終了位置(含む)) を受け取り、ストリーミングのレスポンスを返す関数
+    :param download: 書き込み先
+    :param chunk_size: 1度に読み書きするバイト数
+    :param progress: 進捗を受け取る関数
+    :param retry_policy: 再送の方針 指定が無い場合は再送しない
+    :param checkpoint_size: 途中経過を記録するまでに書き込むバイト数
+    """
+    from requests import exceptions
+    progress_lock = threading.Lock()
+    downloaded = [download.downloaded]
+
+    def notify(size):
+        if progress:
+            with progress_lock:
+                downloaded[0] += size
+                progress(downloaded[0], download.total)
+
+    def fetch_segment(index):
+        start, end, done = download.segments[index]
+        retries = 0
+        while start + done < end:
+            response = fetch(start + done, end - 1)
+            try:
+                if response.status_code != 206:
+                    # Range に対応していない、またはサーバー上のファイルが変わった
+                    download.discard()
+                    raise ValueError('ファイルの途中からのダウンロードに失敗しました (ステータスコード: {0})'
+                                     .format(response.status_code))
+                with open(download.part_path, mode='r+b') as f:
+                    f.seek(start + done)
+                    unsaved = 0
+                    try:
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            chunk = chunk[:end - start - done]
+                            f.write(chunk)
+                            done += len(chunk)
+                            unsaved += len(chunk)
+                            notify(len(chunk))
+                            if unsaved >= checkpoint_size:
+                                f.flush()
+                                download.advance(index, done)
+                                unsaved = 0
+                    finally:
+                        f.flush()
+                        download.advance(index, done)
+            except (exceptions.ConnectionError, exceptions.ChunkedEncodingError, exceptions.Timeout):
+                if retry_policy is None or retries >= retry_policy.max_retries:
+                    raise
+                time.sleep(retry_policy.backoff(retries))
+                retries += 1
+            finally:
+                response.close()
+
+    pending = download.pending()
+    if len(pending) <= 1:
+        for index in pending:
+            fetch_segment(index)
+        return
+    with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+        for future in [executor.submit(fetch_segment, index) for index in pending]:
+            future.result()
@@ -0,0 +1,226 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from pybacklogpy.BacklogConfigure import BacklogConfigure
+from pybacklogpy.GitRepository import GitRepository
+from pybacklogpy.Issue import Issue, IssueAttachment
+from pybacklogpy.Project import Project
+from pybacklogpy.PullRequest import PullRequest, PullRequestAttachment
+from pybacklogpy.Wiki import Wiki, WikiAttachment
+from pybacklogpy.download import DEFAULT_CHUNK_SIZE, file_sha256
+from pybacklogpy.pagination import response_to_list
+
+# ダウンロードする添付ファイル
+# kind: 'issue', 'wiki', 'pull_request' のいずれか, attachment: 添付ファイル一覧 API の要素,
+# filepath: 保存するファイルのPATH, download: 保存先の PATH を受け取ってダウンロードする関数
+HarvestItem = namedtuple('HarvestItem', ['kind', 'attachment', 'filepath', 'download'])
+
+# 一括ダウンロードの結果
+# downloaded: ダウンロードしたファイルのPATH, skipped: 既に保存されていたためダウンロードしなかったファイルのPATH,
+# duplicates: 内容が同じファイルの (PATH, 最初に保存されたファイルのPATH), failed: 失敗したファイルの (PATH, エラー)
+HarvestResult = namedtuple('HarvestResult', ['downloaded', 'skipped', 'duplicates', 'failed'])
+
+
+def _safe_name(name) -> str:
+    """
+    ファイル名・ディレクトリ名に使えない文字を置き換える
+    """
+    return str(name).replace('/', '_').replace('\\', '_')
+
+
+def _attachment_path(directory: str, attachment: dict) -> str:
+    return os.path.join(directory, '{id}_{name}'.format(id=attachment['id'], name=_safe_name(attachment['name'])))
+
+
+class AttachmentHarvester:
+    """
+    プロジェクトの課題・Wiki・プルリクエストの添付ファイルをまとめてダウンロードする
+
+    ダウンロードは max_workers 個のスレッドで並行して行う。
+    既に同じサイズのファイルが保存されている場合はダウンロードしない。
+    内容 (SHA-256) が同じファイルは、最初に保存したファイルへのハードリンクに置き換える。
+
+    保存先のディレクトリ構成:
+        {directory}/issues/{課題キー}/{添付ファイルID}_{ファイル名}
+        {directory}/wiki/{WikiページID}/{添付ファイルID}_{ファイル名}
+        {directory}/pull_requests/{リポジトリ名}/{プルリクエスト番号}/{添付ファイルID}_{ファイル名}
+    """
+
+    def __init__(self,
+                 config: Optional[BacklogConfigure] = None,
+                 max_workers: int = 4,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        :param config: 設定 指定が無い場合は設定ファイルから読み込む
+        :param max_workers: 同時にダウンロードするファイル数の上限
+        :param chunk_size: 1度に読み書きするバイト数
+        """
+        self.project = Project(config)
+        self.issue = Issue(config)
+        self.issue_attachment = IssueAttachment(config)
+        self.wiki = Wiki(config)
+        self.wiki_attachment = WikiAttachment(config)
+        self.git_repository = GitRepository(config)
+        self.pull_request = PullRequest(config)
+        self.pull_request_attachment = PullRequestAttachment(config)
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._hashes = {}
+        self._lock = threading.Lock()
+
+    def iter_issue_attachments(self, project_id: int, directory: str) -> Iterator[HarvestItem]:
+        """
+        :param project_id: プロジェクトのID
+        :param directory: 保存先のディレクトリ
+        :return: 課題の添付ファイルのイテレーター
+        """
+        for issue in self.issue.iter_issue_list(project_id=[project_id], attachment=True):
+            attachments = issue.get('attachments')
+            if attachments is None:
+                attachments = response_to_list(
+                    self.issue_attachment.get_list_of_issue_attachments(issue_id_or_key=issue['issueKey']))
+            issue_directory = os.path.join(directory, 'issues', _safe_name(issue['issueKey']))
+            for attachment in attachments:
+                yield HarvestItem(
+                    kind='issue',
+                    attachment=attachment,
+                    filepath=_attachment_path(issue_directory, attachment),
+                    download=self._downloader(self.issue_attachment.get_issue_attachment,
+                                              issue_id_or_key=issue['issueKey'], attachment_id=attachment['id']))
+
+    def iter_wiki_attachments(self, project_id_or_key: str, directory: str) -> Iterator[HarvestItem]:
+        """
+        :param project_id_or_key: プロジェクトのID または プロジェクトキー
+        :param directory: 保存先のディレクトリ
+        :return: Wiki の添付ファイルのイテレーター
+        """
+        for wiki in response_to_list(self.wiki.get_wiki_page_list(project_id_or_key=project_id_or_key)):
+            attachments = wiki.get('attachments')
+            if attachments is None:
+                attachments = response_to_list(self.wiki_attachment.get_list_of_wiki_attachments(wiki_id=wiki['id']))
+            wiki_directory = os.path.join(directory, 'wiki', str(wiki['id']))
+            for attachment in attachments:
+                yield HarvestItem(
+                    kind='wiki',
+                    attachment=attachment,
+                    filepath=_attachment_path(wiki_directory, attachment),
+                    download=self._downloader(self.wiki_attachment.get_wiki_page_attachment,
+                                              wiki_id=wiki['id'], attachment_id=attachment['id']))
+
+    def iter_pull_request_attachments(self, project_id_or_key: str, directory: str) -> Iterator[HarvestItem]:
+        """
+        :param project_id_or_key: プロジェクトのID または プロジェクトキー
+        :param directory: 保存先のディレクトリ
+        :return: プルリクエストの添付ファイルのイテレーター
+        """
+        repositories = response_to_list(
+            self.git_repository.get_list_of_git_repositories(project_id_or_key=project_id_or_key))
+        for repository in repositories:
+            for pull_request in self.pull_request.iter_pull_request_list(project_id_or_key=project_id_or_key,
+                                                                         repo_id_or_name=repository['name']):
+                attachments = pull_request.get('attachments')
+                if attachments is None:
+                    attachments = response_to_list(self.pull_request_attachment.get_list_of_pull_request_attachment(
+                        project_id_or_key=project_id_or_key, repo_id_or_name=repository['name'],
+                        number=pull_request['number']))
+                pull_request_directory = os.path.join(directory, 'pull_requests', _safe_name(repository['name']),
+                                                      str(pull_request['number']))
+                for attachment in attachments:
+                    yield HarvestItem(
+                        kind='pull_request',
+                        attachment=attachment,
+                        filepath=_attachment_path(pull_request_directory, attachment),
+                        download=self._downloader(self.pull_request_attachment.download_pull_request_attachment,
+                                                  project_id_or_key=project_id_or_key,
+                                                  repo_id_or_name=repository['name'],
+                                                  number=pull_request['number'],
+                                                  attachment_id=attachment['id']))
+
+    def _downloader(self, method: Callable, **kwargs) -> Callable[[str], Tuple[str, object]]:
+        return lambda destination: method(destination=destination, chunk_size=self.chunk_size, **kwargs)
+
+    def harvest(self,
+                project_id_or_key: str,
+                directory: str,
+                issues: bool = True,
+                wiki: bool = True,
+                pull_requests: bool = True) -> HarvestResult:
+        """
+        プロジェクトの添付ファイルをまとめてダウンロードする
+
+        :param project_id_or_key: プロジェクトのID または プロジェクトキー
+        :param directory: 保存先のディレクトリ
+        :param issues: 課題の添付ファイルをダウンロードするかどうか
+        :param wiki: Wiki の添付ファイルをダウンロードするかどうか
+        :param pull_requests: プルリクエストの添付ファイルをダウンロードするかどうか
+
+        :return: HarvestResult
+        """
+        items = []  # type: List[Iterator[HarvestItem]]
+        if issues:
+            project = self.project.get_project(project_id_or_key=str(project_id_or_key))
+            project.raise_for_status()
+            items.append(self.iter_issue_attachments(project.json()['id'], directory))
+        if wiki:
+            items.append(self.iter_wiki_attachments(project_id_or_key, directory))
+        if pull_requests:
+            items.append(self.iter_pull_request_attachments(project_id_or_key, directory))
+        return self.download_all(item for iterator in items for item in iterator)
+
+    def download_all(self, items: Iterator[HarvestItem]) -> HarvestResult:
+        """
+        添付ファイルを max_workers 個のスレッドで並行してダウンロードする
+        一覧の取得はダウンロードと並行して進める
+
+        :param items: ダウンロードする添付ファイル
+        :return: HarvestResult
+        """
+        result = HarvestResult(downloaded=[], skipped=[], duplicates=[], failed=[])
+        # 一覧を読み進めすぎないように、ダウンロード待ちのファイル数を制限する
+        slots = threading.BoundedSemaphore(self.max_workers * 2)
+
+        def run(item):
+            try:
+                self._download(item, result)
+            except Exception as e:
+                with self._lock:
+                    result.failed.append((item.filepath, e))
+            finally:
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for item in items:
+                slots.acquire()
+                executor.submit(run, item)
+        return result
+
+    def _download(self, item: HarvestItem, result: HarvestResult):
+        size = item.attachment.get('size')
+        if os.path.exists(item.filepath) and (size is None or os.path.getsize(item.filepath) == size):
+            with self._lock:
+                result.skipped.append(item.filepath)
+            return
+        os.makedirs(os.path.dirname(item.filepath), exist_ok=True)
+        filepath, response = item.download(item.filepath)
+        if not filepath:
+            with self._lock:
+                result.failed.append((item.filepath, response))
+            return
+
+        digest = file_sha256(filepath, self.chunk_size)
+        with self._lock:
+            original = self._hashes.setdefault(digest, filepath)
+        if original == filepath:
+            with self._lock:
+                result.downloaded.append(filepath)
+            return
+        try:
+            os.link(original, filepath + '.link')
+            os.replace(filepath + '.link', filepath)
+        except OSError:
+            pass  # ハードリンクを作れないファイルシステムでは複製のまま残す
+        with self._lock:
+            result.duplicates.append((filepath, original))
@@ -0,0 +1,403 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import csv
+from datetime import datetime, timedelta
+import json
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from pybacklogpy.BacklogConfigure import BacklogConfigure
+from pybacklogpy.Category import Category
+from pybacklogpy.CustomField import CustomField
+from pybacklogpy.Issue import Issue, IssueType
+from pybacklogpy.Priority import Priority
+from pybacklogpy.Project import Project
+from pybacklogpy.Version import Version
+from pybacklogpy.bulk import BulkCheckpoint
+from pybacklogpy.pagination import response_to_list
+
+# 一括登録の結果
+# created: 登録した行の (行のキー, 課題キー), skipped: 台帳に登録済みと記録されていたため処理しなかった行のキー,
+# recovered: 前回の登録中に中断された行のうち、既に登録されていた課題を見つけた行の (行のキー, 課題キー),
+# failed: 失敗した行の (行のキー, 例外)
+ImportResult = namedtuple('ImportResult', ['created', 'skipped', 'recovered', 'failed'])
+
+# 進捗を受け取る関数: (処理済みの行数)
+ImportProgress = Callable[[int], None]
+
+# 名前を ID に変換する列: 列名: (ProjectIndex の種類, add_issue の引数, 複数の値を取るかどうか)
+NAME_COLUMNS = {
+    'issue_type': ('issue_types', 'issue_type_id', False),
+    'priority': ('priorities', 'priority_id', False),
+    'assignee': ('users', 'assignee_id', False),
+    'notified_user': ('users', 'notified_user_id', True),
+    'category': ('categories', 'category_id', True),
+    'version': ('versions', 'version_id', True),
+    'milestone': ('versions', 'milestone_id', True),
+}
+
+# そのまま add_issue に渡す列
+VALUE_COLUMNS = ('summary', 'description', 'parent_issue_id', 'start_date', 'due_date', 'estimated_hours',
+                 'actual_hours')
+
+# カスタム属性の列名の接頭辞 e.g.) custom_field:顧客名
+CUSTOM_FIELD_PREFIX = 'custom_field:'
+
+# 選択肢から選ぶカスタム属性の種類 (リスト, 複数選択リスト, チェックボックス, ラジオボタン)
+LIST_CUSTOM_FIELD_TYPES = frozenset([5, 6, 7, 8])
+MULTIPLE_CUSTOM_FIELD_TYPES = frozenset([6, 7])
+
+# 台帳に記録する時刻の形式 (課題の created と同じ形式)
+_TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def read_rows(filepath: str, file_format: Optional[str] = None, encoding: str = 'utf-8') -> Iterator[dict]:
+    """
+    CSV (1行目がヘッダー) または JSON Lines のファイルから1行ずつ読み込む
+
+    :param filepath: ファイルのPATH
+    :param file_format: 'csv' または 'jsonl' 指定が無い場合は拡張子から判断する
+    :param encoding: ファイルの文字コード
+    :return: 行のイテレーター
+    """
+    if file_format is None:
+        file_format = 'jsonl' if filepath.endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+    if file_format not in ('csv', 'jsonl'):
+        raise ValueError('file_format は csv または jsonl を指定してください')
+    with open(filepath, encoding=encoding, newline='') as f:
+        if file_format == 'csv':
+            for row in csv.DictReader(f):
+                yield row
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _split(value, separator: str) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value if v not in (None, '')]
+    value = str(value)
+    if not value.strip():
+        return []
+    return [v.strip() for v in value.split(separator) if v.strip()]
+
+
+def _is_blank(value) -> bool:
+    if isinstance(value, (list, tuple)):
+        return all(v in (None, '') for v in value)
+    return value is None or not str(value).strip()
+
+
+class ProjectIndex:
+    """
+    課題の登録に使う、プロジェクトの名前と ID の対応表
+    種別・優先度・ユーザー・カテゴリー・バージョン (マイルストーン)・カスタム属性を最初に1度だけ取得する
+    """
+
+    def __init__(self,
+                 project_id: int,
+                 issue_types: Dict[str, int],
+                 priorities: Dict[str, int],
+                 users: Dict[str, int],
+                 categories: Dict[str, int],
+                 versions: Dict[str, int],
+                 custom_fields: Dict[str, dict]):
+        """
+        :param project_id: プロジェクトのID
+        :param issue_types: {種別の名前: ID}
+        :param priorities: {優先度の名前: ID}
+        :param users: {ユーザーの名前・ユーザーID・メールアドレス: ID}
+        :param categories: {カテゴリーの名前: ID}
+        :param versions: {バージョン・マイルストーンの名前: ID}
+        :param custom_fields: {カスタム属性の名前: カスタム属性一覧の取得 API の要素}
+        """
+        self.project_id = project_id
+        self.issue_types = issue_types
+        self.priorities = priorities
+        self.users = users
+        self.categories = categories
+        self.versions = versions
+        self.custom_fields = custom_fields
+
+    @classmethod
+    def load(cls,
+             project_id_or_key: str,
+             config: Optional[BacklogConfigure] = None,
+             max_workers: int = 4) -> 'ProjectIndex':
+        """
+        プロジェクトの名前と ID の対応表を並行して取得する
+
+        :param project_id_or_key: プロジェクトのID または プロジェクトキー
+        :param config: 設定 指定が無い場合は環境変数・設定ファイルから読み込んだ設定を使う
+        :param max_workers: 同時に送るリクエスト数の上限
+        :return: ProjectIndex
+        """
+        project_id_or_key = str(project_id_or_key)
+        project = Project(config)
+        fetches = [
+            lambda: project.get_project(project_id_or_key=project_id_or_key),
+            lambda: IssueType(config).get_issue_type_list(project_id_or_key=project_id_or_key),
+            lambda: Priority(config).get_priority_list(),
+            lambda: project.get_project_user_list(project_id_or_key=project_id_or_key),
+            lambda: Category(config).get_category_list(project_id_or_key=project_id_or_key),
+            lambda: Version(config).get_version_milestone_list(project_id_or_key=project_id_or_key),
+            lambda: CustomField(config).get_custom_field_list(project_id_or_key=project_id_or_key),
+        ]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            project_, issue_types, priorities, users, categories, versions, custom_fields = \
+                executor.map(lambda fetch: response_to_list(fetch()), fetches)
+
+        user_names = {}
+        for user in users:
+            for name in (user.get('name'), user.get('userId'), user.get('mailAddress')):
+                if name:
+                    user_names[name] = user['id']
+        return cls(project_id=project_['id'],
+                   issue_types={t['name']: t['id'] for t in issue_types},
+                   priorities={p['name']: p['id'] for p in priorities},
+                   users=user_names,
+                   categories={c['name']: c['id'] for c in categories},
+                   versions={v['name']: v['id'] for v in versions},
+                   custom_fields={f['name']: f for f in custom_fields})
+
+    def resolve(self, kind: str, name: str) -> int:
+        """
+        :param kind: 種類 (issue_types, priorities, users, categories, versions)
+        :param name: 名前
+        :return: ID
+        """
+        names = getattr(self, kind)
+        if name not in names:
+            raise ValueError('{kind} に {name} が見つかりません'.format(kind=kind, name=name))
+        return names[name]
+
+    def resolve_custom_field(self,
+                             name: str,
+                             value,
+                             list_separator: str = ',') -> Tuple[str, Union[str, int, List[int]]]:
+        """
+        :param name: カスタム属性の名前
+        :param value: 値 (選択肢から選ぶカスタム属性の場合は選択肢の名前 複数の場合はリスト または区切った文字列)
+        :param list_separator: 複数の値を区切る文字 (複数選択できるカスタム属性の場合のみ区切る)
+        :return: (add_issue に渡す引数名, 値)
+        """
+        if name not in self.custom_fields:
+            raise ValueError('custom_fields に {name} が見つかりません'.format(name=name))
+        field = self.custom_fields[name]
+        key = 'customField_{id}'.format(id=field['id'])
+        if field.get('typeId') not in LIST_CUSTOM_FIELD_TYPES:
+            return key, value
+        if field.get('typeId') in MULTIPLE_CUSTOM_FIELD_TYPES:
+            values = _split(value, list_separator)
+        else:
+            values = [str(value).strip()]
+        items = {item['name']: item['id'] for item in field.get('items') or []}
+        missing = [value for value in values if value not in items]
+        if missing:
+            raise ValueError('カスタム属性 {name} に選択肢 {items} が見つかりません'.format(
+                name=name, items=', '.join(missing)))
+        ids = [items[value] for value in values]
+        return key, ids if field.get('typeId') in MULTIPLE_CUSTOM_FIELD_TYPES else ids[0]
+
+    def to_add_issue_kwargs(self, row: dict, list_separator: str = ',') -> dict:
+        """
+        行を add_issue の引数に変換する
+        空の値の列は無視する。複数の値を取る列は、リスト または list_separator で区切った文字列で指定する
+        1つの値を取る列 (種別・優先度・担当者など) は区切らないため、名前に list_separator が含まれていてもよい
+
+        :param row: 行 列名は NAME_COLUMNS, VALUE_COLUMNS, custom_field:{カスタム属性の名前}
+        :param list_separator: 複数の値を区切る文字
+        :return: add_issue の引数 (project_id を含む)
+        """
+        kwargs = {'project_id': self.project_id}
+        for column, value in row.items():
+            if _is_blank(value):
+                continue
+            if column in NAME_COLUMNS:
+                kind, argument, many = NAME_COLUMNS[column]
+                if not many:
+                    kwargs[argument] = self.resolve(kind, str(value).strip())
+                    continue
+                names = _split(value, list_separator)
+                if names:
+                    kwargs[argument] = [self.resolve(kind, name) for name in names]
+            elif column in VALUE_COLUMNS:
+                kwargs[column] = value
+            elif column.startswith(CUSTOM_FIELD_PREFIX):
+                key, custom_value = self.resolve_custom_field(column[len(CUSTOM_FIELD_PREFIX):], value,
+                                                              list_separator=list_separator)
+                kwargs[key] = custom_value
+        for required in ('summary', 'issue_type_id', 'priority_id'):
+            if required not in kwargs:
+                raise ValueError('{name} が指定されていません'.format(name=required))
+        return kwargs
+
+
+class IssueImporter:
+    """
+    CSV / JSON Lines の行から課題を並行して登録する
+
+    行は1行ずつ読み込み、名前 (種別・優先度・ユーザーなど) は ProjectIndex で ID に変換する。
+    登録は max_workers 個のスレッドで行い、リクエストの間隔は RequestSender のレート制限に従う。
+
+    ledger (台帳) を指定すると、登録を始める前に "started"、登録した後に "done" を行ごとに記録する。
+    同じ台帳を指定して再実行すると "done" の行は飛ばし、 "started" のまま中断された行は、
+    同じ件名で中断後に登録された課題が既にあればそれを登録済みとして扱うため、課題が重複して登録されない。
+    """
+
+    # 中断された行の課題を探す時に許容する、台帳の時刻と課題の登録日時のずれ
+    clock_skew = timedelta(minutes=10)
+
+    def __init__(self,
+                 config: Optional[BacklogConfigure] = None,
+                 max_workers: int = 4):
+        """
+        :param config: 設定 指定が無い場合は環境変数・設定ファイルから読み込んだ設定を使う
+        :param max_workers: 同時に登録する課題数の上限
+        """
+        self.config = config
+        self.issue = Issue(config)
+        self.max_workers = max_workers
+        self._claim_lock = threading.Lock()
+
+    def import_file(self,
+                    filepath: str,
+                    project_id_or_key: str,
+                    file_format: Optional[str] = None,
+                    encoding: str = 'utf-8',
+                    **kwargs) -> ImportResult:
+        """
+        CSV (1行目がヘッダー) または JSON Lines のファイルから課題を登録する
+
+        :param filepath: ファイルのPATH
+        :param project_id_or_key: 課題を登録するプロジェクトのID または プロジェクトキー
+        :param file_format: 'csv' または 'jsonl' 指定が無い場合は拡張子から判断する
+        :param encoding: ファイルの文字コード
+        :param kwargs: import_rows と同じ引数
+
+        :return: ImportResult
+        """
+        return self.import_rows(read_rows(filepath, file_format=file_format, encoding=encoding),
+                                project_id_or_key=project_id_or_key, **kwargs)
+
+    def import_rows(self,
+                    rows: Iterable[dict],
+                    project_id_or_key: str,
+                    ledger: Optional[str] = None,
+                    key_column: str = 'id',
+                    defaults: Optional[dict] = None,
+                    list_separator: str = ',',
+                    index: Optional[ProjectIndex] = None,
+                    progress: Optional[ImportProgress] = None) -> ImportResult:
+        """
+        行から課題を登録する
+
+        :param rows: 行のイテレーター 列名は ProjectIndex.to_add_issue_kwargs を参照
+        :param project_id_or_key: 課題を登録するプロジェクトのID または プロジェクトキー
+        :param ledger: 台帳のファイルのPATH (JSON Lines) 前回と同じファイルを指定すると続きから登録する
+        :param key_column: 行を識別する列 (移行元の ID など) 行に無い場合は行番号 (1から) を使う
+        :param defaults: 行に無い列、または空の列に使う値 e.g.) {'issue_type': 'タスク', 'priority': '中'}
+        :param list_separator: 複数の値を取る列の区切り文字
+        :param index: 名前と ID の対応表 指定が無い場合は最初に取得する
+        :param progress: 進捗を受け取る関数 (処理済みの行数) が渡される
+
+        :return: ImportResult
+        """
+        index = index if index else ProjectIndex.load(project_id_or_key, config=self.config)
+        store = BulkCheckpoint(ledger) if ledger else None
+        states = {}  # type: Dict[str, dict]
+        if store:
+            for entry in store.entries():
+                states[str(entry['key'])] = entry
+        # 台帳に登録済みと記録された課題のID (中断された行の課題を探す時に、他の行の課題と取り違えないため)
+        claimed = set(state['id'] for state in states.values() if state.get('status') == 'done')
+        result = ImportResult(created=[], skipped=[], recovered=[], failed=[])
+        lock = threading.Lock()
+        processed = [0]
+        # 行を読み進めすぎないように、登録待ちの行数を制限する
+        slots = threading.BoundedSemaphore(self.max_workers * 2)
+
+        def notify():
+            if progress:
+                with lock:
+                    processed[0] += 1
+                    progress(processed[0])
+
+        def run(key, row):
+            try:
+                self._import_row(key, row, index, store, states.get(key), claimed, defaults, list_separator,
+                                 result, lock)
+            finally:
+                slots.release()
+                notify()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for number, row in enumerate(rows, 1):
+                key = str(row.get(key_column) or number)
+                state = states.get(key)
+                if state and state.get('status') == 'done':
+                    result.skipped.append(key)
+                    notify()
+                    continue
+                slots.acquire()
+                executor.submit(run, key, row)
+        return result
+
+    def _import_row(self, key: str, row: dict, index: ProjectIndex, store: Optional[BulkCheckpoint],
+                    state: Optional[dict], claimed: Set[int], defaults: Optional[dict], list_separator: str,
+                    result: ImportResult, lock: threading.Lock):
+        try:
+            values = dict(defaults or {})
+            values.update((column, value) for column, value in row.items() if value not in (None, ''))
+            kwargs = index.to_add_issue_kwargs(values, list_separator=list_separator)
+            if state and state.get('status') == 'started':
+                with self._claim_lock:
+                    issue = self._find_started_issue(index.project_id, kwargs['summary'], state['started'], claimed)
+                    if issue:
+                        claimed.add(issue['id'])
+                if issue:
+                    if store:
+                        store.record(key, 'done', issueKey=issue['issueKey'], id=issue['id'])
+                    with lock:
+                        result.recovered.append((key, issue['issueKey']))
+                    return
+            if store:
+                store.record(key, 'started', started=datetime.utcnow().strftime(_TIME_FORMAT))
+            response = self.issue.add_issue(**kwargs)
+            if not response.ok:
+                # サーバーがエラーを返した場合は登録されていないので、再実行時に改めて登録する
+                if store:
+                    store.record(key, 'failed', statusCode=response.status_code)
+                response.raise_for_status()
+            issue = response.json()
+            if store:
+                store.record(key, 'done', issueKey=issue['issueKey'], id=issue['id'])
+            with self._claim_lock:
+                claimed.add(issue['id'])
+            with lock:
+                result.created.append((key, issue['issueKey']))
+        except Exception as e:
+            with lock:
+                result.failed.append((key, e))
+
+    def _find_started_issue(self, project_id: int, summary: str, started: str, claimed: Set[int]) -> Optional[dict]:
+        """
+        登録中に中断された行について、中断後に登録されていた課題を探す
+        台帳に記録した時刻以降に登録された、件名が一致し、他の行の課題ではない課題を返す
+        """
+        since = datetime.strptime(started, _TIME_FORMAT) - self.clock_skew
+        response = self.issue.get_issue_list(project_id=[project_id],
+                                             keyword=summary,
+                                             created_since=(since - timedelta(days=1)).strftime('%Y-%m-%d'),
+                                             sort='created',
+                                             order='asc',
+                                             count=100)
+        for issue in response_to_list(response):
+            if issue['id'] in claimed or issue.get('summary') != summary:
+                continue
+            if issue.get('created', '') >= since.strftime(_TIME_FORMAT):
+                return issue
+        return None
@@ -0,0 +1,238 @@
+from collections import Counter, namedtuple
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+if TYPE_CHECKING:
+    from requests import Response
+
+# API のパスのうち、ID やキーではない固定の部分
+STATIC_SEGMENTS = frozenset([
+    'activities', 'administrators', 'attachment', 'attachments', 'categories', 'comments', 'count', 'customFields',
+    'diskUsage', 'files', 'git', 'history', 'icon', 'image', 'issueTypes', 'issues', 'items', 'licence',
+    'markAsRead', 'metadata', 'myself', 'notification', 'notifications', 'priorities', 'projects', 'pullRequests',
+    'recentlyViewedIssues', 'recentlyViewedProjects', 'recentlyViewedWikis', 'repositories', 'resolutions',
+    'sharedFiles', 'space', 'stars', 'statuses', 'tags', 'teams', 'updateDisplayOrder', 'users', 'versions',
+    'watchings', 'webhooks', 'wikis',
+])
+
+# 固定の部分以外を置き換える文字列
+ID_PLACEHOLDER = '{id}'
+
+# レイテンシーのヒストグラムの境界(秒)
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 1回の API 呼び出しの記録
+# method: HTTP メソッド, endpoint: ID などを {id} に置き換えたパス e.g.) issues/{id}/comments, path: 実際のパス,
+# status_code: ステータスコード (例外の場合は None), elapsed: 再送を含めてかかった秒数,
+# response_bytes: レスポンスの本文のバイト数, retries: 再送した回数, error: 例外 (無い場合は None)
+RequestRecord = namedtuple('RequestRecord', ['method', 'endpoint', 'path', 'status_code', 'elapsed',
+                                             'response_bytes', 'retries', 'error'])
+
+# 記録を受け取る関数
+MetricsCallback = Callable[[RequestRecord], None]
+
+
+def endpoint_template(path: str) -> str:
+    """
+    API のパスの ID・キー・名前の部分を {id} に置き換える
+    共有ファイル一覧のディレクトリ (metadata 以降のパス) は1つの {id} にまとめる
+
+    :param path: API のパス e.g.) issues/TEST-1/comments/123
+    :return: エンドポイント e.g.) issues/{id}/comments/{id}
+    """
+    parts = path.strip('/').split('/')
+    segments = []
+    for i, segment in enumerate(parts):
+        segments.append(segment if segment in STATIC_SEGMENTS else ID_PLACEHOLDER)
+        if segment == 'metadata':
+            if i + 1 < len(parts):
+                segments.append(ID_PLACEHOLDER)
+            break
+    return '/'.join(segments)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return ','.join('{name}="{value}"'.format(name=name, value=_escape(str(value)))
+                    for name, value in sorted(labels.items()))
+
+
+class EndpointStats:
+    """
+    エンドポイントごとの集計
+    """
+    __slots__ = ('count', 'errors', 'retries', 'response_bytes', 'status_codes', 'latency_sum', 'latency_buckets')
+
+    def __init__(self, buckets: int):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.response_bytes = 0
+        # {ステータスコード (例外の場合は例外のクラス名): 回数}
+        self.status_codes = Counter()
+        self.latency_sum = 0.0
+        # 境界ごとの回数 (累積ではない 最後の要素は最大の境界を超えた回数)
+        self.latency_buckets = [0] * (buckets + 1)
+
+    @property
+    def error_rate(self) -> float:
+        """
+        :return: エラー (例外、またはステータスコードが 400 以上) の割合
+        """
+        return self.errors / self.count if self.count else 0.0
+
+
+class RequestMetrics:
+    """
+    API 呼び出しをエンドポイントごとに集計する
+
+    RequestSender に渡すと、 API を呼ぶたびに回数・レイテンシー・レスポンスのバイト数・ステータスコード・再送回数を記録する。
+    記録は callbacks に登録した関数にも渡される。
+    RequestSender に渡さなかった場合 (既定) は何も記録しない。
+    """
+
+    def __init__(self,
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+                 callbacks: Optional[List[MetricsCallback]] = None):
+        """
+        :param buckets: レイテンシーのヒストグラムの境界(秒) 昇順
+        :param callbacks: 記録を受け取る関数のリスト
+        """
+        self.buckets = tuple(buckets)
+        self.callbacks = list(callbacks or [])
+        self._stats = {}  # type: Dict[Tuple[str, str], EndpointStats]
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback: MetricsCallback):
+        """
+        :param callback: 記録を受け取る関数 API を呼んだスレッドで呼ばれる
+        """
+        self.callbacks.append(callback)
+
+    def record_response(self, method: str, path: str, elapsed: float, response: 'Response', stream: bool = False):
+        """
+        :param method: HTTP メソッド
+        :param path: API のパス
+        :param elapsed: 再送を含めてかかった秒数
+        :param response: 最終的なレスポンス (まとめられたリクエストの再送回数は数えない)
+        :param stream: 本文をまだ読んでいないレスポンスの場合は True (Content-Length をバイト数とする)
+        """
+        if stream:
+            size = int(response.headers.get('Content-Length') or 0)
+        else:
+            size = len(response.content or b'')
+        self.record(RequestRecord(method=method,
+                                  endpoint=endpoint_template(path),
+                                  path=path,
+                                  status_code=response.status_code,
+                                  elapsed=elapsed,
+                                  response_bytes=size,
+                                  retries=0 if getattr(response, 'coalesced', False)
+                                  else getattr(response, 'retry_count', 0),
+                                  error=None))
+
+    def record_exception(self, method: str, path: str, elapsed: float, error: Exception):
+        """
+        :param method: HTTP メソッド
+        :param path: API のパス
+        :param elapsed: 再送を含めてかかった秒数
+        :param error: 送出された例外
+        """
+        self.record(RequestRecord(method=method,
+                                  endpoint=endpoint_template(path),
+                                  path=path,
+                                  status_code=None,
+                                  elapsed=elapsed,
+                                  response_bytes=0,
+                                  retries=getattr(error, 'retry_count', 0),
+                                  error=error))
+
+    def record(self, record: RequestRecord):
+        """
+        :param record: 1回の API 呼び出しの記録
+        """
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if record.elapsed <= bound:
+                index = i
+                break
+        with self._lock:
+            stats = self._stats.get((record.method, record.endpoint))
+            if stats is None:
+                stats = self._stats[(record.method, record.endpoint)] = EndpointStats(len(self.buckets))
+            stats.count += 1
+            if record.error is not None or record.status_code >= 400:
+                stats.errors += 1
+            stats.retries += record.retries
+            stats.response_bytes += record.response_bytes
+            stats.status_codes[record.status_code if record.error is None else type(record.error).__name__] += 1
+            stats.latency_sum += record.elapsed
+            stats.latency_buckets[index] += 1
+        for callback in self.callbacks:
+            callback(record)
+
+    def snapshot(self) -> Dict[Tuple[str, str], EndpointStats]:
+        """
+        :return: {(HTTP メソッド, エンドポイント): 集計} の複製
+        """
+        with self._lock:
+            result = {}
+            for key, stats in self._stats.items():
+                copied = EndpointStats(len(self.buckets))
+                for name in EndpointStats.__slots__:
+                    value = getattr(stats, name)
+                    setattr(copied, name, value.copy() if hasattr(value, 'copy') else value)
+                result[key] = copied
+            return result
+
+    def reset(self):
+        """
+        集計を全て捨てる
+        """
+        with self._lock:
+            self._stats.clear()
+
+    def to_prometheus(self, prefix: str = 'backlog') -> str:
+        """
+        集計を Prometheus のテキスト形式にする
+
+        :param prefix: メトリクス名の接頭辞
+        :return: Prometheus のテキスト形式の文字列
+        """
+        snapshot = sorted(self.snapshot().items())
+        lines = []
+
+        def header(name: str, metric_type: str, help_text: str):
+            lines.append('# HELP {prefix}_{name} {help}'.format(prefix=prefix, name=name, help=help_text))
+            lines.append('# TYPE {prefix}_{name} {type}'.format(prefix=prefix, name=name, type=metric_type))
+
+        def sample(name: str, value, **labels):
+            lines.append('{prefix}_{name}{{{labels}}} {value}'.format(prefix=prefix, name=name,
+                                                                      labels=_labels(**labels), value=value))
+
+        header('requests_total', 'counter', 'API calls by endpoint and status code')
+        for (method, endpoint), stats in snapshot:
+            for status, count in sorted(stats.status_codes.items(), key=lambda item: str(item[0])):
+                sample('requests_total', count, method=method, endpoint=endpoint, status=status)
+        header('request_errors_total', 'counter', 'API calls that raised or returned status code >= 400')
+        for (method, endpoint), stats in snapshot:
+            sample('request_errors_total', stats.errors, method=method, endpoint=endpoint)
+        header('request_retries_total', 'counter', 'Retried requests')
+        for (method, endpoint), stats in snapshot:
+            sample('request_retries_total', stats.retries, method=method, endpoint=endpoint)
+        header('response_bytes_total', 'counter', 'Response body bytes')
+        for (method, endpoint), stats in snapshot:
+            sample('response_bytes_total', stats.response_bytes, method=method, endpoint=endpoint)
+        header('request_duration_seconds', 'histogram', 'API call latency including retries')
+        for (method, endpoint), stats in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets, stats.latency_buckets):
+                cumulative += count
+                sample('request_duration_seconds_bucket', cumulative, method=method, endpoint=endpoint,
+                       le=repr(float(bound)))
+            sample('request_duration_seconds_bucket', stats.count, method=method, endpoint=endpoint, le='+Inf')
+            sample('request_duration_seconds_sum', repr(stats.latency_sum), method=method, endpoint=endpoint)
+            sample('request_duration_seconds_count', stats.count, method=method, endpoint=endpoint)
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,864 @@
+import argparse
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import json
+import random
+import re
+from socketserver import ThreadingMixIn
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+from pybacklogpy.BacklogConfigure import BacklogConfigure
+from pybacklogpy.ratelimit import DEFAULT_LIMITS, classify_request
+
+# API のパスの前の部分
+API_PREFIX = '/api/v2/'
+
+# 優先度と状態 (全てのプロジェクトで共通)
+PRIORITIES = [{'id': 2, 'name': '高'}, {'id': 3, 'name': '中'}, {'id': 4, 'name': '低'}]
+STATUSES = [
+    {'id': 1, 'name': '未対応', 'color': '#ed8077', 'displayOrder': 1000},
+    {'id': 2, 'name': '処理中', 'color': '#4488c5', 'displayOrder': 2000},
+    {'id': 3, 'name': '処理済み', 'color': '#5eb5a6', 'displayOrder': 3000},
+    {'id': 4, 'name': '完了', 'color': '#b0be3c', 'displayOrder': 4000},
+]
+
+# アイコン・プロジェクト画像として返す 1x1 の PNG
+ICON_PNG = bytes.fromhex('89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+                         '1f15c4890000000d49444154789c6360000002000001e221bc330000000049454e44ae426082')
+
+# レスポンス: (ステータスコード, 本文 (JSON にする値 または bytes), 追加するヘッダー)
+MockResponse = Tuple[int, object, Dict[str, str]]
+
+
+class ApiError(Exception):
+    """
+    エラーのレスポンスを返すための例外
+    """
+
+    def __init__(self, status: int, message: str, code: int = 6):
+        super(ApiError, self).__init__(message)
+        self.status = status
+        self.body = {'errors': [{'message': message, 'code': code, 'moreInfo': ''}]}
+
+
+def _now() -> str:
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
+
+def _first(values: Dict[str, List[str]], name: str, default: Optional[str] = None) -> Optional[str]:
+    return values[name][0] if values.get(name) else default
+
+
+def _int(values: Dict[str, List[str]], name: str, default: Optional[int] = None) -> Optional[int]:
+    value = _first(values, name)
+    if value is None or value == '':
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ApiError(400, '{name} の値が不正です: {value}'.format(name=name, value=value), code=7)
+
+
+def _ints(values: Dict[str, List[str]], name: str) -> List[int]:
+    try:
+        return [int(value) for value in values.get(name + '[]', [])]
+    except ValueError:
+        raise ApiError(400, '{name}[] の値が不正です'.format(name=name), code=7)
+
+
+def _require(values: Dict[str, List[str]], *names: str):
+    for name in names:
+        if not values.get(name):
+            raise ApiError(400, '{name} は必須です'.format(name=name), code=7)
+
+
+def _offset_page(items: list, params: Dict[str, List[str]], default_count: int = 20) -> list:
+    if _first(params, 'order', 'desc') == 'desc':
+        items = list(reversed(items))
+    offset = _int(params, 'offset', 0)
+    return items[offset:offset + _int(params, 'count', default_count)]
+
+
+def _cursor_page(items: list, params: Dict[str, List[str]]) -> list:
+    min_id = _int(params, 'minId')
+    max_id = _int(params, 'maxId')
+    items = [item for item in items
+             if (min_id is None or item['id'] >= min_id) and (max_id is None or item['id'] <= max_id)]
+    if _first(params, 'order', 'desc') == 'desc':
+        items = list(reversed(items))
+    return items[:_int(params, 'count', 20)]
+
+
+class MockBacklogState:
+    """
+    モックサーバーが保持する Backlog のデータ (課題・コメント・Wiki・プロジェクト・ユーザー・お知らせ・共有ファイル)
+
+    全てメモリ上に保持し、サーバーを止めると消える。
+    Issue, IssueComment, Wiki, Project, User, Notification, SharedFile のクラスが使う API に応答する。
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._next_ids = {}  # type: Dict[str, int]
+        self.users = OrderedDict()  # type: Dict[int, dict]
+        self.projects = OrderedDict()  # type: Dict[int, dict]
+        self.issue_types = OrderedDict()  # type: Dict[int, dict]
+        self.issues = OrderedDict()  # type: Dict[int, dict]
+        self.comments = OrderedDict()  # type: Dict[int, dict]
+        self.wikis = OrderedDict()  # type: Dict[int, dict]
+        self.notifications = OrderedDict()  # type: Dict[int, dict]
+        self.shared_files = OrderedDict()  # type: Dict[int, dict]
+        # {プロジェクトのID: [ユーザーのID, ...]}
+        self.project_users = {}  # type: Dict[int, List[int]]
+        self.myself = self.add_user('admin', '管理者', role_type=1)
+        self.routes = [(method, re.compile('^' + pattern + '$'), handler) for method, pattern, handler in [
+            ('GET', r'users', self.get_user_list),
+            ('GET', r'users/myself', self.get_own_user),
+            ('GET', r'users/myself/recentlyViewed(?:Issues|Projects|Wikis)', self.get_empty_list),
+            ('GET', r'users/(?P<user_id>\d+)', self.get_user),
+            ('GET', r'users/(?P<user_id>\d+)/icon', self.get_icon),
+            ('GET', r'users/(?P<user_id>\d+)/(?:activities|stars)', self.get_empty_list),
+            ('GET', r'users/(?P<user_id>\d+)/stars/count', self.get_zero_count),
+            ('GET', r'projects', self.get_project_list),
+            ('POST', r'projects', self.add_project_api),
+            ('GET', r'projects/(?P<project>[^/]+)', self.get_project),
+            ('PATCH', r'projects/(?P<project>[^/]+)', self.update_project),
+            ('DELETE', r'projects/(?P<project>[^/]+)', self.delete_project),
+            ('GET', r'projects/(?P<project>[^/]+)/image', self.get_icon),
+            ('GET', r'projects/(?P<project>[^/]+)/activities', self.get_empty_list),
+            ('GET', r'projects/(?P<project>[^/]+)/(?:users|administrators)', self.get_project_user_list),
+            ('POST', r'projects/(?P<project>[^/]+)/(?:users|administrators)', self.add_project_user),
+            ('DELETE', r'projects/(?P<project>[^/]+)/(?:users|administrators)', self.delete_project_user),
+            ('GET', r'projects/(?P<project>[^/]+)/issueTypes', self.get_issue_type_list),
+            ('GET', r'projects/(?P<project>[^/]+)/statuses', self.get_status_list),
+            ('GET', r'projects/(?P<project>[^/]+)/files/metadata(?:/(?P<directory>.*))?', self.get_shared_file_list),
+            ('GET', r'projects/(?P<project>[^/]+)/files/(?P<file_id>\d+)', self.get_shared_file),
+            ('GET', r'priorities', self.get_priority_list),
+            ('GET', r'issues', self.get_issue_list),
+            ('GET', r'issues/count', self.count_issue),
+            ('POST', r'issues', self.add_issue),
+            ('GET', r'issues/(?P<issue>[^/]+)', self.get_issue),
+            ('PATCH', r'issues/(?P<issue>[^/]+)', self.update_issue),
+            ('DELETE', r'issues/(?P<issue>[^/]+)', self.delete_issue),
+            ('GET', r'issues/(?P<issue>[^/]+)/comments', self.get_comment_list),
+            ('POST', r'issues/(?P<issue>[^/]+)/comments', self.add_comment),
+            ('GET', r'issues/(?P<issue>[^/]+)/comments/count', self.count_comment),
+            ('GET', r'issues/(?P<issue>[^/]+)/comments/(?P<comment_id>\d+)', self.get_comment),
+            ('PATCH', r'issues/(?P<issue>[^/]+)/comments/(?P<comment_id>\d+)', self.update_comment),
+            ('DELETE', r'issues/(?P<issue>[^/]+)/comments/(?P<comment_id>\d+)', self.delete_comment),
+            ('GET', r'issues/(?P<issue>[^/]+)/comments/(?P<comment_id>\d+)/notifications',
+             self.get_comment_notifications),
+            ('POST', r'issues/(?P<issue>[^/]+)/comments/(?P<comment_id>\d+)/notifications',
+             self.add_comment_notification),
+            ('GET', r'wikis', self.get_wiki_page_list),
+            ('GET', r'wikis/count', self.count_wiki_page),
+            ('GET', r'wikis/tags', self.get_empty_list),
+            ('POST', r'wikis', self.add_wiki_page),
+            ('GET', r'wikis/(?P<wiki_id>\d+)', self.get_wiki_page),
+            ('PATCH', r'wikis/(?P<wiki_id>\d+)', self.update_wiki_page),
+            ('DELETE', r'wikis/(?P<wiki_id>\d+)', self.delete_wiki_page),
+            ('GET', r'wikis/(?P<wiki_id>\d+)/(?:history|stars|attachments|sharedFiles)', self.get_empty_list),
+            ('GET', r'notifications', self.get_notification),
+            ('GET', r'notifications/count', self.count_notification),
+            ('POST', r'notifications/markAsRead', self.reset_unread_notification_count),
+            ('POST', r'notifications/(?P<notification_id>\d+)/markAsRead', self.read_notification),
+        ]]
+
+    def _next_id(self, kind: str) -> int:
+        self._next_ids[kind] = self._next_ids.get(kind, 0) + 1
+        return self._next_ids[kind]
+
+    def handle(self, method: str, path: str, params: Dict[str, List[str]], form: Dict[str, List[str]]) -> MockResponse:
+        """
+        :param method: HTTP メソッド
+        :param path: API のパス (api/v2/ 以降)
+        :param params: URL パラメーター
+        :param form: フォームの値
+        :return: (ステータスコード, 本文, 追加するヘッダー)
+        """
+        path = path.strip('/')
+        matched_path = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            matched_path = True
+            if route_method != method:
+                continue
+            kwargs = dict((name, unquote(value)) for name, value in match.groupdict().items() if value is not None)
+            with self._lock:
+                result = handler(params=params, form=form, **kwargs)
+            if isinstance(result, tuple):
+                return result
+            return (200, result, {}) if result is not None else (204, b'', {})
+        if matched_path:
+            raise ApiError(405, 'Method Not Allowed')
+        raise ApiError(404, 'No such API: {path}'.format(path=path))
+
+    # データの追加 (サーバーを起動する前の準備にも使う)
+
+    def add_user(self, user_id: str, name: str, role_type: int = 2) -> dict:
+        """
+        :param user_id: ログインID
+        :param name: 名前
+        :param role_type: 権限 (1: 管理者, 2: 一般ユーザー)
+        :return: 追加したユーザー
+        """
+        with self._lock:
+            user = {'id': self._next_id('user'), 'userId': user_id, 'name': name, 'roleType': role_type,
+                    'lang': 'ja', 'mailAddress': '{user_id}@example.com'.format(user_id=user_id),
+                    'nulabAccount': None, 'keyword': '{user_id} {name}'.format(user_id=user_id, name=name)}
+            self.users[user['id']] = user
+            return user
+
+    def add_project(self, key: str, name: str, text_formatting_rule: str = 'markdown') -> dict:
+        """
+        :param key: プロジェクトキー
+        :param name: プロジェクト名
+        :param text_formatting_rule: テキスト整形のルール
+        :return: 追加したプロジェクト
+        """
+        with self._lock:
+            if any(project['projectKey'] == key for project in self.projects.values()):
+                raise ApiError(400, 'プロジェクトキー {key} は既に使われています'.format(key=key), code=7)
+            project = {'id': self._next_id('project'), 'projectKey': key, 'name': name, 'chartEnabled': False,
+                       'subtaskingEnabled': False, 'projectLeaderCanEditProjectLeader': False,
+                       'textFormattingRule': text_formatting_rule, 'archived': False, 'displayOrder': 2147483646}
+            self.projects[project['id']] = project
+            self.project_users[project['id']] = [self.myself['id']]
+            for issue_type_name, color in (('タスク', '#7ea800'), ('バグ', '#990000')):
+                issue_type = {'id': self._next_id('issue_type'), 'projectId': project['id'], 'name': issue_type_name,
+                              'color': color, 'displayOrder': len(self.issue_types)}
+                self.issue_types[issue_type['id']] = issue_type
+            return project
+
+    def add_shared_file(self, project_id_or_key: str, directory: str, name: str, content: bytes) -> dict:
+        """
+        共有ファイルを追加する (Backlog の API には共有ファイルを追加する API が無いため、準備用)
+
+        :param project_id_or_key: プロジェクトのID または プロジェクトキー
+        :param directory: ディレクトリ e.g.) /docs/
+        :param name: ファイル名
+        :param content: ファイルの内容
+        :return: 追加した共有ファイル (content を除く)
+        """
+        with self._lock:
+            project = self._project(project_id_or_key)
+            directory = '/' + directory.strip('/') + '/' if directory.strip('/') else '/'
+            shared_file = {'id': self._next_id('shared_file'), 'projectId': project['id'], 'type': 'file',
+                           'dir': directory, 'name': name, 'size': len(content), 'createdUser': self.myself,
+                           'created': _now(), 'updatedUser': None, 'updated': None, 'content': content}
+            self.shared_files[shared_file['id']] = shared_file
+            return self._public_shared_file(shared_file)
+
+    # 検索
+
+    def _project(self, project_id_or_key: str) -> dict:
+        for project in self.projects.values():
+            if str(project['id']) == str(project_id_or_key) or project['projectKey'] == project_id_or_key:
+                return project
+        raise ApiError(404, 'No project.')
+
+    def _user(self, user_id) -> dict:
+        user = self.users.get(int(user_id))
+        if user is None:
+            raise ApiError(404, 'No user.')
+        return user
+
+    def _issue(self, issue_id_or_key: str) -> dict:
+        if issue_id_or_key.isdigit():
+            issue = self.issues.get(int(issue_id_or_key))
+        else:
+            issue = next((issue for issue in self.issues.values() if issue['issueKey'] == issue_id_or_key), None)
+        if issue is None:
+            raise ApiError(404, 'No issue.')
+        return issue
+
+    def _comment(self, issue: dict, comment_id: str) -> dict:
+        comment = self.comments.get(int(comment_id))
+        if comment is None or comment['issueId'] != issue['id']:
+            raise ApiError(404, 'No comment.')
+        return comment
+
+    def _wiki(self, wiki_id: str) -> dict:
+        wiki = self.wikis.get(int(wiki_id))
+        if wiki is None:
+            raise ApiError(404, 'No wiki.')
+        return wiki
+
+    @staticmethod
+    def _public_shared_file(shared_file: dict) -> dict:
+        return dict((key, value) for key, value in shared_file.items() if key != 'content')
+
+    @staticmethod
+    def _public_comment(comment: dict) -> dict:
+        return dict((key, value) for key, value in comment.items() if key != 'issueId')
+
+    # ユーザー
+
+    def get_user_list(self, params, form):
+        return list(self.users.values())
+
+    def get_own_user(self, params, form):
+        return self.myself
+
+    def get_user(self, params, form, user_id):
+        return self._user(user_id)
+
+    def get_icon(self, params, form, **kwargs):
+        return 200, ICON_PNG, {'Content-Type': 'image/png'}
+
+    def get_empty_list(self, params, form, **kwargs):
+        return []
+
+    def get_zero_count(self, params, form, **kwargs):
+        return {'count': 0}
+
+    # プロジェクト
+
+    def get_project_list(self, params, form):
+        archived = _first(params, 'archived')
+        return [project for project in self.projects.values()
+                if archived is None or str(project['archived']).lower() == archived]
+
+    def add_project_api(self, params, form):
+        _require(form, 'name', 'key')
+        project = self.add_project(_first(form, 'key'), _first(form, 'name'),
+                                   _first(form, 'textFormattingRule', 'markdown'))
+        for name in ('chartEnabled', 'subtaskingEnabled', 'projectLeaderCanEditProjectLeader'):
+            if name in form:
+                project[name] = _first(form, name) == 'true'
+        return project
+
+    def get_project(self, params, form, project):
+        return self._project(project)
+
+    def update_project(self, params, form, project):
+        project = self._project(project)
+        for name in ('name', 'key', 'textFormattingRule'):
+            if name in form:
+                project['projectKey' if name == 'key' else name] = _first(form, name)
+        for name in ('chartEnabled', 'subtaskingEnabled', 'projectLeaderCanEditProjectLeader', 'archived'):
+            if name in form:
+                project[name] = _first(form, name) == 'true'
+        return project
+
+    def delete_project(self, params, form, project):
+        project = self._project(project)
+        del self.projects[project['id']]
+        return project
+
+    def get_project_user_list(self, params, form, project):
+        return [self._user(user_id) for user_id in self.project_users[self._project(project)['id']]]
+
+    def add_project_user(self, params, form, project):
+        _require(form, 'userId')
+        user = self._user(_first(form, 'userId'))
+        user_ids = self.project_users[self._project(project)['id']]
+        if user['id'] not in user_ids:
+            user_ids.append(user['id'])
+        return user
+
+    def delete_project_user(self, params, form, project):
+        _require(form, 'userId')
+        user = self._user(_first(form, 'userId'))
+        user_ids = self.project_users[self._project(project)['id']]
+        if user['id'] in user_ids:
+            user_ids.remove(user['id'])
+        return user
+
+    def get_issue_type_list(self, params, form, project):
+        project_id = self._project(project)['id']
+        return [issue_type for issue_type in self.issue_types.values() if issue_type['projectId'] == project_id]
+
+    def get_status_list(self, params, form, project):
+        project_id = self._project(project)['id']
+        return [dict(status, projectId=project_id) for status in STATUSES]
+
+    def get_priority_list(self, params, form):
+        return PRIORITIES
+
+    # 共有ファイル
+
+    def get_shared_file_list(self, params, form, project, directory=''):
+        project_id = self._project(project)['id']
+        directory = '/' + directory.strip('/') + '/' if directory.strip('/') else '/'
+        files = [self._public_shared_file(shared_file) for shared_file in self.shared_files.values()
+                 if shared_file['projectId'] == project_id and shared_file['dir'] == directory]
+        return _offset_page(files, params, default_count=1000)
+
+    def get_shared_file(self, params, form, project, file_id):
+        shared_file = self.shared_files.get(int(file_id))
+        if shared_file is None or shared_file['projectId'] != self._project(project)['id']:
+            raise ApiError(404, 'No file.')
+        disposition = "attachment; filename*=UTF-8''{name}".format(name=quote(shared_file['name']))
+        return 200, shared_file['content'], {'Content-Type': 'application/octet-stream',
+                                             'Content-Disposition': disposition}
+
+    # 課題
+
+    def _find_issues(self, params) -> List[dict]:
+        project_ids = _ints(params, 'projectId')
+        ids = _ints(params, 'id')
+        status_ids = _ints(params, 'statusId')
+        assignee_ids = _ints(params, 'assigneeId')
+        keyword = _first(params, 'keyword')
+        result = []
+        for issue in self.issues.values():
+            if project_ids and issue['projectId'] not in project_ids:
+                continue
+            if ids and issue['id'] not in ids:
+                continue
+            if status_ids and issue['status']['id'] not in status_ids:
+                continue
+            if assignee_ids and (issue['assignee'] or {}).get('id') not in assignee_ids:
+                continue
+            if keyword and keyword not in issue['summary'] and keyword not in (issue['description'] or ''):
+                continue
+            result.append(issue)
+        return result
+
+    def get_issue_list(self, params, form):
+        return _offset_page(self._find_issues(params), params)
+
+    def count_issue(self, params, form):
+        return {'count': len(self._find_issues(params))}
+
+    def _apply_issue_fields(self, issue: dict, form: Dict[str, List[str]]):
+        project_id = issue['projectId']
+        for name in ('summary', 'description', 'startDate', 'dueDate'):
+            if name in form:
+                issue[name] = _first(form, name) or None
+        for name in ('estimatedHours', 'actualHours'):
+            if name in form:
+                issue[name] = float(_first(form, name)) if _first(form, name) else None
+        if 'parentIssueId' in form:
+            issue['parentIssueId'] = _int(form, 'parentIssueId')
+        if 'issueTypeId' in form:
+            issue_type = self.issue_types.get(_int(form, 'issueTypeId'))
+            if issue_type is None or issue_type['projectId'] != project_id:
+                raise ApiError(400, 'No issue type.', code=7)
+            issue['issueType'] = issue_type
+        if 'priorityId' in form:
+            priority = next((p for p in PRIORITIES if p['id'] == _int(form, 'priorityId')), None)
+            if priority is None:
+                raise ApiError(400, 'No priority.', code=7)
+            issue['priority'] = priority
+        if 'statusId' in form:
+            status = next((s for s in STATUSES if s['id'] == _int(form, 'statusId')), None)
+            if status is None:
+                raise ApiError(400, 'No status.', code=7)
+            issue['status'] = dict(status, projectId=project_id)
+        if 'resolutionId' in form:
+            issue['resolution'] = {'id': _int(form, 'resolutionId'), 'name': ''} if _first(form, 'resolutionId') \
+                else None
+        if 'assigneeId' in form:
+            issue['assignee'] = self._user(_first(form, 'assigneeId')) if _first(form, 'assigneeId') else None
+
+    def add_issue(self, params, form):
+        _require(form, 'projectId', 'summary', 'issueTypeId', 'priorityId')
+        project = self._project(_first(form, 'projectId'))
+        issue_id = self._next_id('issue')
+        key_id = self._next_id('key_id:' + project['projectKey'])
+        issue = {'id': issue_id, 'projectId': project['id'],
+                 'issueKey': '{key}-{key_id}'.format(key=project['projectKey'], key_id=key_id), 'keyId': key_id,
+                 'issueType': None, 'summary': '', 'description': '', 'resolution': None, 'priority': None,
+                 'status': dict(STATUSES[0], projectId=project['id']), 'assignee': None, 'category': [],
+                 'versions': [], 'milestone': [], 'startDate': None, 'dueDate': None, 'estimatedHours': None,
+                 'actualHours': None, 'parentIssueId': None, 'createdUser': self.myself, 'created': _now(),
+                 'updatedUser': self.myself, 'updated': _now(), 'customFields': [], 'attachments': [],
+                 'sharedFiles': [], 'stars': []}
+        self._apply_issue_fields(issue, form)
+        self.issues[issue_id] = issue
+        self._notify(issue, None, _ints(form, 'notifiedUserId'))
+        return 201, issue, {}
+
+    def get_issue(self, params, form, issue):
+        return self._issue(issue)
+
+    def update_issue(self, params, form, issue):
+        issue = self._issue(issue)
+        self._apply_issue_fields(issue, form)
+        issue['updatedUser'] = self.myself
+        issue['updated'] = _now()
+        if _first(form, 'comment'):
+            self._add_comment(issue, _first(form, 'comment'), _ints(form, 'notifiedUserId'))
+        return issue
+
+    def delete_issue(self, params, form, issue):
+        issue = self._issue(issue)
+        del self.issues[issue['id']]
+        for comment_id in [c['id'] for c in self.comments.values() if c['issueId'] == issue['id']]:
+            del self.comments[comment_id]
+        return issue
+
+    # 課題コメント
+
+    def _add_comment(self, issue: dict, content: str, notified_user_ids: List[int]) -> dict:
+        comment = {'id': self._next_id('comment'), 'issueId': issue['id'], 'content': content, 'changeLog': [],
+                   'createdUser': self.myself, 'created': _now(), 'updated': _now(), 'stars': [],
+                   'notifications': []}
+        self.comments[comment['id']] = comment
+        self._notify(issue, comment, notified_user_ids)
+        return comment
+
+    def _notify(self, issue: dict, comment: Optional[dict], user_ids: List[int]):
+        for user_id in user_ids:
+            user = self._user(user_id)
+            notification = {'id': self._next_id('notification'), 'alreadyRead': False,
+                            'reason': 2 if comment else 1, 'resourceAlreadyRead': False, 'user': user,
+                            'project': self.projects.get(issue['projectId']), 'issue': issue,
+                            'comment': self._public_comment(comment) if comment else None,
+                            'pullRequest': None, 'pullRequestComment': None, 'sender': self.myself,
+                            'created': _now()}
+            self.notifications[notification['id']] = notification
+            if comment is not None:
+                comment['notifications'].append({'id': notification['id'], 'alreadyRead': False, 'reason': 2,
+                                                 'user': user, 'resourceAlreadyRead': False})
+
+    def get_comment_list(self, params, form, issue):
+        issue = self._issue(issue)
+        comments = [self._public_comment(c) for c in self.comments.values() if c['issueId'] == issue['id']]
+        return _cursor_page(comments, params)
+
+    def add_comment(self, params, form, issue):
+        _require(form, 'content')
+        comment = self._add_comment(self._issue(issue), _first(form, 'content'), _ints(form, 'notifiedUserId'))
+        return 201, self._public_comment(comment), {}
+
+    def count_comment(self, params, form, issue):
+        issue = self._issue(issue)
+        return {'count': sum(1 for c in self.comments.values() if c['issueId'] == issue['id'])}
+
+    def get_comment(self, params, form, issue, comment_id):
+        return self._public_comment(self._comment(self._issue(issue), comment_id))
+
+    def update_comment(self, params, form, issue, comment_id):
+        comment = self._comment(self._issue(issue), comment_id)
+        if 'content' in form:
+            comment['content'] = _first(form, 'content')
+            comment['updated'] = _now()
+        return self._public_comment(comment)
+
+    def delete_comment(self, params, form, issue, comment_id):
+        comment = self._comment(self._issue(issue), comment_id)
+        del self.comments[comment['id']]
+        return self._public_comment(comment)
+
+    def get_comment_notifications(self, params, form, issue, comment_id):
+        return self._comment(self._issue(issue), comment_id)['notifications']
+
+    def add_comment_notification(self, params, form, issue, comment_id):
+        issue = self._issue(issue)
+        comment = self._comment(issue, comment_id)
+        self._notify(issue, comment, _ints(form, 'notifiedUserId'))
+        return self._public_comment(comment)
+
+    # Wiki
+
+    def _find_wikis(self, params) -> List[dict]:
+        project = _first(params, 'projectIdOrKey')
+        project_id = self._project(project)['id'] if project else None
+        keyword = _first(params, 'keyword')
+        return [wiki for wiki in self.wikis.values()
+                if (project_id is None or wiki['projectId'] == project_id)
+                and (not keyword or keyword in wiki['name'] or keyword in wiki['content'])]
+
+    def get_wiki_page_list(self, params, form):
+        return self._find_wikis(params)
+
+    def count_wiki_page(self, params, form):
+        return {'count': len(self._find_wikis(params))}
+
+    def add_wiki_page(self, params, form):
+        _require(form, 'projectId', 'name', 'content')
+        project = self._project(_first(form, 'projectId'))
+        wiki = {'id': self._next_id('wiki'), 'projectId': project['id'], 'name': _first(form, 'name'),
+                'content': _first(form, 'content'), 'tags': [], 'attachments': [], 'sharedFiles': [], 'stars': [],
+                'createdUser': self.myself, 'created': _now(), 'updatedUser': self.myself, 'updated': _now()}
+        self.wikis[wiki['id']] = wiki
+        return 201, wiki, {}
+
+    def get_wiki_page(self, params, form, wiki_id):
+        return self._wiki(wiki_id)
+
+    def update_wiki_page(self, params, form, wiki_id):
+        wiki = self._wiki(wiki_id)
+        for name in ('name', 'content'):
+            if name in form:
+                wiki[name] = _first(form, name)
+        wiki['updatedUser'] = self.myself
+        wiki['updated'] = _now()
+        return wiki
+
+    def delete_wiki_page(self, params, form, wiki_id):
+        wiki = self._wiki(wiki_id)
+        del self.wikis[wiki['id']]
+        return wiki
+
+    # お知らせ
+
+    def _my_notifications(self) -> List[dict]:
+        return [n for n in self.notifications.values() if n['user']['id'] == self.myself['id']]
+
+    def get_notification(self, params, form):
+        sender_id = _int(params, 'senderId')
+        notifications = [n for n in self._my_notifications() if sender_id is None or n['sender']['id'] == sender_id]
+        return _cursor_page(notifications, params)
+
+    def count_notification(self, params, form):
+        already_read = _first(params, 'alreadyRead')
+        return {'count': sum(1 for n in self._my_notifications()
+                             if already_read is None or str(n['alreadyRead']).lower() == already_read)}
+
+    def read_notification(self, params, form, notification_id):
+        notification = self.notifications.get(int(notification_id))
+        if notification is None:
+            raise ApiError(404, 'No notification.')
+        notification['alreadyRead'] = True
+        return None
+
+    def reset_unread_notification_count(self, params, form):
+        for notification in self._my_notifications():
+            notification['resourceAlreadyRead'] = True
+        return {'count': 0}
+
+
+class _RateLimitWindow:
+    """
+    API キーとレート制限の種別ごとの、1分間 (window 秒間) の固定ウィンドウ
+    """
+    __slots__ = ('limit', 'remaining', 'reset')
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.remaining = limit
+        self.reset = time.time() + window
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # ヘッダーと本文を1度に送る (別々に送ると Nagle アルゴリズムと遅延 ACK で 40ms 程度待たされる)
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._dispatch()
+
+    do_POST = do_PATCH = do_PUT = do_DELETE = do_GET
+
+    def log_message(self, format_, *args):
+        if self.server.verbose:
+            super(_Handler, self).log_message(format_, *args)
+
+    def _dispatch(self):
+        url = urlsplit(self.path)
+        params = parse_qs(url.query, keep_blank_values=True)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        form = {}
+        if 'application/x-www-form-urlencoded' in self.headers.get('Content-Type', ''):
+            form = parse_qs(body.decode('utf-8'), keep_blank_values=True)
+        path = url.path[len(API_PREFIX):] if url.path.startswith(API_PREFIX) else url.path
+        status, content, headers = self.server.respond(self.command, path, params, form)
+        if not isinstance(content, bytes):
+            content = json.dumps(content, ensure_ascii=False).encode('utf-8')
+            headers.setdefault('Content-Type', 'application/json;charset=utf-8')
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class MockBacklogServer(ThreadingMixIn, HTTPServer):
+    """
+    負荷試験・ベンチマーク用に、ローカルで動かす Backlog API のモックサーバー
+
+    データは MockBacklogState にメモリ上で保持し、リクエストはスレッドごとに並行して処理する。
+    API キーとレート制限の種別ごとに X-RateLimit-Limit / Remaining / Reset ヘッダーを返し、上限を超えると 429 を返す。
+    latency でレスポンスを返すまでの待ち時間を、 error_rate で一時的なエラーを返す割合を指定できる。
+    random_seed を指定すると、待ち時間の揺らぎとエラーを返すリクエストが毎回同じになる。
+
+        with MockBacklogServer(latency=0.05) as server:
+            config = server.configure()
+            Issue(config).get_issue_list()
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 api_key: str = 'mock_api_key',
+                 state: Optional[MockBacklogState] = None,
+                 latency: float = 0.0,
+                 latency_jitter: float = 0.0,
+                 error_rate: float = 0.0,
+                 error_status: int = 503,
+                 rate_limits: Optional[Dict[str, int]] = None,
+                 rate_limit_window: float = 60.0,
+                 random_seed: Optional[int] = None,
+                 verbose: bool = False):
+        """
+        :param host: 待ち受けるアドレス
+        :param port: 待ち受けるポート 0 の場合は空いているポートを使う
+        :param api_key: 受け付ける API キー (違う場合は 401 を返す) None の場合は確かめない
+        :param state: サーバーが保持するデータ 指定が無い場合は空のデータ (管理者ユーザーのみ) を使う
+        :param latency: レスポンスを返す前に待つ秒数
+        :param latency_jitter: latency に加える揺らぎの最大秒数 (0 から latency_jitter の一様分布)
+        :param error_rate: error_status を返すリクエストの割合 (0.0 - 1.0) エラーの場合はデータを変更しない
+        :param error_status: error_rate で返すステータスコード
+        :param rate_limits: レート制限の種別ごとの上限 指定が無い種別は ratelimit.DEFAULT_LIMITS を使う
+        :param rate_limit_window: レート制限の回数を数える秒数
+        :param random_seed: 待ち時間の揺らぎとエラーに使う乱数のシード
+        :param verbose: True の場合、リクエストごとにログを出力する
+        """
+        super(MockBacklogServer, self).__init__((host, port), _Handler)
+        self.api_key = api_key
+        self.state = state if state else MockBacklogState()
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limits = dict(DEFAULT_LIMITS, **(rate_limits or {}))
+        self.rate_limit_window = rate_limit_window
+        self.verbose = verbose
+        # 受け付けたリクエストの数
+        self.request_count = 0
+        self._random = random.Random(random_seed)
+        self._windows = {}  # type: Dict[Tuple[str, str], _RateLimitWindow]
+        self._lock = threading.Lock()
+        self._thread = None  # type: Optional[threading.Thread]
+
+    @property
+    def host(self) -> str:
+        """
+        :return: BacklogConfigure に渡すホスト名 e.g.) 127.0.0.1:8080
+        """
+        return '{host}:{port}'.format(host=self.server_address[0], port=self.server_address[1])
+
+    def configure(self) -> BacklogConfigure:
+        """
+        :return: このサーバーに接続する設定
+        """
+        return BacklogConfigure.from_host(self.host, self.api_key or 'mock_api_key', scheme='http')
+
+    def start(self) -> 'MockBacklogServer':
+        """
+        バックグラウンドのスレッドでリクエストの受け付けを始める
+        """
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        リクエストの受け付けを止めて、ソケットを閉じる
+        """
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self) -> 'MockBacklogServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _rate_limit_headers(self, api_key: str, method: str, path: str) -> Tuple[bool, Dict[str, str]]:
+        category = classify_request(method, path)
+        now = time.time()
+        with self._lock:
+            window = self._windows.get((api_key, category))
+            if window is None or window.reset <= now:
+                window = self._windows[(api_key, category)] = _RateLimitWindow(self.rate_limits[category],
+                                                                               self.rate_limit_window)
+            allowed = window.remaining > 0
+            if allowed:
+                window.remaining -= 1
+            headers = {'X-RateLimit-Limit': str(window.limit),
+                       'X-RateLimit-Remaining': str(window.remaining),
+                       'X-RateLimit-Reset': str(int(window.reset + 0.999))}
+        return allowed, headers
+
+    def respond(self, method: str, path: str, params: Dict[str, List[str]],
+                form: Dict[str, List[str]]) -> MockResponse:
+        """
+        リクエストに対するレスポンスを作る
+
+        :param method: HTTP メソッド
+        :param path: API のパス (api/v2/ 以降)
+        :param params: URL パラメーター
+        :param form: フォームの値
+        :return: (ステータスコード, 本文, ヘッダー)
+        """
+        with self._lock:
+            self.request_count += 1
+            wait = self.latency + (self._random.uniform(0, self.latency_jitter) if self.latency_jitter else 0.0)
+            inject_error = self.error_rate > 0 and self._random.random() < self.error_rate
+        if wait > 0:
+            time.sleep(wait)
+
+        api_key = _first(params, 'apiKey', '')
+        if self.api_key is not None and api_key != self.api_key:
+            return 401, ApiError(401, 'Authentication failure.', code=11).body, {}
+        allowed, headers = self._rate_limit_headers(api_key, method, path)
+        if not allowed:
+            return 429, ApiError(429, 'Too Many Requests.', code=14).body, headers
+        if inject_error:
+            return self.error_status, ApiError(self.error_status, 'Injected error.', code=1).body, headers
+        try:
+            status, content, extra_headers = self.state.handle(method, path, params, form)
+        except ApiError as e:
+            return e.status, e.body, headers
+        except Exception as e:
+            return 500, ApiError(500, repr(e), code=1).body, headers
+        headers.update(extra_headers)
+        return status, content, headers
+
+
+def run_mock_server(host: str = '127.0.0.1', port: int = 8080, **options):
+    """
+    モックサーバーを起動し、 Ctrl+C で止めるまでリクエストを受け付ける
+
+    :param host: 待ち受けるアドレス
+    :param port: 待ち受けるポート
+    :param options: MockBacklogServer に渡す引数
+    """
+    server = MockBacklogServer(host, port, **options)
+    server.state.add_project('TEST', 'テスト')
+    print('Backlog mock server: http://{host}{prefix} (API key: {api_key})'.format(
+        host=server.host, prefix=API_PREFIX, api_key=server.api_key))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backlog API のモックサーバー')
+    parser.add_argument('--host', default='127.0.0.1', help='待ち受けるアドレス')
+    parser.add_argument('--port', type=int, default=8080, help='待ち受けるポート')
+    parser.add_argument('--api-key', default='mock_api_key', help='受け付ける API キー')
+    parser.add_argument('--latency', type=float, default=0.0, help='レスポンスを返す前に待つ秒数')
+    parser.add_argument('--latency-jitter', type=float, default=0.0, help='待ち時間に加える揺らぎの最大秒数')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='エラーを返すリクエストの割合')
+    parser.add_argument('--seed', type=int, default=None, help='乱数のシード')
+    parser.add_argument('-v', '--verbose', action='store_true', help='リクエストごとにログを出力する')
+    args = parser.parse_args()
+    run_mock_server(args.host, args.port, api_key=args.api_key, latency=args.latency,
+                    latency_jitter=args.latency_jitter, error_rate=args.error_rate, random_seed=args.seed,
+                    verbose=args.verbose)
+
+
+if __name__ == '__main__':
+    main()
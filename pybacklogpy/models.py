@@ -0,0 +1,267 @@
+import re
+from typing import TYPE_CHECKING, List, Optional, Union
+if TYPE_CHECKING:
+    from requests import Response
+
+
+def to_snake_case(key: str) -> str:
+    """
+    API の camelCase のキーを snake_case の属性名にする
+    :param key: API のキー e.g.) createdUser
+    :return: 属性名 e.g.) created_user
+    """
+    return re.sub(r'([A-Z])', r'_\1', key).lower()
+
+
+class _Shared:
+    """
+    一覧の中で同じ ID を持つ入れ子のオブジェクト (状態や担当者など) を共有するための入れ物
+    最初に参照された時に1度だけモデルに変換する
+    """
+    __slots__ = ('data', 'model', 'value')
+
+    def __init__(self, data: dict, model: type):
+        self.data = data
+        self.model = model
+        self.value = None
+
+    def get(self) -> 'Model':
+        if self.value is None:
+            self.value = self.model.from_dict(self.data)
+            self.data = None
+        return self.value
+
+
+class nested:
+    """
+    入れ子のオブジェクトを表す属性
+    JSON のまま保持しておき、最初に参照された時にモデルに変換する
+    """
+
+    def __init__(self, key: str, model: type, many: bool = False):
+        """
+        :param key: API のキー
+        :param model: 変換先のモデル
+        :param many: リストの場合は True
+        """
+        self.key = key
+        self.model = model
+        self.many = many
+        self.slot = None  # type: Optional[str]
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = getattr(instance, self.slot)
+        if isinstance(value, _Shared):
+            return value.get()
+        if isinstance(value, dict):
+            value = self.model.from_dict(value)
+            setattr(instance, self.slot, value)
+        elif self.many and value and isinstance(value[0], dict):
+            value = [self.model.from_dict(v) for v in value]
+            setattr(instance, self.slot, value)
+        return value
+
+
+class _ModelMeta(type):
+    """
+    fields と nested の定義から __slots__ を作る
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        fields = namespace.get('fields', ())
+        nested_fields = [(attr, value) for attr, value in namespace.items() if isinstance(value, nested)]
+        slots = [to_snake_case(key) for key in fields]
+        for attr, descriptor in nested_fields:
+            descriptor.slot = '_' + attr
+            slots.append(descriptor.slot)
+        if bases:
+            slots.append('extra')
+        namespace['__slots__'] = tuple(slots)
+        namespace['_attributes'] = tuple((key, to_snake_case(key)) for key in fields)
+        namespace['_nested'] = tuple((descriptor.key, descriptor) for _, descriptor in nested_fields)
+        return super(_ModelMeta, mcs).__new__(mcs, name, bases, namespace)
+
+
+class Model(metaclass=_ModelMeta):
+    """
+    API のレスポンスの JSON を保持する、 __slots__ を使った軽量なオブジェクト
+
+    fields に列挙したキーは snake_case の属性として参照できる。
+    入れ子のオブジェクトは最初に参照された時にモデルに変換する。
+    定義されていないキーは extra に dict のまま保持する (無い場合は None)。
+    """
+    fields = ()
+
+    @classmethod
+    def from_dict(cls, data: dict, shared: Optional[dict] = None) -> 'Model':
+        """
+        :param data: API のレスポンスの JSON オブジェクト
+        :param shared: 一覧の中で入れ子のオブジェクトを共有するための dict (from_list が渡す)
+        :return: モデル
+        """
+        instance = cls.__new__(cls)
+        extra = dict(data)
+        for key, attr in cls._attributes:
+            setattr(instance, attr, extra.pop(key, None))
+        for key, descriptor in cls._nested:
+            value = extra.pop(key, None)
+            if shared is not None and isinstance(value, dict) and 'id' in value:
+                model = descriptor.model
+                value = shared.setdefault((model, value['id']), _Shared(value, model))
+            setattr(instance, descriptor.slot, value)
+        instance.extra = extra or None
+        return instance
+
+    @classmethod
+    def from_list(cls, data: List[dict]) -> List['Model']:
+        """
+        JSON の配列をモデルのリストにする
+        同じ ID を持つ入れ子のオブジェクト (状態や担当者など) は、全ての要素で1つのオブジェクトを共有する
+
+        :param data: API のレスポンスの JSON 配列
+        :return: モデルのリスト
+        """
+        shared = {}
+        return [cls.from_dict(item, shared=shared) for item in data]
+
+    @classmethod
+    def from_response(cls, response: 'Response') -> Union['Model', List['Model']]:
+        """
+        :param response: API のレスポンス
+        :return: レスポンスが配列の場合はモデルのリスト、そうでない場合はモデル
+        :raises requests.exceptions.HTTPError: エラーのレスポンスの場合
+        """
+        response.raise_for_status()
+        data = response.json()
+        if isinstance(data, list):
+            return cls.from_list(data)
+        return cls.from_dict(data)
+
+    def to_dict(self) -> dict:
+        """
+        :return: API のレスポンスと同じ形式の dict
+        """
+        data = dict(self.extra or {})
+        for key, attr in self._attributes:
+            data[key] = getattr(self, attr)
+        for key, descriptor in self._nested:
+            value = descriptor.__get__(self, type(self))
+            if isinstance(value, Model):
+                value = value.to_dict()
+            elif isinstance(value, list):
+                value = [v.to_dict() if isinstance(v, Model) else v for v in value]
+            data[key] = value
+        return data
+
+    def __repr__(self) -> str:
+        return '{name}(id={id})'.format(name=type(self).__name__, id=getattr(self, 'id', None))
+
+
+class User(Model):
+    fields = ('id', 'userId', 'name', 'roleType', 'lang', 'mailAddress', 'nulabAccount', 'keyword', 'lastLoginTime')
+
+
+class Status(Model):
+    fields = ('id', 'projectId', 'name', 'color', 'displayOrder')
+
+
+class Priority(Model):
+    fields = ('id', 'name')
+
+
+class Resolution(Model):
+    fields = ('id', 'name')
+
+
+class IssueType(Model):
+    fields = ('id', 'projectId', 'name', 'color', 'displayOrder', 'templateSummary', 'templateDescription')
+
+
+class Category(Model):
+    fields = ('id', 'name', 'displayOrder')
+
+
+class Version(Model):
+    fields = ('id', 'projectId', 'name', 'description', 'startDate', 'releaseDueDate', 'archived', 'displayOrder')
+
+
+class Star(Model):
+    fields = ('id', 'comment', 'url', 'title', 'created')
+    presenter = nested('presenter', User)
+
+
+class Attachment(Model):
+    fields = ('id', 'name', 'size', 'created')
+    created_user = nested('createdUser', User)
+
+
+class SharedFile(Model):
+    fields = ('id', 'type', 'dir', 'name', 'size', 'created', 'updated')
+    created_user = nested('createdUser', User)
+    updated_user = nested('updatedUser', User)
+
+
+class Project(Model):
+    fields = ('id', 'projectKey', 'name', 'chartEnabled', 'subtaskingEnabled', 'projectLeaderCanEditProjectLeader',
+              'useWikiTreeView', 'textFormattingRule', 'archived', 'displayOrder', 'useDevAttributes')
+
+
+class Issue(Model):
+    fields = ('id', 'projectId', 'issueKey', 'keyId', 'summary', 'description', 'startDate', 'dueDate',
+              'estimatedHours', 'actualHours', 'parentIssueId', 'customFields', 'created', 'updated')
+    issue_type = nested('issueType', IssueType)
+    resolution = nested('resolution', Resolution)
+    priority = nested('priority', Priority)
+    status = nested('status', Status)
+    assignee = nested('assignee', User)
+    category = nested('category', Category, many=True)
+    versions = nested('versions', Version, many=True)
+    milestone = nested('milestone', Version, many=True)
+    created_user = nested('createdUser', User)
+    updated_user = nested('updatedUser', User)
+    attachments = nested('attachments', Attachment, many=True)
+    shared_files = nested('sharedFiles', SharedFile, many=True)
+    stars = nested('stars', Star, many=True)
+
+
+class Comment(Model):
+    fields = ('id', 'content', 'changeLog', 'notifications', 'created', 'updated')
+    created_user = nested('createdUser', User)
+    stars = nested('stars', Star, many=True)
+
+
+class WikiPage(Model):
+    fields = ('id', 'projectId', 'name', 'content', 'tags', 'created', 'updated')
+    attachments = nested('attachments', Attachment, many=True)
+    shared_files = nested('sharedFiles', SharedFile, many=True)
+    stars = nested('stars', Star, many=True)
+    created_user = nested('createdUser', User)
+    updated_user = nested('updatedUser', User)
+
+
+class Repository(Model):
+    fields = ('id', 'projectId', 'name', 'description', 'hookUrl', 'httpUrl', 'sshUrl', 'displayOrder', 'pushedAt',
+              'created', 'updated')
+    created_user = nested('createdUser', User)
+    updated_user = nested('updatedUser', User)
+
+
+class PullRequest(Model):
+    fields = ('id', 'projectId', 'repositoryId', 'number', 'summary', 'description', 'base', 'branch',
+              'baseCommit', 'branchCommit', 'closeAt', 'mergeAt', 'created', 'updated')
+    status = nested('status', Status)
+    issue = nested('issue', Issue)
+    assignee = nested('assignee', User)
+    created_user = nested('createdUser', User)
+    updated_user = nested('updatedUser', User)
+    attachments = nested('attachments', Attachment, many=True)
+    stars = nested('stars', Star, many=True)
+
+
+class Team(Model):
+    fields = ('id', 'name', 'displayOrder', 'created', 'updated')
+    members = nested('members', User, many=True)
+    created_user = nested('createdUser', User)
+    updated_user = nested('updatedUser', User)
@@ -1,11 +1,23 @@
-import configparser
-import requests
-import re
-from requests import Response
-from typing import Optional, Tuple
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Optional, Tuple
+if TYPE_CHECKING:
+    from requests import Response
 
 
-from pybacklogpy.BacklogConfigure import BacklogConfigure
+from pybacklogpy.BacklogConfigure import BacklogConfigure, get_default_configure
+from pybacklogpy.cache import ResponseCache, ValidatorStore
+from pybacklogpy.coalesce import RequestCoalescer
+from pybacklogpy.download import (DEFAULT_CHUNK_SIZE, Destination, PartialDownload, Progress, download_ranges,
+                                  file_sha256, get_content_length, get_response_file_name, parse_content_range,
+                                  resolve_destination_path, write_chunks)
+from pybacklogpy.metrics import RequestMetrics
+from pybacklogpy.ratelimit import RateLimiter, get_rate_limiter
+from pybacklogpy.retry import RetryPolicy, RetryState
+from pybacklogpy.tracing import SPAN_NAMES, Tracer, TracingTransport
+from pybacklogpy.transport import Transport, get_default_transport
+from pybacklogpy.upload import MultipartStream
 
 
 def convert_bool_to_str(request_param: dict) -> dict:
@@ -20,71 +32,322 @@ def convert_bool_to_str(request_param: dict) -> dict:
     return request_param
 
 
+def rewind_files(files: Optional[dict], data=None):
+    """
+    再送する前に、送信するファイルを先頭に戻す
+    :param files: 送信するファイル {'フィールド名': (ファイル名, ファイルオブジェクト)}
+    :param data: 送信する本文 MultipartStream などのストリームの場合は先頭に戻す
+    """
+    if hasattr(data, 'seek'):
+        data.seek(0)
+    if not files:
+        return
+    for _, file_object in files.values():
+        if hasattr(file_object, 'seek'):
+            file_object.seek(0)
+
+
 class RequestSender:
-    def __init__(self, config: Optional[BacklogConfigure] = None):
-        if config:  # プログラムから設定
-            self.api_url = 'https://{backlog_host}/api/v2/'.format(backlog_host=config.api_url)
-            self.api_key = config.api_key
-        else:  # 設定ファイルから設定
-            config_file = configparser.ConfigParser()
-            config_file.read('secrets')
-            self.api_url = 'https://{backlog_host}/api/v2/'.format(backlog_host=config_file['backlog']['Host'])
-            self.api_key = config_file['backlog']['ApiKey']
+    def __init__(self,
+                 config: Optional[BacklogConfigure] = None,
+                 transport: Optional[Transport] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 cache: Optional[ResponseCache] = None,
+                 validator_store: Optional[ValidatorStore] = None,
+                 coalescer: Optional[RequestCoalescer] = None,
+                 metrics: Optional[RequestMetrics] = None,
+                 tracer: Optional[Tracer] = None):
+        if not config:  # 環境変数・設定ファイルから設定 (読み込むのはプロセス内で1度だけ)
+            config = get_default_configure()
+        self.api_url = '{scheme}://{backlog_host}/api/v2/'.format(scheme=config.scheme, backlog_host=config.api_url)
+        self.api_key = config.api_key
+
+        # API 呼び出しごとの時間の内訳の記録 指定が無い場合は記録しない
+        self.tracer = tracer
+        # 指定が無い場合はプロセス内で共有されるコネクションプールを使う
+        # (tracer を指定した場合は、コネクションの使い回しを記録できる専用のコネクションプールを使う)
+        if not transport and tracer:
+            transport = TracingTransport()
+        self.transport = transport if transport else get_default_transport()
+        # 指定が無い場合は同じ API キーを使う RequestSender 間で共有する (無効にするには None を代入する)
+        self.rate_limiter = rate_limiter if rate_limiter else get_rate_limiter(self.api_key)
+        # 一時的なエラーの再送 (無効にするには None を代入する)
+        self.retry_policy = retry_policy if retry_policy else RetryPolicy()
+        # 参照系 API のレスポンスのキャッシュ 指定が無い場合はキャッシュしない
+        self.cache = cache
+        # ETag / Last-Modified による再検証 指定が無い場合は条件付きリクエストを送らない
+        self.validator_store = validator_store
+        # 同時に送られた同じ GET リクエストを1回の通信にまとめる 指定が無い場合はまとめない
+        self.coalescer = coalescer
+        # API 呼び出しのエンドポイントごとの集計 指定が無い場合は記録しない
+        self.metrics = metrics
 
         # 共通パラメーター
         self.payload = {
             'apiKey': self.api_key
         }
 
-    def send_delete_request(self, path: str, request_param: Optional[dict] = None) -> Response:
+    def _cache_lookup(self, method: str, path: str, params: Optional[dict]) -> Optional['Response']:
+        if self.cache is None or method != 'GET' or self.cache.ttl(path) is None:
+            return None
+        return self.cache.get(self.cache.key(self.api_url, path, params))
+
+    def _cache_update(self, method: str, path: str, params: Optional[dict], response: 'Response'):
+        if self.cache is None or not response.ok:
+            return
+        if method != 'GET':
+            self.cache.invalidate(self.api_url, path)
+            return
+        ttl = self.cache.ttl(path)
+        if ttl is not None:
+            self.cache.set(self.cache.key(self.api_url, path, params), response, ttl)
+
+    def _add_conditional_headers(self, method: str, path: str, kwargs: dict):
+        if self.validator_store is None or method != 'GET':
+            return
+        headers = self.validator_store.conditional_headers(
+            ResponseCache.key(self.api_url, path, kwargs.get('params')))
+        if headers:
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, **headers)
+
+    def _revalidate(self, method: str, path: str, params: Optional[dict], response: 'Response') -> 'Response':
+        if self.validator_store is None or method != 'GET':
+            return response
+        return self.validator_store.resolve(ResponseCache.key(self.api_url, path, params), response)
+
+    def _send(self, method: str, path: str, idempotent: Optional[bool] = None, **kwargs) -> 'Response':
+        if self.tracer is None:
+            return self._send_measured(method, path, idempotent, **kwargs)
+        with self.tracer.span(SPAN_NAMES.get(method, method), method, path) as span:
+            response = self._send_measured(method, path, idempotent, **kwargs)
+            self.tracer.on_response(span, response, decode=not kwargs.get('stream'))
+        return response
+
+    def _send_measured(self, method: str, path: str, idempotent: Optional[bool] = None, **kwargs) -> 'Response':
+        if self.metrics is None:
+            return self._send_coalesced(method, path, idempotent, **kwargs)
+        start = time.monotonic()
+        try:
+            response = self._send_coalesced(method, path, idempotent, **kwargs)
+        except Exception as e:
+            self.metrics.record_exception(method, path, time.monotonic() - start, e)
+            raise
+        self.metrics.record_response(method, path, time.monotonic() - start, response,
+                                     stream=bool(kwargs.get('stream')))
+        return response
+
+    def _send_coalesced(self, method: str, path: str, idempotent: Optional[bool] = None, **kwargs) -> 'Response':
+        # ストリーミングのレスポンスは本文を1度しか読めないのでまとめない
+        if self.coalescer is None or method != 'GET' or kwargs.get('stream'):
+            return self._send_request(method, path, idempotent, **kwargs)
+        key = ResponseCache.key(self.api_url, path, kwargs.get('params')) + \
+            (tuple(sorted((kwargs.get('headers') or {}).items())),)
+        return self.coalescer.do(key, lambda: self._send_request(method, path, idempotent, **kwargs))
+
+    def _send_request(self, method: str, path: str, idempotent: Optional[bool] = None, **kwargs) -> 'Response':
+        # ストリーミングのレスポンスは本文を読み切っていないのでキャッシュしない
+        cacheable = not kwargs.get('stream')
+        cached = self._cache_lookup(method, path, kwargs.get('params')) if cacheable else None
+        if cached is not None:
+            return cached
+        if cacheable:
+            self._add_conditional_headers(method, path, kwargs)
+        state = RetryState(method, path,
+                           retry_policy=self.retry_policy,
+                           rate_limiter=self.rate_limiter,
+                           idempotent=idempotent)
+        # requests を使うモジュールは最初のリクエストを送る時に読み込む
+        from pybacklogpy.response import BacklogResponse
+        while True:
+            wait = state.wait_before_send()
+            while wait:
+                time.sleep(wait)
+                wait = state.wait_before_send()
+            try:
+                if self.tracer is None:
+                    response = self.transport.request(method=method, url=self.api_url + path, **kwargs)
+                else:
+                    response = self.tracer.request(self.transport, method, self.api_url + path, **kwargs)
+                response = BacklogResponse.wrap(response)
+            except Exception as e:
+                delay = state.on_exception(e)
+            else:
+                delay = state.on_response(response)
+                if delay is None:
+                    if cacheable:
+                        response = self._revalidate(method, path, kwargs.get('params'), response)
+                        self._cache_update(method, path, kwargs.get('params'), response)
+                    return state.finish(response)
+                response.close()
+            time.sleep(delay)
+            rewind_files(kwargs.get('files'), kwargs.get('data'))
+
+    def send_delete_request(self, path: str, request_param: Optional[dict] = None) -> 'Response':
         data_ = convert_bool_to_str(request_param)
-        return requests.delete(url=self.api_url + path, data=data_, params=self.payload)
+        return self._send('DELETE', path, data=data_, params=self.payload)
 
-    def send_get_request(self, path: str, url_param: Optional[dict] = None) -> Response:
+    def send_get_request(self, path: str, url_param: Optional[dict] = None) -> 'Response':
         params = self.payload.copy()
         if url_param:
             for key, value in convert_bool_to_str(url_param).items():
                 params[key] = value
-        _url = self.api_url + path
-        return requests.get(url=(self.api_url + path), params=params)
+        return self._send('GET', path, params=params)
 
-    def send_patch_request(self, path: str, request_param: dict) -> Response:
+    def send_patch_request(self, path: str, request_param: dict, idempotent: bool = False) -> 'Response':
         data_ = convert_bool_to_str(request_param)
-        return requests.patch(url=(self.api_url + path), data=data_, params=self.payload)
+        return self._send('PATCH', path, idempotent=idempotent, data=data_, params=self.payload)
 
-    def send_post_request(self, path: str, request_param: dict) -> Response:
+    def send_post_request(self, path: str, request_param: dict, idempotent: bool = False) -> 'Response':
         data_ = convert_bool_to_str(request_param)
-        return requests.post(url=(self.api_url + path), data=data_, params=self.payload)
+        return self._send('POST', path, idempotent=idempotent, data=data_, params=self.payload)
 
-    def send_put_request(self, path: str, request_param: dict) -> Response:
+    def send_put_request(self, path: str, request_param: dict) -> 'Response':
         data_ = convert_bool_to_str(request_param)
-        return requests.put(url=(self.api_url + path), data=data_, params=self.payload)
-
-    def get_file(self, path: str, url_param) -> Tuple[str, Response]:
-        # ↓ホントにこんなダラダラ書く必要あんのかな・・？
-        def get_file_name(content_disposition_header: str):
-            fn = content_disposition_header[
-                 content_disposition_header.find('filename') + len('filename'):len(content_disposition_header)]
-            m = fn.find('*=')
-            fn2 = fn
-            if not m == -1:
-                fn2 = fn[:m] + fn[m + 2:]
-            m = re.search("UTF-8''", fn2)
-            if not m:
-                return fn2
-            return fn2[:m.start()] + fn2[m.end():]
+        return self._send('PUT', path, data=data_, params=self.payload)
+
+    def get_file(self,
+                 path: str,
+                 url_param,
+                 destination: Destination = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 progress: Optional[Progress] = None,
+                 resume: bool = False,
+                 segments: int = 1,
+                 sha256: Optional[str] = None) -> Tuple[str, 'Response']:
+        """
+        ファイルをダウンロードし、 chunk_size ごとに保存先に書き込む
+        ファイル全体をメモリに読み込まないため、大きなファイルでもメモリの使用量は chunk_size 程度で済む
+
+        :param path: API のパス
+        :param url_param: URL パラメーター
+        :param destination: 保存先 (ファイルまたはディレクトリのPATH, ファイルオブジェクト, チャンクを受け取る関数)
+            指定が無い場合は tmp ディレクトリにレスポンスのファイル名で保存する
+        :param chunk_size: 1度に読み書きするバイト数
+        :param progress: 進捗を受け取る関数 (ダウンロード済みのバイト数, 全体のバイト数) が渡される
+        :param resume: True の場合、中断したダウンロードを続きから再開できるようにする (destination は PATH のみ)
+        :param segments: 1つのファイルを何個の範囲に分けて並行してダウンロードするか (2以上の場合は resume と同じ扱い)
+        :param sha256: ダウンロードしたファイルの SHA-256 (16進数の文字列) 一致しない場合は ValueError
+
+        :return: (保存されたファイルのPATH, レスポンス) ダウンロードに失敗した場合は PATH は空文字列
+        """
+        if self.tracer is not None:
+            with self.tracer.span('get_file', 'GET', path) as span:
+                filepath, response = self._get_file(path, url_param, destination, chunk_size, progress, resume,
+                                                    segments, sha256)
+                span.status_code = response.status_code
+            return filepath, response
+        return self._get_file(path, url_param, destination, chunk_size, progress, resume, segments, sha256)
 
+    def _get_file(self,
+                  path: str,
+                  url_param,
+                  destination: Destination,
+                  chunk_size: int,
+                  progress: Optional[Progress],
+                  resume: bool,
+                  segments: int,
+                  sha256: Optional[str]) -> Tuple[str, 'Response']:
         params = self.payload.copy()
         if url_param:
             for p in url_param:
                 params[p] = url_param[p]
-        response = requests.get(url=(self.api_url + path), params=params)
-        if not response.ok:
-            return '', response
-        filename = get_file_name(response.headers['Content-Disposition'])
-        with open('tmp/{filename}'.format(filename=filename), mode='wb') as save_file:
-            save_file.write(response.content)
-        return 'tmp/{filename}'.format(filename=filename), response
-
-    def post_file(self, path: str, files: dict) -> Response:
-        return requests.post(url=(self.api_url + path), files=files, params=self.payload)
+        if resume or segments > 1:
+            return self._get_file_ranges(path, params, destination, chunk_size, progress, segments, sha256)
+        response = self._send('GET', path, params=params, stream=True)
+        return self._save_file(response, destination, chunk_size, progress, sha256)
+
+    def _save_file(self,
+                   response: 'Response',
+                   destination: Destination,
+                   chunk_size: int,
+                   progress: Optional[Progress],
+                   sha256: Optional[str]) -> Tuple[str, 'Response']:
+        try:
+            if not response.ok:
+                response.content  # エラーの内容を読めるように本文を読み込んでおく
+                return '', response
+            chunks = response.iter_content(chunk_size=chunk_size)
+            if self.tracer is not None:
+                chunks = self.tracer.measure_transfer(chunks)
+            filepath = write_chunks(chunks,
+                                    destination=destination,
+                                    filename=get_response_file_name(response),
+                                    total=get_content_length(response),
+                                    progress=progress)
+        finally:
+            response.close()
+        if sha256 and file_sha256(filepath) != sha256.lower():
+            os.remove(filepath)
+            raise ValueError('ダウンロードしたファイルの SHA-256 が一致しません')
+        return filepath, response
+
+    def _get_file_ranges(self,
+                         path: str,
+                         params: dict,
+                         destination: Optional[str],
+                         chunk_size: int,
+                         progress: Optional[Progress],
+                         segments: int,
+                         sha256: Optional[str]) -> Tuple[str, 'Response']:
+        if destination is not None and not isinstance(destination, str):
+            raise ValueError('再開可能なダウンロードの保存先には PATH を指定してください')
+        # 最初の1バイトだけを取得して、ファイル名・全体のサイズ・ Range に対応しているかを確かめる
+        response = self._send('GET', path, params=params, headers={'Range': 'bytes=0-0'}, stream=True)
+        total = parse_content_range(response.headers.get('Content-Range'))
+        if response.status_code != 206 or total is None:
+            # 空のファイルは最初の1バイトも無いため 416 が返る その場合も Range を付けずに取得し直す
+            if response.status_code in (206, 416):
+                response.close()
+                response = self._send('GET', path, params=params, stream=True)
+            # Range に対応していない場合は普通にダウンロードする
+            return self._save_file(response, destination, chunk_size, progress, sha256)
+        response.close()
+
+        validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+        filepath = resolve_destination_path(destination, get_response_file_name(response))
+        download = PartialDownload.open(filepath, total, validator, segments)
+
+        def fetch(start, end):
+            headers = {'Range': 'bytes={start}-{end}'.format(start=start, end=end)}
+            if validator:
+                # サーバー上のファイルが変わっていた場合は 206 ではなく 200 が返る
+                headers['If-Range'] = validator
+            return self._send('GET', path, params=params, headers=headers, stream=True)
+
+        download_ranges(fetch, download, chunk_size=chunk_size, progress=progress, retry_policy=self.retry_policy)
+        return download.complete(sha256), response
+
+    def post_file(self, path: str, files: dict) -> 'Response':
+        return self._send('POST', path, files=files, params=self.payload)
+
+    def post_multipart(self, path: str, body: MultipartStream) -> 'Response':
+        """
+        multipart/form-data の本文を、メモリに読み込まずに少しずつ送信する
+        :param path: API のパス
+        :param body: 送信する本文
+        :return: レスポンス
+        """
+        headers = {'Content-Type': body.content_type, 'Content-Length': str(len(body))}
+        return self._send('POST', path, data=body, headers=headers, params=self.payload)
+
+
+_request_sender_lock = threading.Lock()
+
+
+def get_request_sender(config: Optional[BacklogConfigure] = None) -> RequestSender:
+    """
+    設定に対応する RequestSender を返す
+    同じ BacklogConfigure から作られたクラスは、1つの RequestSender (とそのコネクションプール) を共有する
+
+    :param config: 設定 指定が無い場合は環境変数・設定ファイルから読み込んだ設定を使う
+
+    :return: RequestSender
+    """
+    if not config:
+        config = get_default_configure()
+    if config.request_sender is None:
+        with _request_sender_lock:
+            if config.request_sender is None:
+                config.request_sender = RequestSender(config)
+    return config.request_sender
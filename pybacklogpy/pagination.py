@@ -0,0 +1,200 @@
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+if TYPE_CHECKING:
+    from requests import Response
+
+# 一括取得の結果
+# items: 取得順に並べた要素 (重複は除く), total: 取得前に数えた件数,
+# duplicate_ids: 複数のページに現れた要素のID, missing_count: total に対して足りない件数
+ExportResult = namedtuple('ExportResult', ['items', 'total', 'duplicate_ids', 'missing_count'])
+
+# ID を指定した一括取得の結果
+# items: {ID: 要素}, missing_ids: 見つからなかった (削除された、または参照できない) ID
+IdLookupResult = namedtuple('IdLookupResult', ['items', 'missing_ids'])
+
+
+def response_to_list(response: 'Response') -> list:
+    """
+    一覧取得のレスポンスを検査し、 JSON のリストにして返す
+    :param response: 一覧取得のレスポンス
+    :return: 要素のリスト
+    """
+    response.raise_for_status()
+    return response.json()
+
+
+def iter_offset_pages(fetch: Callable[[int, int], 'Response'],
+                      count: int,
+                      offset: int = 0,
+                      prefetch: bool = False) -> Iterator[dict]:
+    """
+    offset / count でページングする一覧 API を最後まで辿り、要素を1件ずつ返す
+    メモリ上に保持するのは、取得中のページと先読みしたページの最大2ページのみ
+
+    :param fetch: (offset, count) を受け取って1ページ分のレスポンスを返す関数
+    :param count: 1ページあたりの取得件数
+    :param offset: 取得を開始するオフセット
+    :param prefetch: True の場合、現在のページを返している間に次のページをバックグラウンドで取得する
+
+    :return: 一覧の要素のイテレーター
+    """
+    if not prefetch:
+        while True:
+            page = response_to_list(fetch(offset, count))
+            for item in page:
+                yield item
+            if len(page) < count:
+                return
+            offset += count
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        page = response_to_list(fetch(offset, count))
+        while True:
+            next_page = None
+            if len(page) >= count:
+                next_page = executor.submit(fetch, offset + count, count)
+            for item in page:
+                yield item
+            if next_page is None:
+                return
+            offset += count
+            page = response_to_list(next_page.result())
+    finally:
+        executor.shutdown(wait=False)
+
+
+def iter_id_cursor_pages(fetch: Callable[[Optional[int], Optional[int]], 'Response'],
+                         count: int,
+                         order: str = 'desc',
+                         min_id: Optional[int] = None,
+                         max_id: Optional[int] = None) -> Iterator[dict]:
+    """
+    minId / maxId でページングする一覧 API を最後まで辿り、要素を1件ずつ返す
+    前のページの最後の ID を次のページの minId (昇順) または maxId (降順) に渡すため、同じページを取り直すことはない
+
+    :param fetch: (min_id, max_id) を受け取って1ページ分のレスポンスを返す関数
+    :param count: 1ページあたりの取得件数
+    :param order: “asc”または”desc”
+    :param min_id: 最小ID 降順の場合はこの ID まで辿ったら終了する
+    :param max_id: 最大ID 昇順の場合はこの ID まで辿ったら終了する
+
+    :return: 一覧の要素のイテレーター
+    """
+    if order not in {'desc', 'asc'}:
+        raise ValueError('order は desc または asc のみが使用できます')
+    last_id = None
+    while True:
+        page = response_to_list(fetch(min_id, max_id))
+        new_items = 0
+        for item in page:
+            # minId / maxId に一致する要素が返ってきても、前のページで返したものは飛ばす
+            if last_id is not None and (item['id'] >= last_id if order == 'desc' else item['id'] <= last_id):
+                continue
+            new_items += 1
+            last_id = item['id']
+            yield item
+        if new_items == 0 or len(page) < count:
+            return
+        if order == 'desc':
+            max_id = last_id
+        else:
+            min_id = last_id
+
+
+def fetch_offset_pages_concurrently(fetch: Callable[[int, int], 'Response'],
+                                    total: int,
+                                    count: int,
+                                    max_workers: int = 4) -> ExportResult:
+    """
+    件数が分かっている一覧 API の全ページを並行に取得し、オフセット順に結合する
+    取得中に要素が追加・削除されるとページの境界がずれるため、重複と欠落を検出して返す
+
+    :param fetch: (offset, count) を受け取って1ページ分のレスポンスを返す関数
+    :param total: 一覧の件数
+    :param count: 1ページあたりの取得件数
+    :param max_workers: 同時に取得するページ数の上限
+
+    :return: ExportResult
+    """
+    offsets = range(0, total, count)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pages = list(executor.map(lambda offset: response_to_list(fetch(offset, count)), offsets))
+    return merge_offset_pages(pages, total)
+
+
+def merge_offset_pages(pages: List[list], total: int) -> ExportResult:
+    """
+    オフセット順に並んだページを結合し、ページの境界がずれて生じた重複と欠落を数える
+
+    :param pages: オフセット順のページ (要素のリスト) のリスト
+    :param total: 取得前に数えた件数
+
+    :return: ExportResult
+    """
+    items = []  # type: List[dict]
+    seen_ids = set()
+    duplicate_ids = []
+    for page in pages:
+        for item in page:
+            if item['id'] in seen_ids:
+                duplicate_ids.append(item['id'])
+                continue
+            seen_ids.add(item['id'])
+            items.append(item)
+    return ExportResult(items=items, total=total, duplicate_ids=duplicate_ids,
+                        missing_count=max(total - len(items), 0))
+
+
+def fetch_by_ids_concurrently(fetch: Callable[[List[int]], 'Response'],
+                              ids: Iterable[int],
+                              chunk_size: int = 100,
+                              max_workers: int = 4) -> IdLookupResult:
+    """
+    ID の配列 (id[]) で絞り込める一覧 API を使い、指定した ID の要素をまとめて取得する
+    ID は chunk_size 個ずつに分けて (URL が長くなりすぎないように) 並行に取得する
+
+    :param fetch: ID のリストを受け取って、その ID の要素の一覧のレスポンスを返す関数
+    :param ids: 取得する要素の ID (重複は1つにまとめる)
+    :param chunk_size: 1回のリクエストで取得する ID の数
+    :param max_workers: 同時に送るリクエスト数の上限
+
+    :return: IdLookupResult
+    """
+    unique_ids, chunks = split_ids(ids, chunk_size)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pages = list(executor.map(lambda chunk: response_to_list(fetch(chunk)), chunks))
+    return merge_id_pages(pages, unique_ids)
+
+
+def split_ids(ids: Iterable[int], chunk_size: int) -> Tuple[List[int], List[List[int]]]:
+    """
+    ID の重複を除き、 chunk_size 個ずつに分ける
+
+    :param ids: 要素の ID
+    :param chunk_size: 1回のリクエストで取得する ID の数
+
+    :return: (重複を除いた ID のリスト, 分けた ID のリストのリスト)
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size は1以上で指定してください')
+    unique_ids = list(OrderedDict.fromkeys(ids))
+    return unique_ids, [unique_ids[i:i + chunk_size] for i in range(0, len(unique_ids), chunk_size)]
+
+
+def merge_id_pages(pages: List[list], unique_ids: List[int]) -> IdLookupResult:
+    """
+    ID を指定して取得したページを結合し、 unique_ids の順に並べる
+
+    :param pages: 取得したページ (要素のリスト) のリスト
+    :param unique_ids: 取得した ID (重複を除いたもの)
+
+    :return: IdLookupResult
+    """
+    found = {}  # type: Dict[int, dict]
+    for page in pages:
+        for item in page:
+            found[item['id']] = item
+    items = OrderedDict((id_, found[id_]) for id_ in unique_ids if id_ in found)
+    return IdLookupResult(items=items, missing_ids=[id_ for id_ in unique_ids if id_ not in found])
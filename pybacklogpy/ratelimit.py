@@ -0,0 +1,196 @@
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+if TYPE_CHECKING:
+    from requests import Response
+
+# Backlog のレート制限の種別
+# https://developer.nulab.com/ja/docs/backlog/rate-limit/
+READ = 'read'
+UPDATE = 'update'
+SEARCH = 'search'
+ICON = 'icon'
+
+# 1分あたりの上限の初期値 レスポンスヘッダーを受け取った後はその値に合わせる
+DEFAULT_LIMITS = {
+    READ: 600,
+    UPDATE: 150,
+    SEARCH: 150,
+    ICON: 60,
+}
+
+# 課題の検索に当たる API
+SEARCH_PATHS = {'issues', 'issues/count'}
+
+
+def classify_request(method: str, path: str) -> str:
+    """
+    リクエストがどのレート制限の種別に当たるかを返す
+    :param method: HTTP メソッド
+    :param path: API のパス (api/v2/ 以降)
+    :return: READ, UPDATE, SEARCH, ICON のいずれか
+    """
+    if method.upper() != 'GET':
+        return UPDATE
+    path = path.strip('/')
+    if path in SEARCH_PATHS:
+        return SEARCH
+    if path.endswith('/icon') or path.endswith('/image') or path == 'space/image':
+        return ICON
+    return READ
+
+
+def _int_header(response: 'Response', name: str) -> Optional[int]:
+    value = response.headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """
+    1つのレート制限の種別に対応するトークンバケット
+
+    window 秒あたり limit 回のペースでトークンが補充される。
+    サーバーから残り回数とリセット時刻を受け取った場合は、リセット時刻まではその残り回数も超えないようにする。
+    """
+
+    def __init__(self, limit: int, window: float = 60.0):
+        """
+        :param limit: window 秒あたりのリクエスト数の上限
+        :param window: 上限を数える期間(秒)
+        """
+        self.limit = limit
+        self.window = window
+        self.tokens = float(limit)
+        self.remaining = None  # type: Optional[int]
+        self.reset_at = None  # type: Optional[float]
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(float(self.limit), self.tokens + (now - self._updated) * self.limit / self.window)
+        self._updated = now
+        if self.reset_at is not None and now >= self.reset_at:
+            self.remaining = None
+            self.reset_at = None
+
+    def try_acquire(self) -> float:
+        """
+        トークンを1つ取り出す
+        :return: 取り出せた場合は 0、取り出せなかった場合は次に試すまでに待つ秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self.remaining is not None and self.remaining < 1:
+                return max(self.reset_at - now, 0.001)
+            if self.tokens < 1:
+                return (1 - self.tokens) * self.window / self.limit
+            self.tokens -= 1
+            if self.remaining is not None:
+                self.remaining -= 1
+            return 0
+
+    def acquire(self):
+        """
+        トークンを1つ取り出す 取り出せるまで待つ
+        """
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def update(self, limit: Optional[int], remaining: Optional[int], reset: Optional[int]):
+        """
+        サーバーから受け取ったレート制限の状態を反映する
+        :param limit: X-RateLimit-Limit
+        :param remaining: X-RateLimit-Remaining
+        :param reset: X-RateLimit-Reset (UNIX 時間)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if limit:
+                self.limit = limit
+                self.tokens = min(self.tokens, float(limit))
+            if remaining is not None and reset is not None:
+                self.remaining = remaining
+                self.reset_at = now + max(reset - time.time(), 0)
+
+    def block(self, seconds: float):
+        """
+        指定した秒数の間、トークンを取り出せないようにする
+        :param seconds: 待つ秒数
+        """
+        with self._lock:
+            self.remaining = 0
+            self.reset_at = time.monotonic() + seconds
+
+
+class RateLimiter:
+    """
+    API キーごとのレート制限を守るためのリミッター
+    READ, UPDATE, SEARCH, ICON の種別ごとに別々のトークンバケットを持つ
+    """
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None, max_retries_on_429: int = 3):
+        """
+        :param limits: 種別ごとの1分あたりの上限 指定が無い種別は DEFAULT_LIMITS を使う
+        :param max_retries_on_429: 429 が返ってきた場合に、リセット時刻まで待って再送する回数
+        """
+        _limits = DEFAULT_LIMITS.copy()
+        if limits:
+            _limits.update(limits)
+        self.buckets = {category: TokenBucket(limit) for category, limit in _limits.items()}
+        self.max_retries_on_429 = max_retries_on_429
+
+    def bucket(self, method: str, path: str) -> TokenBucket:
+        """
+        リクエストに対応するトークンバケットを返す
+        :param method: HTTP メソッド
+        :param path: API のパス
+        :return: TokenBucket
+        """
+        return self.buckets[classify_request(method, path)]
+
+    @staticmethod
+    def update(bucket: TokenBucket, response: 'Response'):
+        """
+        レスポンスヘッダーのレート制限の情報をトークンバケットに反映する
+        429 の場合はリセット時刻まで (不明な場合は1分間) トークンを取り出せないようにする
+        :param bucket: リクエストに対応するトークンバケット
+        :param response: レスポンス
+        """
+        limit = _int_header(response, 'X-RateLimit-Limit')
+        remaining = _int_header(response, 'X-RateLimit-Remaining')
+        reset = _int_header(response, 'X-RateLimit-Reset')
+        bucket.update(limit, remaining, reset)
+        if response.status_code == 429:
+            if reset is not None:
+                wait = reset - time.time()
+            else:
+                retry_after = _int_header(response, 'Retry-After')
+                wait = retry_after if retry_after is not None else bucket.window
+            bucket.block(max(wait, 0.001))
+
+
+_rate_limiters = {}  # type: Dict[str, RateLimiter]
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(api_key: str) -> RateLimiter:
+    """
+    API キーに対応する RateLimiter を返す
+    同じ API キーを使う RequestSender は全て同じ RateLimiter を共有する
+    :param api_key: API キー
+    :return: RateLimiter
+    """
+    with _rate_limiters_lock:
+        if api_key not in _rate_limiters:
+            _rate_limiters[api_key] = RateLimiter()
+        return _rate_limiters[api_key]
@@ -0,0 +1,86 @@
+import json
+from requests import Response
+from typing import Any, Callable
+
+
+def _stdlib_loads(content: bytes) -> Any:
+    return json.loads(content.decode('utf-8'))
+
+
+def _default_loads() -> Callable[[bytes], Any]:
+    """
+    インストールされている中で最も速い JSON デコーダーを選ぶ (orjson, ujson, json の順)
+    """
+    try:
+        import orjson
+        return orjson.loads
+    except ImportError:
+        pass
+    try:
+        import ujson
+        return ujson.loads
+    except ImportError:
+        pass
+    return _stdlib_loads
+
+
+# レスポンスの本文 (bytes) を受け取ってデコードする関数
+_json_loads = _default_loads()
+
+
+def get_json_loads() -> Callable[[bytes], Any]:
+    """
+    :return: レスポンスのデコードに使う関数
+    """
+    return _json_loads
+
+
+def set_json_loads(loads: Callable[[bytes], Any]):
+    """
+    レスポンスのデコードに使う関数を差し替える
+    :param loads: UTF-8 の bytes を受け取ってデコードする関数 None の場合は既定の関数に戻す
+    """
+    global _json_loads
+    _json_loads = loads if loads else _default_loads()
+
+
+class BacklogResponse(Response):
+    """
+    本文のデコード結果を保持する Response
+
+    json() と text は最初に呼ばれた時に1度だけデコードし、以降は同じオブジェクトを返す。
+    copy.copy で複製したレスポンス (キャッシュから返されるものなど) は本文だけを共有し、デコード結果は複製ごとに持つ。
+    (requests の Response は __attrs__ に列挙した属性だけを複製するため、 _decoded は複製されない)
+    そのため、あるレスポンスの json() の結果を変更しても、キャッシュや他のスレッドが受け取ったレスポンスには影響しない。
+    """
+
+    @classmethod
+    def wrap(cls, response: Response) -> 'BacklogResponse':
+        """
+        requests の Response を複製せずに BacklogResponse にする
+        :param response: レスポンス
+        :return: 同じオブジェクト
+        """
+        if not isinstance(response, cls):
+            response.__class__ = cls
+            response._decoded = {}
+        return response
+
+    def _memoize(self, key: str, decode: Callable[[], Any]) -> Any:
+        decoded = self.__dict__.setdefault('_decoded', {})
+        if key not in decoded:
+            decoded[key] = decode()
+        return decoded[key]
+
+    @property
+    def text(self) -> str:
+        return self._memoize('text', lambda: super(BacklogResponse, self).text)
+
+    def json(self, **kwargs) -> Any:
+        """
+        :param kwargs: 指定した場合は requests と同じ方法でデコードする (結果は保持しない)
+        :return: デコードした本文
+        """
+        if kwargs:
+            return super(BacklogResponse, self).json(**kwargs)
+        return self._memoize('json', lambda: _json_loads(self.content))
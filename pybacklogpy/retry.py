@@ -0,0 +1,167 @@
+import random
+from typing import TYPE_CHECKING, List, Optional
+if TYPE_CHECKING:
+    from requests import Response
+
+from pybacklogpy.ratelimit import RateLimiter
+
+
+class RetryPolicy:
+    """
+    一時的なエラーの場合にリクエストを再送する方針
+
+    冪等な GET / PUT / DELETE は自動で再送する。
+    POST / PATCH は、送信時に冪等であると指定された場合 (idempotent=True) のみ再送する。
+    """
+
+    def __init__(self,
+                 max_retries: int = 3,
+                 backoff_factor: float = 0.5,
+                 max_backoff: float = 30.0,
+                 jitter: bool = True,
+                 retry_statuses: frozenset = frozenset({500, 502, 503, 504}),
+                 idempotent_methods: frozenset = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})):
+        """
+        :param max_retries: 再送する最大回数
+        :param backoff_factor: 1回目の再送までに待つ秒数 以降は再送の度に2倍にする
+        :param max_backoff: 再送までに待つ秒数の上限
+        :param jitter: True の場合、待つ秒数を 0 から上記の秒数の間でランダムにする
+        :param retry_statuses: 再送するステータスコード
+        :param idempotent_methods: 指定が無くても再送してよい HTTP メソッド
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = retry_statuses
+        self.idempotent_methods = idempotent_methods
+
+    def can_retry(self, method: str, idempotent: Optional[bool] = None) -> bool:
+        """
+        :param method: HTTP メソッド
+        :param idempotent: リクエストが冪等かどうか 指定が無い場合は HTTP メソッドから判断する
+        :return: 再送してよいリクエストかどうか
+        """
+        if idempotent is not None:
+            return idempotent
+        return method.upper() in self.idempotent_methods
+
+    def backoff(self, retry_number: int) -> float:
+        """
+        :param retry_number: 何回目の再送か (0 始まり)
+        :return: 再送までに待つ秒数
+        """
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** retry_number))
+        if self.jitter:
+            return random.uniform(0, delay)
+        return delay
+
+
+def _retry_after(response: 'Response') -> Optional[float]:
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+class RetryState:
+    """
+    1回の API 呼び出しについて、レート制限と再送の状態を管理する
+
+    通信そのものは行わず、送信前に待つ秒数と、レスポンスまたは例外を受け取った後に再送するかどうかだけを判断する。
+    同期版・非同期版の RequestSender はそれぞれの方法で待ってから送信する。
+    """
+
+    def __init__(self,
+                 method: str,
+                 path: str,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 idempotent: Optional[bool] = None):
+        """
+        :param method: HTTP メソッド
+        :param path: API のパス
+        :param retry_policy: 再送の方針 指定が無い場合は再送しない
+        :param rate_limiter: レート制限 指定が無い場合は制限しない
+        :param idempotent: リクエストが冪等かどうか 指定が無い場合は HTTP メソッドから判断する
+        """
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.bucket = rate_limiter.bucket(method, path) if rate_limiter else None
+        self.retryable = retry_policy is not None and retry_policy.can_retry(method, idempotent)
+        self.rate_limited = 0
+        self.delays = []  # type: List[float]
+
+    @property
+    def retry_count(self) -> int:
+        """
+        :return: これまでに再送した回数 (429 による再送を含む)
+        """
+        return len(self.delays) + self.rate_limited
+
+    def wait_before_send(self) -> float:
+        """
+        :return: 送信してよい場合は 0、そうでない場合は待つ秒数
+        """
+        if self.bucket is None:
+            return 0
+        return self.bucket.try_acquire()
+
+    def _next_delay(self, response: Optional['Response'] = None) -> Optional[float]:
+        if not self.retryable or len(self.delays) >= self.retry_policy.max_retries:
+            return None
+        delay = _retry_after(response) if response is not None else None
+        if delay is None:
+            delay = self.retry_policy.backoff(len(self.delays))
+        self.delays.append(delay)
+        return delay
+
+    def on_response(self, response: 'Response') -> Optional[float]:
+        """
+        :param response: レスポンス
+        :return: 再送する場合は再送までに待つ秒数、再送しない場合は None
+        """
+        if self.bucket is not None:
+            self.rate_limiter.update(self.bucket, response)
+        if response.status_code == 429:
+            # 429 はサーバーが処理していないので、HTTP メソッドに関係なく再送してよい
+            if self.bucket is not None and self.rate_limited < self.rate_limiter.max_retries_on_429:
+                self.rate_limited += 1
+                return 0  # リセット時刻までは wait_before_send で待つ
+            if self.retry_policy is not None and len(self.delays) < self.retry_policy.max_retries:
+                delay = _retry_after(response)
+                delay = delay if delay is not None else self.retry_policy.backoff(len(self.delays))
+                self.delays.append(delay)
+                return delay
+            return None
+        if self.retry_policy is not None and response.status_code in self.retry_policy.retry_statuses:
+            return self._next_delay(response)
+        return None
+
+    def on_exception(self, exception: Exception) -> float:
+        """
+        接続エラーやタイムアウトの場合に再送までに待つ秒数を返す 再送しない場合は例外をそのまま送出する
+        :param exception: 送信時に発生した例外
+        :return: 再送までに待つ秒数
+        """
+        from requests import exceptions
+        if isinstance(exception, (exceptions.ConnectionError, exceptions.Timeout)):
+            delay = self._next_delay()
+            if delay is not None:
+                return delay
+        exception.retry_count = self.retry_count
+        exception.retry_delays = self.delays
+        raise exception
+
+    def finish(self, response: 'Response') -> 'Response':
+        """
+        再送の回数と待った秒数をレスポンスに記録する
+        :param response: 最終的なレスポンス
+        :return: response.retry_count と response.retry_delays を設定したレスポンス
+        """
+        response.retry_count = self.retry_count
+        response.retry_delays = self.delays
+        return response
@@ -0,0 +1,287 @@
+from contextlib import contextmanager
+import json
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Optional
+import uuid
+if TYPE_CHECKING:
+    import requests
+    from requests import Response
+
+from pybacklogpy.metrics import endpoint_template
+from pybacklogpy.transport import Transport
+
+# HTTP メソッドごとのスパン名
+SPAN_NAMES = {
+    'DELETE': 'send_delete_request',
+    'GET': 'send_get_request',
+    'PATCH': 'send_patch_request',
+    'POST': 'send_post_request',
+    'PUT': 'send_put_request',
+}
+
+
+class Span:
+    """
+    1回の API 呼び出し (send_*_request または get_file) の時間の内訳
+
+    秒数は全て time.monotonic で測り、 start だけは UNIX 時間とする。
+    attempts には再送を含めた通信1回ごとに次の dict が入る。
+        status_code: ステータスコード (例外の場合は None)
+        connection_reused: コネクションを使い回した場合は True (TracingTransport 以外では None)
+        connect: 名前解決と TCP の接続にかかった秒数 (コネクションを使い回した場合は None)
+        tls: TLS のハンドシェイクにかかった秒数 (コネクションを使い回した場合・ http の場合は None)
+        ttfb: 送信を始めてからレスポンスヘッダーを受け取るまでの秒数 (connect, tls を含む)
+        server: ttfb から connect, tls を除いた秒数 (リクエストの送信とサーバーの処理時間)
+        transfer: レスポンスの本文の受信にかかった秒数 (ストリーミングの場合は 0)
+        error: 例外の repr (無い場合は None)
+    """
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'method', 'path', 'endpoint', 'start', 'duration',
+                 'status_code', 'response_bytes', 'coalesced', 'transfer', 'decode', 'attempts', 'error', '_started')
+
+    def __init__(self, name: str, method: str, path: str, parent: Optional['Span'] = None):
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.method = method
+        self.path = path
+        self.endpoint = endpoint_template(path)
+        self.start = time.time()
+        self.duration = None  # type: Optional[float]
+        self.status_code = None  # type: Optional[int]
+        self.response_bytes = 0
+        # 同時に送られた同じリクエストの結果を受け取った (通信していない) 場合は True
+        self.coalesced = False
+        # 本文の受信にかかった秒数の合計
+        self.transfer = 0.0
+        # JSON のデコードにかかった秒数 (デコードしていない場合は None)
+        self.decode = None  # type: Optional[float]
+        self.attempts = []  # type: List[dict]
+        self.error = None  # type: Optional[str]
+        self._started = time.monotonic()
+
+    def to_dict(self) -> dict:
+        """
+        :return: JSON にできる dict
+        """
+        return dict((name, getattr(self, name)) for name in self.__slots__ if not name.startswith('_'))
+
+
+# スパンを受け取る関数
+SpanExporter = Callable[[Span], None]
+
+
+class JsonLinesExporter:
+    """
+    スパンを JSON Lines のファイルに1行ずつ追記する
+    """
+
+    def __init__(self, filepath: str):
+        """
+        :param filepath: 出力するファイルのPATH
+        """
+        self.filepath = filepath
+        self._lock = threading.Lock()
+
+    def __call__(self, span: Span):
+        line = json.dumps(span.to_dict(), ensure_ascii=False)
+        with self._lock:
+            with open(self.filepath, mode='a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+def _traced_connection(base: type) -> type:
+    """
+    接続にかかった時間と、送ったリクエストの数を記録するコネクションクラスを作る
+    """
+
+    class TracedConnection(base):
+        def __init__(self, *args, **kwargs):
+            super(TracedConnection, self).__init__(*args, **kwargs)
+            self.trace_connect = None  # type: Optional[float]
+            self.trace_tls = None  # type: Optional[float]
+            self.trace_requests = 0
+
+        def _new_conn(self):
+            start = time.monotonic()
+            sock = super(TracedConnection, self)._new_conn()
+            self.trace_connect = time.monotonic() - start
+            return sock
+
+        def connect(self):
+            start = time.monotonic()
+            self.trace_connect = None
+            self.trace_requests = 0
+            super(TracedConnection, self).connect()
+            if self.trace_connect is not None and hasattr(self, 'sock') and hasattr(self.sock, 'version'):
+                self.trace_tls = max(time.monotonic() - start - self.trace_connect, 0.0)
+
+    TracedConnection.__name__ = 'Traced' + base.__name__
+    return TracedConnection
+
+
+class TracingTransport(Transport):
+    """
+    コネクションの使い回しと、接続・ TLS のハンドシェイクにかかった時間を Tracer に記録できる Transport
+    """
+
+    def _build_session(self) -> 'requests.Session':
+        from urllib3 import connection, connectionpool
+
+        session = super(TracingTransport, self)._build_session()
+
+        class TracedHTTPConnectionPool(connectionpool.HTTPConnectionPool):
+            ConnectionCls = _traced_connection(connection.HTTPConnection)
+
+        class TracedHTTPSConnectionPool(connectionpool.HTTPSConnectionPool):
+            ConnectionCls = _traced_connection(connection.HTTPSConnection)
+
+        pool_classes = {'http': TracedHTTPConnectionPool, 'https': TracedHTTPSConnectionPool}
+        for adapter in set(session.adapters.values()):
+            adapter.poolmanager.pool_classes_by_scheme = pool_classes
+        return session
+
+
+class Tracer:
+    """
+    API 呼び出しごとに時間の内訳 (Span) を記録する
+
+    RequestSender に渡すと、 send_*_request と get_file の呼び出しごとにスパンを作り、
+    終了したスパンを exporter に渡す。 get_file の中で送られたリクエストは get_file のスパンの子になる。
+    コネクションの使い回しと接続にかかった時間は TracingTransport を使った場合だけ記録される。
+    RequestSender に渡さなかった場合 (既定) は何も記録しない。
+    親のスパンはスレッドごとに管理するため、非同期版 (AsyncRequestSender) には対応していない。
+    """
+
+    def __init__(self, exporter: Optional[SpanExporter] = None, decode_json: bool = True):
+        """
+        :param exporter: 終了したスパンを受け取る関数 e.g.) JsonLinesExporter('trace.jsonl')
+        :param decode_json: True の場合、 JSON のレスポンスをその場でデコードして、かかった時間を記録する
+            (デコード結果はレスポンスに保持されるため、後で json() を呼んでも再度デコードしない)
+        """
+        self.exporter = exporter
+        self.decode_json = decode_json
+        self._local = threading.local()
+
+    def current(self) -> Optional[Span]:
+        """
+        :return: このスレッドで記録中のスパン (無い場合は None)
+        """
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def span(self, name: str, method: str, path: str) -> Iterator[Span]:
+        """
+        スパンを開始し、 with ブロックを抜けた時に終了して exporter に渡す
+
+        :param name: スパン名
+        :param method: HTTP メソッド
+        :param path: API のパス
+        """
+        stack = self._local.__dict__.setdefault('stack', [])
+        span = Span(name, method, path, parent=stack[-1] if stack else None)
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = repr(e)
+            raise
+        finally:
+            stack.pop()
+            span.duration = time.monotonic() - span._started
+            if self.exporter:
+                self.exporter(span)
+
+    def request(self, transport: Transport, method: str, url: str, **kwargs) -> 'Response':
+        """
+        Transport でリクエストを送り、通信1回分の内訳を記録中のスパンに追加する
+        ヘッダーと本文の受信時間を分けて測るため、 Transport にはストリーミングで送る
+
+        :param transport: Transport
+        :param method: HTTP メソッド
+        :param url: リクエスト先のURL
+        :param kwargs: Transport.request に渡す引数
+        :return: レスポンス
+        """
+        span = self.current()
+        stream = kwargs.pop('stream', False)
+        attempt = {'status_code': None, 'connection_reused': None, 'connect': None, 'tls': None,
+                   'ttfb': None, 'server': None, 'transfer': 0.0, 'error': None}
+        start = time.monotonic()
+        try:
+            response = transport.request(method=method, url=url, stream=True, **kwargs)
+            headers_received = time.monotonic()
+            attempt['status_code'] = response.status_code
+            attempt['ttfb'] = headers_received - start
+            self._inspect_connection(response, attempt)
+            if not stream:
+                response.content
+                attempt['transfer'] = time.monotonic() - headers_received
+        except BaseException as e:
+            attempt['error'] = repr(e)
+            raise
+        finally:
+            if span is not None:
+                span.attempts.append(attempt)
+                span.transfer += attempt['transfer']
+        return response
+
+    @staticmethod
+    def _inspect_connection(response: 'Response', attempt: dict):
+        connection = getattr(getattr(response, 'raw', None), 'connection', None)
+        if connection is None or not hasattr(connection, 'trace_requests'):
+            return
+        attempt['connection_reused'] = connection.trace_requests > 0
+        connection.trace_requests += 1
+        setup = 0.0
+        if not attempt['connection_reused']:
+            attempt['connect'] = connection.trace_connect
+            attempt['tls'] = connection.trace_tls
+            setup = (connection.trace_connect or 0.0) + (connection.trace_tls or 0.0)
+        attempt['server'] = max(attempt['ttfb'] - setup, 0.0)
+
+    def on_response(self, span: Span, response: 'Response', decode: bool = True):
+        """
+        最終的なレスポンスをスパンに記録する
+
+        :param span: スパン
+        :param response: レスポンス
+        :param decode: True の場合、 JSON のレスポンスのデコードにかかった時間を測る
+        """
+        span.status_code = response.status_code
+        span.coalesced = getattr(response, 'coalesced', False)
+        if not decode:
+            return
+        span.response_bytes = len(response.content or b'')
+        if not self.decode_json or 'json' not in response.headers.get('Content-Type', '') or not response.content:
+            return
+        start = time.monotonic()
+        try:
+            response.json()
+        except ValueError:
+            return
+        span.decode = time.monotonic() - start
+
+    def measure_transfer(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        チャンクの受信にかかった時間とバイト数を、記録中のスパンに加算する (書き込みの時間は含まない)
+
+        :param chunks: レスポンスの本文のチャンク
+        :return: 同じチャンクを返すイテレーター
+        """
+        span = self.current()
+        iterator = iter(chunks)
+        while True:
+            start = time.monotonic()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                if span is not None:
+                    span.transfer += time.monotonic() - start
+            if span is not None:
+                span.response_bytes += len(chunk)
+            yield chunk
@@ -0,0 +1,109 @@
+import threading
+from typing import TYPE_CHECKING, Optional
+if TYPE_CHECKING:
+    import requests
+    from requests import Response
+
+
+class Transport:
+    """
+    コネクションプールを持つ HTTP 通信層
+
+    requests.Session を1つ保持し、同じホストへのリクエストでは TCP/TLS のコネクションを使い回す。
+    requests.Session はスレッド間で共有して使用できる。
+    requests の読み込みと Session の生成は、最初のリクエストを送る時まで遅らせる。
+    """
+
+    def __init__(self,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 pool_block: bool = False,
+                 keep_alive: bool = True,
+                 timeout: Optional[float] = None):
+        """
+        :param pool_connections: プールしておくホスト数
+        :param pool_maxsize: 1ホストあたりの最大コネクション数
+        :param pool_block: True の場合、コネクションが pool_maxsize に達すると空きが出るまで待つ
+        :param keep_alive: False の場合、リクエストごとにコネクションを閉じる
+        :param timeout: 1リクエストあたりのタイムアウト(秒) 指定が無い場合は無制限
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self._session = None  # type: Optional[requests.Session]
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> 'requests.Session':
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    def _build_session(self) -> 'requests.Session':
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                              pool_maxsize=self.pool_maxsize,
+                              pool_block=self.pool_block)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> 'Response':
+        """
+        リクエストを送信する
+
+        :param method: HTTP メソッド
+        :param url: リクエスト先のURL
+        :param kwargs: requests.Session.request にそのまま渡す引数
+
+        :return: レスポンス
+        """
+        if self.timeout is not None:
+            kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method=method, url=url, **kwargs)
+
+    def close(self):
+        """
+        プールしているコネクションを全て閉じる
+        """
+        if self._session is not None:
+            self._session.close()
+
+
+_default_transport = None  # type: Optional[Transport]
+_default_transport_lock = threading.Lock()
+
+
+def get_default_transport() -> Transport:
+    """
+    Transport を明示しなかった場合に共有される Transport を返す
+
+    :return: プロセス内で共有される Transport
+    """
+    global _default_transport
+    if _default_transport is None:
+        with _default_transport_lock:
+            if _default_transport is None:
+                _default_transport = Transport()
+    return _default_transport
+
+
+def set_default_transport(transport: Optional[Transport]):
+    """
+    Transport を明示しなかった場合に共有される Transport を差し替える
+    差し替える前に作られた RequestSender は元の Transport を使い続ける
+
+    :param transport: 共有する Transport None の場合は次に使う時に新しく作る
+    """
+    global _default_transport
+    with _default_transport_lock:
+        _default_transport = transport
@@ -0,0 +1,133 @@
+import io
+import os
+import uuid
+from typing import BinaryIO, Callable, Optional, Union
+
+# 送信するデータ: ファイルのPATH、読み込み可能なファイルオブジェクト、 bytes / memoryview
+Source = Union[str, BinaryIO, bytes, bytearray, memoryview]
+
+# 進捗を受け取る関数: (送信済みのバイト数, 全体のバイト数)
+UploadProgress = Callable[[int, int], None]
+
+
+class _FilePart:
+    """
+    multipart の中のファイル部分
+    PATH の場合は最初に読み込む時に開き、読み終わったら閉じる
+    """
+
+    def __init__(self, source: Source):
+        self.source = source
+        self._file = None
+        self._start = 0
+        if isinstance(source, str):
+            self.size = os.path.getsize(source)
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            self.source = memoryview(source).cast('B')
+            self.size = len(self.source)
+        else:
+            self._start = source.tell()
+            source.seek(0, io.SEEK_END)
+            self.size = source.tell() - self._start
+            source.seek(self._start)
+
+    def read(self, offset: int, size: int) -> bytes:
+        if isinstance(self.source, memoryview):
+            return self.source[offset:offset + size].tobytes()
+        if self._file is None:
+            self._file = open(self.source, mode='rb') if isinstance(self.source, str) else self.source
+            self._file.seek(self._start + offset)
+        data = self._file.read(min(size, self.size - offset))
+        if offset + len(data) >= self.size:
+            self.close()
+        return data
+
+    def close(self):
+        if self._file is not None and isinstance(self.source, str):
+            self._file.close()
+        self._file = None
+
+
+class MultipartStream(io.RawIOBase):
+    """
+    ファイルを1つだけ含む multipart/form-data の本文を、読み込まれた分だけ生成するストリーム
+
+    ファイル全体をメモリに読み込まずに送信できる。
+    長さが分かっているため Content-Length を付けて送信でき、再送する時は先頭に戻して読み直せる。
+    """
+
+    def __init__(self,
+                 field_name: str,
+                 filename: str,
+                 source: Source,
+                 progress: Optional[UploadProgress] = None):
+        """
+        :param field_name: フォームのフィールド名
+        :param filename: 送信するファイル名
+        :param source: 送信するデータ (ファイルのPATH、ファイルオブジェクト、 bytes / memoryview)
+        :param progress: 進捗を受け取る関数 (送信済みのバイト数, 全体のバイト数) が渡される
+        """
+        super(MultipartStream, self).__init__()
+        self.boundary = uuid.uuid4().hex
+        self.content_type = 'multipart/form-data; boundary={boundary}'.format(boundary=self.boundary)
+        self.progress = progress
+        header = '--{boundary}\r\nContent-Disposition: form-data; name="{field_name}"; filename="{filename}"\r\n' \
+                 'Content-Type: application/octet-stream\r\n\r\n' \
+            .format(boundary=self.boundary, field_name=field_name, filename=filename.replace('"', '\\"'))
+        footer = '\r\n--{boundary}--\r\n'.format(boundary=self.boundary)
+        self._parts = [memoryview(header.encode('utf-8')), _FilePart(source), memoryview(footer.encode('utf-8'))]
+        self._length = len(self._parts[0]) + self._parts[1].size + len(self._parts[2])
+        self._index = 0
+        self._offset = 0
+        self._position = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """
+        先頭に戻す (再送のため) 先頭以外への移動には対応しない
+        """
+        if offset != 0 or whence != io.SEEK_SET:
+            raise io.UnsupportedOperation('MultipartStream は先頭にのみ戻せます')
+        self._parts[1].close()
+        self._index = 0
+        self._offset = 0
+        self._position = 0
+        return 0
+
+    def readinto(self, buffer) -> int:
+        size = len(buffer)
+        while self._index < len(self._parts):
+            part = self._parts[self._index]
+            if isinstance(part, memoryview):
+                data = part[self._offset:self._offset + size].tobytes()
+                part_size = len(part)
+            else:
+                data = part.read(self._offset, size)
+                part_size = part.size
+            if data:
+                buffer[:len(data)] = data
+                self._offset += len(data)
+                self._position += len(data)
+                if self.progress:
+                    self.progress(self._position, self._length)
+                return len(data)
+            if self._offset < part_size:
+                raise ValueError('送信中にファイルのサイズが変わりました')
+            self._index += 1
+            self._offset = 0
+        return 0
+
+    def close(self):
+        self._parts[1].close()
+        super(MultipartStream, self).close()
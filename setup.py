@@ -12,6 +12,10 @@ setup(
     license='Apache License 2.0',
     python_requires='>=3.5',
     install_requires=['requests==2.22.0'],
+    extras_require={
+        'aio': ['aiohttp>=3.5'],
+        'orjson': ['orjson'],
+    },
     packages=find_packages(),
     classifiers=[
         'License :: OSI Approved :: Apache Software License',
@@ -0,0 +1,233 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+from pybacklogpy.download import iter_bytes
+from tests.test_pagination import cursor_handler, offset_handler
+from tests.utils import make_response
+
+try:
+    from pybacklogpy import aio
+    from pybacklogpy.aio.transport import AsyncTransport, to_query_items
+except ImportError:
+    aio = None
+    AsyncTransport = object
+
+
+class FakeAsyncTransport(AsyncTransport):
+    def __init__(self, handler=None):
+        super(FakeAsyncTransport, self).__init__()
+        self.handler = handler
+        self.calls = []
+
+    async def request(self, method: str, url: str, **kwargs):
+        self.calls.append((method, url, kwargs))
+        await asyncio.sleep(0)
+        if self.handler:
+            return self.handler(method, url, kwargs)
+        return make_response(body={'url': url})
+
+
+class FakeStreamReader:
+    """
+    aiohttp の StreamReader の代わりに、メモリ上のデータをチャンクごとに返す
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def iter_chunked(self, n: int):
+        return FakeChunkIterator(iter_bytes(self.data, n))
+
+
+class FakeChunkIterator:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        await asyncio.sleep(0)
+        try:
+            return next(self.chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeClientResponse:
+    """
+    stream=True の場合に Response.raw に入る aiohttp の ClientResponse の代わり
+    """
+
+    def __init__(self, data: bytes):
+        self.content = FakeStreamReader(data)
+        self.closed = False
+
+    async def read(self) -> bytes:
+        return self.content.data
+
+    def close(self):
+        self.closed = True
+
+
+def stream_response(data: bytes, **kwargs):
+    response = make_response(**kwargs)
+    response._content = False
+    response._content_consumed = False
+    response.raw = FakeClientResponse(data)
+    return response
+
+
+@unittest.skipIf(aio is None, 'aiohttp がインストールされていない')
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.config = BacklogComConfigure(space_key='kitadakyou', api_key='dummy_api_key')
+        self.transport = FakeAsyncTransport()
+        self.config.async_request_sender = aio.AsyncRequestSender(self.config, transport=self.transport)
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_share_request_sender(self):
+        issue = aio.Issue(self.config)
+        wiki = aio.Wiki(self.config)
+        self.assertIs(issue.rs, wiki.rs, msg='同じ設定から作った非同期クラスで AsyncRequestSender が共有されていない')
+
+    def test_concurrent_requests(self):
+        issue = aio.Issue(self.config)
+        issue_comment = aio.IssueComment(self.config)
+
+        async def fetch():
+            return await asyncio.gather(*([issue.get_issue(issue_id_or_key='TEST-{}'.format(i)) for i in range(10)]
+                                          + [issue_comment.get_comment_list(issue_id_or_key='TEST-1')]))
+
+        responses = self.loop.run_until_complete(fetch())
+        self.assertEqual(len(responses), 11)
+        self.assertTrue(all(response.ok for response in responses))
+        self.assertEqual(responses[0].json()['url'], 'https://kitadakyou.backlog.com/api/v2/issues/TEST-0')
+        self.assertEqual(responses[-1].json()['url'], 'https://kitadakyou.backlog.com/api/v2/issues/TEST-1/comments')
+        self.assertEqual(len(self.transport.calls), 11)
+
+    def test_iter_offset_pages(self):
+        self.transport.handler = offset_handler(250)
+        issue = aio.Issue(self.config)
+
+        async def collect(**kwargs):
+            ids = []
+            async for i in issue.iter_issue_list(**kwargs):
+                ids.append(i['id'])
+            return ids
+
+        self.assertEqual(self.loop.run_until_complete(collect(project_id=[1])), list(range(250)))
+        self.assertEqual([call[2]['params']['offset'] for call in self.transport.calls], [0, 100, 200])
+        self.assertEqual(self.transport.calls[0][2]['params']['projectId[]'], [1])
+        self.assertEqual(self.loop.run_until_complete(collect(prefetch=True, offset=100)), list(range(100, 250)))
+
+    def test_export_issue_list(self):
+        def handler(method, url, kwargs):
+            if url.endswith('/count'):
+                return make_response(body={'count': 250})
+            return offset_handler(250)(method, url, kwargs)
+
+        self.transport.handler = handler
+        result = self.loop.run_until_complete(aio.Issue(self.config).export_issue_list(max_workers=2, project_id=[1]))
+        self.assertEqual([i['id'] for i in result.items], list(range(250)))
+        self.assertEqual((result.total, result.duplicate_ids, result.missing_count), (250, [], 0))
+        self.assertEqual(sorted(call[2]['params']['offset'] for call in self.transport.calls[1:]), [0, 100, 200])
+
+    def test_get_issues_by_ids(self):
+        def handler(method, url, kwargs):
+            return make_response(body=[{'id': int(i)} for i in kwargs['params']['id[]'] if int(i) % 10])
+
+        self.transport.handler = handler
+        result = self.loop.run_until_complete(aio.Issue(self.config).get_issues_by_ids(range(1, 251)))
+        self.assertEqual(list(result.items), [i for i in range(1, 251) if i % 10])
+        self.assertEqual(result.missing_ids, list(range(10, 251, 10)))
+        self.assertEqual(len(self.transport.calls), 3)
+
+    def test_iter_id_cursor_pages(self):
+        self.transport.handler = cursor_handler(list(range(1, 51)))
+        wiki = aio.Wiki(self.config)
+
+        async def collect():
+            ids = []
+            async for history in wiki.iter_wiki_page_history(wiki_id=1, count=20, order='asc'):
+                ids.append(history['id'])
+            return ids
+
+        self.assertEqual(self.loop.run_until_complete(collect()), list(range(1, 51)))
+        self.assertEqual([call[2]['params'].get('minId') for call in self.transport.calls], [None, 20, 40])
+
+    def test_session_per_event_loop(self):
+        transport = AsyncTransport()
+        sessions = []
+        for close_loop in (True, False, True):
+            loop = asyncio.new_event_loop()
+            self.addCleanup(loop.close)
+            sessions.append(loop.run_until_complete(transport._get_session()))
+            if close_loop:
+                loop.close()
+        self.loop.run_until_complete(transport.close())
+        self.assertEqual(len(set(map(id, sessions))), 3)
+        self.assertTrue(all(session.closed for session in sessions), msg='前のループのセッションが閉じられていない')
+
+    def test_get_file_streams_chunks(self):
+        content = bytes(range(256)) * 10
+        self.transport.handler = lambda method, url, kwargs: stream_response(
+            content, headers={'Content-Disposition': "attachment;filename*=UTF-8''large.bin",
+                              'Content-Length': str(len(content))})
+        chunks = []
+        threads = set()
+
+        def write(chunk):
+            chunks.append(chunk)
+            threads.add(threading.get_ident())
+
+        filename, response = self.loop.run_until_complete(
+            aio.SharedFile(self.config).get_file(project_id_or_key='TEST', shared_file_id=1, destination=write,
+                                                 chunk_size=1000))
+        self.assertEqual(filename, 'large.bin')
+        self.assertEqual([len(chunk) for chunk in chunks], [1000, 1000, 560], msg='チャンクごとに書き込まれていない')
+        self.assertEqual(b''.join(chunks), content)
+        self.assertNotIn(threading.get_ident(), threads, msg='書き込みがイベントループのスレッドで行われている')
+        self.assertTrue(self.transport.calls[0][2]['stream'])
+        self.assertTrue(response.raw.closed, msg='レスポンスが閉じられていない')
+
+    def test_get_file_to_path(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.transport.handler = lambda method, url, kwargs: stream_response(
+            b'abc', headers={'Content-Disposition': "attachment;filename*=UTF-8''small.txt"})
+        filepath, _ = self.loop.run_until_complete(
+            aio.SharedFile(self.config).get_file(project_id_or_key='TEST', shared_file_id=1, destination=directory))
+        self.assertEqual(os.listdir(directory), ['small.txt'])
+        with open(filepath, mode='rb') as f:
+            self.assertEqual(f.read(), b'abc')
+
+        with self.assertRaises(ValueError):
+            self.loop.run_until_complete(
+                aio.SharedFile(self.config).get_file(project_id_or_key='TEST', shared_file_id=1,
+                                                     destination=directory, sha256='0' * 64))
+        self.assertEqual(os.listdir(directory), [], msg='検査に失敗したファイルが残っている')
+
+    def test_get_file_error(self):
+        self.transport.handler = lambda method, url, kwargs: stream_response(
+            b'{"errors": []}', status_code=404)
+        filepath, response = self.loop.run_until_complete(
+            aio.SharedFile(self.config).get_file(project_id_or_key='TEST', shared_file_id=1))
+        self.assertEqual(filepath, '')
+        self.assertEqual(response.json(), {'errors': []})
+
+    def test_to_query_items(self):
+        items = to_query_items({'id[]': [1, 2], 'attachment': True, 'count': 20})
+        self.assertEqual(items, [('id[]', '1'), ('id[]', '2'), ('attachment', 'true'), ('count', '20')])
+
+
+if __name__ == '__main__':
+    unittest.main()
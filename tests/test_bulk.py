@@ -0,0 +1,110 @@
+import json
+import os
+import tempfile
+import unittest
+
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+from pybacklogpy.bulk import BulkIssueUpdater, diff_issue_changes
+from pybacklogpy.modules import RequestSender
+from tests.utils import FakeTransport, make_response
+
+
+def make_issue(issue_id: int, status_id: int = 1, assignee_id: int = None) -> dict:
+    return {
+        'id': issue_id,
+        'issueKey': 'TEST-{id}'.format(id=issue_id),
+        'status': {'id': status_id, 'name': 'status'},
+        'assignee': {'id': assignee_id} if assignee_id else None,
+        'milestone': [{'id': 20}, {'id': 10}],
+        'dueDate': '2020-01-31T00:00:00Z',
+    }
+
+
+class TestDiff(unittest.TestCase):
+    def test_diff_issue_changes(self):
+        issue = make_issue(1, status_id=2, assignee_id=5)
+        self.assertEqual(diff_issue_changes(issue, {'status_id': 2, 'assignee_id': 6}), {'assignee_id': 6})
+        self.assertEqual(diff_issue_changes(issue, {'milestone_id': [10, 20], 'due_date': '2020-01-31'}), {})
+        self.assertEqual(diff_issue_changes(issue, {'status_id': 2, 'comment': 'done', 'notified_user_id': [5]}),
+                         {'comment': 'done', 'notified_user_id': [5]})
+        self.assertEqual(diff_issue_changes(issue, {'status_id': 3, 'comment': 'done'}),
+                         {'status_id': 3, 'comment': 'done'})
+        self.assertEqual(diff_issue_changes(issue, {'comment': 'done'}), {'comment': 'done'})
+
+
+class TestBulkIssueUpdater(unittest.TestCase):
+    def setUp(self):
+        self.config = BacklogComConfigure(space_key='kitadakyou', api_key='dummy_api_key')
+        self.issues = {i: make_issue(i) for i in range(1, 11)}
+        self.fail_ids = set()
+
+        def handler(method, url, kwargs):
+            path = url.split('/api/v2/')[1]
+            if method == 'GET' and path == 'issues':
+                ids = [int(i) for i in kwargs['params']['id[]']]
+                return make_response(body=[self.issues[i] for i in ids if i in self.issues])
+            issue_id = int(path.split('/')[1].replace('TEST-', ''))
+            if issue_id not in self.issues:
+                return make_response(status_code=404, body={'errors': [{'message': 'No issue.'}]})
+            if method == 'GET':
+                return make_response(body=self.issues[issue_id])
+            if issue_id in self.fail_ids:
+                return make_response(status_code=400, body={'errors': [{'message': 'Invalid.'}]})
+            if 'statusId' in kwargs['data']:
+                self.issues[issue_id]['status'] = {'id': int(kwargs['data']['statusId'])}
+            return make_response(body=self.issues[issue_id])
+
+        self.transport = FakeTransport(handler)
+        self.config.request_sender = RequestSender(self.config, transport=self.transport)
+
+    def patched(self) -> list:
+        return [url.rsplit('/', 1)[1] for method, url, _ in self.transport.calls if method == 'PATCH']
+
+    def test_update(self):
+        self.issues[2]['status'] = {'id': 4}
+        self.fail_ids.add(3)
+        items = [(i, {'status_id': 4}) for i in range(1, 5)] + [(99, {'status_id': 4})]
+        progress = []
+        result = BulkIssueUpdater(self.config, max_workers=3).update(
+            items, progress=lambda done, total: progress.append((done, total)))
+
+        self.assertEqual(result.updated, [1, 4])
+        self.assertEqual(result.unchanged, [2])
+        self.assertEqual([key for key, _ in result.failed], [3, 99])
+        self.assertEqual([item.status for item in result.items],
+                         ['updated', 'unchanged', 'failed', 'updated', 'failed'])
+        self.assertEqual(result.items[0].changes, {'status_id': 4})
+        self.assertEqual(sorted(self.patched()), ['1', '3', '4'])
+        # ID で指定した課題の現在の値は一覧 API でまとめて取得する
+        self.assertEqual(sum(1 for method, url, _ in self.transport.calls if method == 'GET'), 2)
+        self.assertEqual(progress[-1], (5, 5))
+
+    def test_update_by_key(self):
+        result = BulkIssueUpdater(self.config).update([('TEST-1', {'status_id': 1}), ('TEST-2', {'status_id': 3})])
+        self.assertEqual((result.updated, result.unchanged), (['TEST-2'], ['TEST-1']))
+        self.assertEqual(self.patched(), ['TEST-2'])
+
+    def test_without_skip_unchanged(self):
+        result = BulkIssueUpdater(self.config).update([(1, {'status_id': 1})], skip_unchanged=False)
+        self.assertEqual(result.updated, [1])
+        self.assertEqual([method for method, _, _ in self.transport.calls], ['PATCH'])
+
+    def test_resume_from_checkpoint(self):
+        self.fail_ids.add(2)
+        items = [(i, {'status_id': 4}) for i in range(1, 4)]
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'checkpoint.jsonl')
+            first = BulkIssueUpdater(self.config).update(items, checkpoint=checkpoint)
+            self.assertEqual((first.updated, [key for key, _ in first.failed]), ([1, 3], [2]))
+            with open(checkpoint, encoding='utf-8') as f:
+                self.assertEqual(sorted(json.loads(line)['key'] for line in f), [1, 3])
+
+            self.fail_ids.clear()
+            self.transport.calls.clear()
+            second = BulkIssueUpdater(self.config).update(items, checkpoint=checkpoint)
+            self.assertEqual((second.updated, second.skipped), ([2], [1, 3]))
+            self.assertEqual(self.patched(), ['2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
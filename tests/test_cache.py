@@ -0,0 +1,78 @@
+import time
+import unittest
+
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+from pybacklogpy.Category import Category
+from pybacklogpy.Issue import Issue
+from pybacklogpy.Priority import Priority
+from pybacklogpy.Wiki import Wiki
+from pybacklogpy.cache import ResponseCache, ValidatorStore
+from pybacklogpy.modules import RequestSender
+from tests.utils import FakeTransport, make_response
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.config = BacklogComConfigure(space_key='kitadakyou', api_key='dummy_api_key')
+        self.transport = FakeTransport(lambda method, url, kwargs: make_response(body=[{'id': 1}]))
+        self.cache = ResponseCache(max_entries=2)
+        self.config.request_sender = RequestSender(self.config, transport=self.transport, cache=self.cache)
+
+    def test_cache_reference_data(self):
+        priority = Priority(self.config)
+        first = priority.get_priority_list()
+        second = priority.get_priority_list()
+        self.assertEqual(len(self.transport.calls), 1, msg='優先度一覧がキャッシュされていない')
+        self.assertEqual(second.json(), first.json())
+        self.assertTrue(second.from_cache)
+
+    def test_not_cached_path(self):
+        issue = Issue(self.config)
+        issue.get_issue(issue_id_or_key='TEST-1')
+        issue.get_issue(issue_id_or_key='TEST-1')
+        self.assertEqual(len(self.transport.calls), 2, msg='キャッシュ対象外の API がキャッシュされている')
+
+    def test_invalidate_on_update(self):
+        category = Category(self.config)
+        category.get_category_list(project_id_or_key='TEST')
+        category.update_category(project_id_or_key='TEST', category_id=1, name='renamed')
+        category.get_category_list(project_id_or_key='TEST')
+        self.assertEqual([call[0] for call in self.transport.calls], ['GET', 'PATCH', 'GET'],
+                         msg='カテゴリーの更新後にキャッシュが捨てられていない')
+
+    def test_ttl_and_lru(self):
+        cache = ResponseCache(ttls={r'priorities': 0.05, r'users': 60, r'resolutions': 60}, max_entries=2)
+        response = make_response(body=[])
+        cache.set(cache.key('api/', 'priorities', {}), response, cache.ttl('priorities'))
+        time.sleep(0.06)
+        self.assertIsNone(cache.get(cache.key('api/', 'priorities', {})), msg='期限切れのキャッシュが返されている')
+
+        cache.set(cache.key('api/', 'users', {}), response, 60)
+        cache.set(cache.key('api/', 'resolutions', {}), response, 60)
+        cache.get(cache.key('api/', 'users', {}))
+        cache.set(cache.key('api/', 'priorities', {}), response, 60)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(cache.key('api/', 'resolutions', {})), msg='最も古いキャッシュが捨てられていない')
+        self.assertIsNotNone(cache.get(cache.key('api/', 'users', {})))
+
+    def test_conditional_request(self):
+        def handler(method, url, kwargs):
+            if (kwargs.get('headers') or {}).get('If-None-Match') == '"v1"':
+                return make_response(status_code=304, headers={'ETag': '"v1"'})
+            return make_response(body={'id': 1, 'content': 'wiki'}, headers={'ETag': '"v1"'})
+
+        transport = FakeTransport(handler)
+        self.config.request_sender = RequestSender(self.config, transport=transport,
+                                                   validator_store=ValidatorStore())
+        wiki = Wiki(self.config)
+        first = wiki.get_wiki_page(wiki_id=1)
+        second = wiki.get_wiki_page(wiki_id=1)
+        self.assertEqual(len(transport.calls), 2)
+        self.assertEqual(transport.calls[1][2]['headers'], {'If-None-Match': '"v1"'})
+        self.assertEqual(second.status_code, 200, msg='304 の場合に保持していたレスポンスが返されていない')
+        self.assertEqual(second.json(), first.json())
+        self.assertTrue(second.from_cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
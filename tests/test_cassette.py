@@ -0,0 +1,91 @@
+import os
+import tempfile
+import time
+import unittest
+
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+from pybacklogpy.Issue import Issue
+from pybacklogpy.SharedFile import SharedFile
+from pybacklogpy.cassette import Cassette, RecordingTransport, ReplayTransport, use_cassette
+from pybacklogpy.modules import RequestSender
+from pybacklogpy.transport import Transport, get_default_transport, set_default_transport
+from tests.utils import FakeTransport, make_response
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cassette = Cassette(os.path.join(self.directory.name, 'cassette.jsonl'))
+        self.config = BacklogComConfigure(space_key='kitadakyou', api_key='secret_api_key')
+        self.count = 0
+
+        def handler(method, url, kwargs):
+            self.count += 1
+            if '/files/' in url:
+                return make_response(body=b'\x89PNG\x00\xff',
+                                     headers={'Content-Disposition': 'attachment; filename=a.png'})
+            return make_response(body={'id': self.count, 'method': method}, headers={'Set-Cookie': 'session=secret'})
+
+        self.config.request_sender = RequestSender(self.config,
+                                                   transport=RecordingTransport(self.cassette, FakeTransport(handler)))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def replay(self, **kwargs) -> BacklogComConfigure:
+        config = BacklogComConfigure(space_key='other', api_key='other_api_key')
+        config.request_sender = RequestSender(config, transport=ReplayTransport(self.cassette, **kwargs))
+        return config
+
+    def test_record_and_replay(self):
+        issue = Issue(self.config)
+        issue.get_issue(issue_id_or_key='TEST-1')
+        issue.update_issue(issue_id_or_key='TEST-1', summary='変更')
+        issue.get_issue(issue_id_or_key='TEST-1')
+        with open(self.cassette.filepath, encoding='utf-8') as f:
+            recorded = f.read()
+        self.assertNotIn('secret_api_key', recorded, msg='API キーが記録されている')
+        self.assertNotIn('session=secret', recorded, msg='Cookie が記録されている')
+
+        replayed = Issue(self.replay())
+        self.assertEqual(replayed.get_issue(issue_id_or_key='TEST-1').json()['id'], 1)
+        self.assertEqual(replayed.update_issue(issue_id_or_key='TEST-1', summary='変更').json()['id'], 2)
+        self.assertEqual(replayed.get_issue(issue_id_or_key='TEST-1').json()['id'], 3)
+        self.assertEqual(replayed.get_issue(issue_id_or_key='TEST-1').json()['id'], 3, msg='最後の記録が繰り返されない')
+        with self.assertRaises(ValueError):
+            replayed.get_issue(issue_id_or_key='TEST-2')
+
+    def test_match_data(self):
+        Issue(self.config).update_issue(issue_id_or_key='TEST-1', summary='2019-01-01 10:00')
+        with self.assertRaises(ValueError):
+            Issue(self.replay()).update_issue(issue_id_or_key='TEST-1', summary='2019-01-02 10:00')
+        response = Issue(self.replay(match_data=False)).update_issue(issue_id_or_key='TEST-1',
+                                                                     summary='2019-01-02 10:00')
+        self.assertEqual(response.json()['id'], 1)
+
+    def test_replay_binary_file(self):
+        SharedFile(self.config).get_file(project_id_or_key='TEST', shared_file_id=1,
+                                         destination=self.directory.name + '/recorded.png')
+        filepath, _ = SharedFile(self.replay()).get_file(project_id_or_key='TEST', shared_file_id=1,
+                                                         destination=self.directory.name + '/replayed.png')
+        with open(filepath, mode='rb') as f:
+            self.assertEqual(f.read(), b'\x89PNG\x00\xff')
+
+    def test_use_cassette_record_twice(self):
+        self.addCleanup(set_default_transport, get_default_transport())
+        first = use_cassette(self.cassette.filepath, mode='record')
+        self.addCleanup(first.transport.close)
+        second = use_cassette(self.cassette.filepath, mode='record')
+        self.addCleanup(second.transport.close)
+        self.assertIs(get_default_transport(), second)
+        self.assertIs(type(second.transport), Transport, msg='前に設定したカセットの Transport を包んでいる')
+
+    def test_latency(self):
+        Issue(self.config).get_issue(issue_id_or_key='TEST-1')
+        start = time.monotonic()
+        Issue(self.replay(latency=0.05)).get_issue(issue_id_or_key='TEST-1')
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
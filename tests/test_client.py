@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pybacklogpy import BacklogConfigure as backlog_configure
+from pybacklogpy.BacklogClient import BacklogClient
+from pybacklogpy.BacklogConfigure import BacklogComConfigure, BacklogConfigure, get_default_configure
+from pybacklogpy.Issue import Issue, IssueComment
+from pybacklogpy.Wiki import Wiki
+from pybacklogpy.modules import get_request_sender
+from tests.utils import FakeTransport, make_response
+
+
+class TestConfigure(unittest.TestCase):
+    def test_from_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'secrets')
+            with open(path, 'w') as f:
+                f.write('[backlog]\nHost = example.backlog.com\nApiKey = dummy_api_key\n')
+            config = BacklogConfigure.from_file(path)
+        self.assertEqual(config.api_url, 'example.backlog.com')
+        self.assertEqual(config.api_key, 'dummy_api_key')
+
+    def test_from_file_missing(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(ValueError):
+                BacklogConfigure.from_file(os.path.join(directory, 'secrets'))
+
+    def test_from_env(self):
+        with mock.patch.dict(os.environ, {'BACKLOG_HOST': 'example.backlog.jp', 'BACKLOG_API_KEY': 'env_key'}):
+            config = BacklogConfigure.from_env()
+        self.assertEqual(config.api_url, 'example.backlog.jp')
+        self.assertEqual(config.api_key, 'env_key')
+        with mock.patch.dict(os.environ, {'BACKLOG_HOST': ''}):
+            self.assertIsNone(BacklogConfigure.from_env())
+
+    def test_default_configure_is_loaded_once(self):
+        environ = {'BACKLOG_HOST': 'example.backlog.com', 'BACKLOG_API_KEY': 'env_key'}
+        with mock.patch.dict(os.environ, environ), \
+                mock.patch.object(backlog_configure, '_default_configure', None), \
+                mock.patch.object(BacklogConfigure, 'from_env', wraps=BacklogConfigure.from_env) as from_env:
+            config = get_default_configure()
+            self.assertIs(get_default_configure(), config)
+            self.assertIs(get_request_sender(), get_request_sender())
+            self.assertEqual(Issue().rs.api_url, 'https://example.backlog.com/api/v2/')
+            self.assertEqual(from_env.call_count, 1)
+
+
+class TestBacklogClient(unittest.TestCase):
+    def setUp(self):
+        self.config = BacklogComConfigure(space_key='example', api_key='dummy_api_key')
+
+    def test_lazy_resources(self):
+        client = BacklogClient(self.config)
+        self.assertNotIn('issues', client.__dict__)
+        self.assertIsInstance(client.issues, Issue)
+        self.assertIsInstance(client.issue_comments, IssueComment)
+        self.assertIsInstance(client.wiki, Wiki)
+        self.assertIs(client.issues, client.issues)
+        self.assertIs(client.issues.rs, client.wiki.rs)
+        with self.assertRaises(AttributeError):
+            _ = client.unknown
+        self.assertIn('issues', dir(client))
+
+    def test_transport(self):
+        transport = FakeTransport(lambda method, url, kwargs: make_response(body={'id': 1}))
+        client = BacklogClient(self.config, transport=transport)
+        self.assertEqual(client.users.get_own_user().json(), {'id': 1})
+        self.assertEqual(client.projects.get_project_list().json(), {'id': 1})
+        self.assertEqual(len(transport.calls), 2)
+        # 渡した設定の RequestSender は置き換えない
+        self.assertIsNot(get_request_sender(self.config), client.users.rs)
+
+    def test_default_configure(self):
+        environ = {'BACKLOG_HOST': 'example.backlog.com', 'BACKLOG_API_KEY': 'env_key'}
+        with mock.patch.dict(os.environ, environ), \
+                mock.patch.object(backlog_configure, '_default_configure', None):
+            client = BacklogClient()
+            self.assertEqual(client.issues.rs.api_key, 'env_key')
+            self.assertIs(BacklogClient().config, client.config)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import unittest
+
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+from pybacklogpy.Issue import Issue
+from pybacklogpy.Project import Project
+from pybacklogpy.coalesce import RequestCoalescer
+from pybacklogpy.modules import RequestSender
+from tests.utils import FakeTransport, make_response
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.config = BacklogComConfigure(space_key='kitadakyou', api_key='dummy_api_key')
+        self.coalescer = RequestCoalescer()
+        self.release = threading.Event()
+
+        def handler(method, url, kwargs):
+            self.release.wait(5)
+            if url.endswith('/missing'):
+                return make_response(status_code=404, body={'errors': []})
+            return make_response(body={'id': 1, 'url': url})
+
+        self.transport = FakeTransport(handler)
+        self.config.request_sender = RequestSender(self.config, transport=self.transport, coalescer=self.coalescer)
+
+    def run_concurrently(self, fn, count: int, coalesced: int) -> list:
+        """
+        count 個のスレッドで fn を同時に呼び、 coalesced 件がまとめられてから通信を完了させる
+        """
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(fn, i) for i in range(count)]
+            deadline = time.monotonic() + 5
+            while self.coalescer.coalesced < coalesced and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.release.set()
+            return [future.result() for future in futures]
+
+    def test_coalesce_identical_requests(self):
+        project = Project(self.config)
+        responses = self.run_concurrently(lambda _: project.get_project(project_id_or_key='TEST'), 8, 7)
+        self.assertEqual(len(self.transport.calls), 1, msg='同じ GET リクエストがまとめられていない')
+        self.assertTrue(all(r.json()['id'] == 1 for r in responses))
+        self.assertEqual(sum(1 for r in responses if getattr(r, 'coalesced', False)), 7)
+        responses[0].json()['id'] = 2
+        self.assertTrue(all(r.json()['id'] == 1 for r in responses[1:]), msg='デコード結果が複製の間で共有されている')
+        self.assertEqual(self.coalescer.in_flight(), 0)
+
+    def test_different_requests_are_sent(self):
+        issue = Issue(self.config)
+        self.release.set()
+        self.run_concurrently(lambda i: issue.get_issue(issue_id_or_key='TEST-{i}'.format(i=i % 2)), 4, 0)
+        urls = sorted(set(url for _, url, _ in self.transport.calls))
+        self.assertEqual(len(urls), 2)
+
+    def test_error_response_is_shared(self):
+        project = Project(self.config)
+        responses = self.run_concurrently(lambda _: project.get_project(project_id_or_key='missing'), 4, 3)
+        self.assertEqual(len(self.transport.calls), 1)
+        self.assertTrue(all(r.status_code == 404 for r in responses))
+
+    def test_exception_is_shared(self):
+        calls = []
+
+        def send():
+            calls.append(1)
+            self.release.wait(5)
+            raise ConnectionError('boom')
+
+        def fn(_):
+            try:
+                self.coalescer.do(('key',), send)
+            except ConnectionError as e:
+                return e
+
+        errors = self.run_concurrently(fn, 4, 3)
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(isinstance(e, ConnectionError) for e in errors))
+
+    def test_not_coalesced_after_completion(self):
+        project = Project(self.config)
+        self.release.set()
+        project.get_project(project_id_or_key='TEST')
+        project.get_project(project_id_or_key='TEST')
+        self.assertEqual(len(self.transport.calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+from pybacklogpy.Issue import IssueAttachment
+from pybacklogpy.SharedFile import SharedFile
+from pybacklogpy.User import User
+from pybacklogpy.download import get_file_name, iter_bytes
+from pybacklogpy.modules import RequestSender
+from tests.utils import FakeTransport, make_response
+
+CONTENT = b'0123456789' * 1000
+
+
+def file_handler(method, url, kwargs):
+    return make_response(body=CONTENT,
+                         headers={'Content-Disposition': "attachment;filename*=UTF-8''test.txt",
+                                  'Content-Length': str(len(CONTENT))},
+                         url=url)
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.config = BacklogComConfigure(space_key='kitadakyou', api_key='dummy_api_key')
+        self.transport = FakeTransport(file_handler)
+        self.config.request_sender = RequestSender(self.config, transport=self.transport)
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_get_file_name(self):
+        self.assertEqual(get_file_name("attachment;filename*=UTF-8''test.txt"), 'test.txt')
+
+    def test_download_to_directory(self):
+        progress = []
+        filepath, response = IssueAttachment(self.config).get_issue_attachment(
+            issue_id_or_key='TEST-1', attachment_id=1, destination=self.directory, chunk_size=4096,
+            progress=lambda downloaded, total: progress.append((downloaded, total)))
+        self.assertEqual(filepath, os.path.join(self.directory, 'test.txt'))
+        with open(filepath, mode='rb') as f:
+            self.assertEqual(f.read(), CONTENT, msg='ダウンロードしたファイルの内容が違う')
+        self.assertFalse(os.path.exists(filepath + '.part'), msg='書き込み中のファイルが残っている')
+        self.assertTrue(self.transport.calls[0][2]['stream'], msg='ストリーミングで受信していない')
+        self.assertEqual(progress, [(4096, 10000), (8192, 10000), (10000, 10000)],
+                         msg='進捗が正しく通知されていない')
+
+    def test_download_to_path(self):
+        destination = os.path.join(self.directory, 'renamed.txt')
+        filepath, _ = SharedFile(self.config).get_file(project_id_or_key='TEST', shared_file_id=1,
+                                                       destination=destination)
+        self.assertEqual(filepath, destination)
+        self.assertEqual(os.path.getsize(destination), len(CONTENT))
+
+    def test_download_to_file_object_and_callback(self):
+        buffer = io.BytesIO()
+        IssueAttachment(self.config).get_issue_attachment(issue_id_or_key='TEST-1', attachment_id=1, destination=buffer)
+        self.assertEqual(buffer.getvalue(), CONTENT)
+
+        chunks = []
+        filepath, _ = IssueAttachment(self.config).get_issue_attachment(
+            issue_id_or_key='TEST-1', attachment_id=1, destination=chunks.append, chunk_size=1000)
+        self.assertEqual(filepath, 'test.txt')
+        self.assertEqual(len(chunks), 10)
+        self.assertEqual(b''.join(chunks), CONTENT)
+
+    def test_file_name_from_url(self):
+        self.transport.handler = lambda method, url, kwargs: make_response(body=b'icon', url=url)
+        filepath, _ = User(self.config).get_user_icon(user_id=1, destination=self.directory)
+        self.assertEqual(filepath, os.path.join(self.directory, 'icon'),
+                         msg='Content-Disposition が無い場合に URL からファイル名を決めていない')
+
+    def test_download_error(self):
+        self.transport.handler = lambda method, url, kwargs: make_response(status_code=404, body={'errors': []})
+        filepath, response = IssueAttachment(self.config).get_issue_attachment(
+            issue_id_or_key='TEST-1', attachment_id=1, destination=self.directory)
+        self.assertEqual(filepath, '')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(os.listdir(self.directory), [], msg='エラーの場合にファイルが作られている')
+
+    def test_iter_bytes(self):
+        self.assertEqual(list(iter_bytes(b'abcde', 2)), [b'ab', b'cd', b'e'])
+
+
+if __name__ == '__main__':
+    unittest.main()
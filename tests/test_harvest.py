@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+from pybacklogpy.harvest import AttachmentHarvester
+from pybacklogpy.modules import RequestSender
+from tests.utils import FakeTransport, make_response
+
+API_URL = 'https://kitadakyou.backlog.com/api/v2/'
+
+FILES = {
+    1: b'issue attachment',
+    2: b'same content',
+    3: b'same content',
+    4: b'pull request attachment',
+}
+
+
+def attachment(attachment_id: int) -> dict:
+    return {'id': attachment_id, 'name': 'file{0}.txt'.format(attachment_id), 'size': len(FILES[attachment_id])}
+
+
+def project_handler(method, url, kwargs):
+    path = url[len(API_URL):].rstrip('/')
+    if path == 'projects/TEST':
+        return make_response(body={'id': 10, 'projectKey': 'TEST'})
+    if path == 'issues':
+        offset = int(kwargs['params'].get('offset', 0))
+        issues = [{'id': 100, 'issueKey': 'TEST-1', 'attachments': [attachment(1)]}]
+        return make_response(body=issues[offset:])
+    if path == 'wikis':
+        return make_response(body=[{'id': 200}])
+    if path == 'wikis/200/attachments':
+        return make_response(body=[attachment(2), attachment(3)])
+    if path == 'projects/TEST/git/repositories':
+        return make_response(body=[{'id': 300, 'name': 'repo'}])
+    if path == 'projects/TEST/git/repositories/repo/pullRequests':
+        offset = int(kwargs['params'].get('offset', 0))
+        return make_response(body=[{'id': 400, 'number': 1, 'attachments': [attachment(4)]}][offset:])
+    if '/attachments/' in path:
+        attachment_id = int(path.split('/')[-1])
+        return make_response(body=FILES[attachment_id], headers={
+            'Content-Disposition': "attachment;filename*=UTF-8''file{0}.txt".format(attachment_id)})
+    return make_response(status_code=404, body={'errors': []})
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.config = BacklogComConfigure(space_key='kitadakyou', api_key='dummy_api_key')
+        self.transport = FakeTransport(project_handler)
+        self.config.request_sender = RequestSender(self.config, transport=self.transport)
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def downloaded_ids(self):
+        return sorted(int(call[1].split('/')[-1]) for call in self.transport.calls if '/attachments/' in call[1])
+
+    def test_harvest(self):
+        harvester = AttachmentHarvester(self.config, max_workers=2)
+        result = harvester.harvest(project_id_or_key='TEST', directory=self.directory)
+
+        self.assertEqual(result.failed, [])
+        self.assertEqual(self.downloaded_ids(), [1, 2, 3, 4])
+        issue_file = os.path.join(self.directory, 'issues', 'TEST-1', '1_file1.txt')
+        pull_request_file = os.path.join(self.directory, 'pull_requests', 'repo', '1', '4_file4.txt')
+        with open(issue_file, mode='rb') as f:
+            self.assertEqual(f.read(), FILES[1])
+        with open(pull_request_file, mode='rb') as f:
+            self.assertEqual(f.read(), FILES[4])
+
+        self.assertEqual(len(result.duplicates), 1, msg='内容が同じファイルが検出されていない')
+        duplicate, original = result.duplicates[0]
+        self.assertTrue(os.path.samefile(duplicate, original), msg='内容が同じファイルがハードリンクになっていない')
+
+    def test_skip_existing_files(self):
+        AttachmentHarvester(self.config).harvest(project_id_or_key='TEST', directory=self.directory)
+        self.transport.calls = []
+
+        result = AttachmentHarvester(self.config).harvest(project_id_or_key='TEST', directory=self.directory)
+        self.assertEqual(self.downloaded_ids(), [], msg='保存済みのファイルをダウンロードし直している')
+        self.assertEqual(len(result.skipped), 4)
+
+    def test_failed_download(self):
+        harvester = AttachmentHarvester(self.config)
+        with self.assertRaises(Exception, msg='一覧の取得に失敗した場合に例外が送出されていない'):
+            harvester.harvest(project_id_or_key='MISSING', directory=self.directory)
+
+        items = list(harvester.iter_wiki_attachments('TEST', self.directory))
+        broken = items[0]._replace(download=lambda destination: ('', make_response(status_code=404)))
+        result = harvester.download_all(iter([broken]))
+        self.assertEqual(result.failed[0][0], broken.filepath)
+        self.assertEqual(result.failed[0][1].status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import pkgutil
+import subprocess
+import sys
+import unittest
+
+import pybacklogpy
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+
+
+def run_python(code: str) -> str:
+    """
+    新しい Python プロセスで code を実行し、標準出力を返す
+    """
+    return subprocess.check_output([sys.executable, '-c', code]).decode('utf-8').strip()
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_requests_is_not_imported(self):
+        for module in ('pybacklogpy', 'pybacklogpy.Issue', 'pybacklogpy.BacklogClient', 'pybacklogpy.harvest'):
+            output = run_python('import sys, {module}; print("requests" in sys.modules)'.format(module=module))
+            self.assertEqual(output, 'False', msg=module)
+
+    def test_submodules_are_not_imported(self):
+        output = run_python('import sys, pybacklogpy; print("pybacklogpy.Issue" in sys.modules)')
+        self.assertEqual(output, 'False')
+
+    def test_all_submodules_are_listed(self):
+        modules = set(name for _, name, _ in pkgutil.iter_modules(pybacklogpy.__path__))
+        self.assertEqual(modules, set(pybacklogpy._SUBMODULES))
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'モジュールの __getattr__ は Python 3.7 以降')
+    def test_lazy_attributes(self):
+        from pybacklogpy.Issue import Issue
+        self.assertIs(pybacklogpy.Issue.Issue, Issue)
+        self.assertIs(pybacklogpy.BacklogComConfigure, BacklogComConfigure)
+        self.assertIn('Wiki', dir(pybacklogpy))
+        with self.assertRaises(AttributeError):
+            _ = pybacklogpy.unknown
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+import unittest
+
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+from pybacklogpy.importer import IssueImporter, ProjectIndex, read_rows
+from pybacklogpy.modules import RequestSender
+from tests.utils import FakeTransport, make_response
+
+REFERENCE_DATA = {
+    'projects/TEST': {'id': 1, 'projectKey': 'TEST'},
+    'projects/TEST/issueTypes': [{'id': 11, 'name': 'バグ'}, {'id': 12, 'name': 'タスク'}],
+    'priorities': [{'id': 2, 'name': '高'}, {'id': 3, 'name': '中'}],
+    'projects/TEST/users': [{'id': 21, 'userId': 'alice', 'name': 'Alice', 'mailAddress': 'alice@example.com'},
+                            {'id': 22, 'userId': 'john', 'name': 'Doe, John'}],
+    'projects/TEST/categories': [{'id': 31, 'name': 'UI'}, {'id': 32, 'name': 'API'}],
+    'projects/TEST/versions': [{'id': 41, 'name': 'v1.0'}],
+    'projects/TEST/customFields': [
+        {'id': 51, 'typeId': 1, 'name': '顧客名'},
+        {'id': 52, 'typeId': 6, 'name': 'OS', 'items': [{'id': 1, 'name': 'Windows'}, {'id': 2, 'name': 'Linux'}]},
+        {'id': 53, 'typeId': 5, 'name': '区分', 'items': [{'id': 3, 'name': 'A, B'}, {'id': 4, 'name': 'C'}]},
+    ],
+}
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.config = BacklogComConfigure(space_key='kitadakyou', api_key='dummy_api_key')
+        self.created = []
+        self.fail_summaries = set()
+
+        def handler(method, url, kwargs):
+            path = url.split('/api/v2/')[1]
+            if method == 'GET' and path in REFERENCE_DATA:
+                return make_response(body=REFERENCE_DATA[path])
+            if method == 'GET' and path == 'issues':
+                return make_response(body=[i for i in self.created if kwargs['params']['keyword'] in i['summary']])
+            if method == 'POST' and path == 'issues':
+                if kwargs['data']['summary'] in self.fail_summaries:
+                    return make_response(status_code=400, body={'errors': [{'message': 'Invalid.'}]})
+                issue = dict(id=100 + len(self.created), issueKey='TEST-{n}'.format(n=len(self.created) + 1),
+                             summary=kwargs['data']['summary'], created='2099-01-01T00:00:00Z', data=kwargs['data'])
+                self.created.append(issue)
+                return make_response(status_code=201, body=issue)
+            return make_response(status_code=404, body={'errors': []})
+
+        self.transport = FakeTransport(handler)
+        self.config.request_sender = RequestSender(self.config, transport=self.transport)
+        self.directory = tempfile.TemporaryDirectory()
+        self.ledger = os.path.join(self.directory.name, 'ledger.jsonl')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def posts(self) -> list:
+        return [kwargs['data'] for method, _, kwargs in self.transport.calls if method == 'POST']
+
+    def test_index(self):
+        index = ProjectIndex.load('TEST', config=self.config)
+        kwargs = index.to_add_issue_kwargs({
+            'summary': 'ログインできない',
+            'issue_type': 'バグ',
+            'priority': '高',
+            'assignee': 'alice@example.com',
+            'category': 'UI, API',
+            'milestone': ['v1.0'],
+            'custom_field:顧客名': 'A社, B社',
+            'custom_field:OS': 'Windows,Linux',
+            'description': '',
+        })
+        self.assertEqual(kwargs, {
+            'project_id': 1, 'summary': 'ログインできない', 'issue_type_id': 11, 'priority_id': 2, 'assignee_id': 21,
+            'category_id': [31, 32], 'milestone_id': [41], 'customField_51': 'A社, B社', 'customField_52': [1, 2],
+        })
+        kwargs = index.to_add_issue_kwargs({'summary': 'x', 'issue_type': 'バグ', 'priority': '高',
+                                            'assignee': 'Doe, John', 'custom_field:区分': 'A, B'})
+        self.assertEqual((kwargs['assignee_id'], kwargs['customField_53']), (22, 3))
+        with self.assertRaises(ValueError):
+            index.to_add_issue_kwargs({'summary': 'x', 'issue_type': '不明', 'priority': '高'})
+        with self.assertRaises(ValueError):
+            index.to_add_issue_kwargs({'summary': 'x', 'issue_type': 'バグ'})
+
+    def test_import_csv(self):
+        filepath = os.path.join(self.directory.name, 'issues.csv')
+        with open(filepath, mode='w', encoding='utf-8', newline='') as f:
+            f.write('id,summary,issue_type,priority,assignee\n'
+                    'A-1,最初の課題,バグ,高,alice\n'
+                    'A-2,次の課題,,,\n'
+                    'A-3,壊れた課題,不明な種別,高,\n')
+        progress = []
+        result = IssueImporter(self.config, max_workers=2).import_file(
+            filepath, 'TEST', ledger=self.ledger, defaults={'issue_type': 'タスク', 'priority': '中'},
+            progress=progress.append)
+        self.assertEqual(sorted(key for key, _ in result.created), ['A-1', 'A-2'])
+        self.assertEqual([key for key, _ in result.failed], ['A-3'])
+        data = {d['summary']: d for d in self.posts()}
+        self.assertEqual((data['次の課題']['issueTypeId'], data['次の課題']['priorityId']), (12, 3))
+        self.assertEqual(data['最初の課題']['assigneeId'], 21)
+        self.assertEqual(max(progress), 3)
+
+    def test_resume_without_duplicates(self):
+        rows = [{'id': str(i), 'summary': '課題 {i}'.format(i=i), 'issue_type': 'バグ', 'priority': '高'}
+                for i in range(1, 5)]
+        self.fail_summaries.add('課題 4')
+        # 1 は登録済み、 2 は登録中に中断され実際には登録されていた、 3 は登録中に中断され登録されていなかった状態
+        IssueImporter(self.config, max_workers=1).import_rows(rows[:2], 'TEST', ledger=self.ledger)
+        with open(self.ledger, encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f]
+        with open(self.ledger, mode='w', encoding='utf-8') as f:
+            for entry in entries:
+                if not (entry['key'] == '2' and entry['status'] == 'done'):
+                    f.write(json.dumps(entry) + '\n')
+            f.write(json.dumps({'key': '3', 'status': 'started', 'started': '2098-12-31T23:59:00Z'}) + '\n')
+        self.transport.calls.clear()
+
+        result = IssueImporter(self.config).import_rows(rows, 'TEST', ledger=self.ledger)
+        self.assertEqual(result.skipped, ['1'])
+        self.assertEqual(result.recovered, [('2', 'TEST-2')])
+        self.assertEqual(result.created, [('3', 'TEST-3')])
+        self.assertEqual([key for key, _ in result.failed], ['4'])
+        self.assertEqual(sorted(d['summary'] for d in self.posts()), ['課題 3', '課題 4'])
+        self.assertEqual(len(self.created), 3)
+
+        self.fail_summaries.clear()
+        self.transport.calls.clear()
+        result = IssueImporter(self.config).import_rows(rows, 'TEST', ledger=self.ledger)
+        self.assertEqual(sorted(result.skipped), ['1', '2', '3'])
+        self.assertEqual(result.created, [('4', 'TEST-4')])
+
+    def test_read_rows(self):
+        filepath = os.path.join(self.directory.name, 'issues.jsonl')
+        with open(filepath, mode='w', encoding='utf-8') as f:
+            f.write('{"summary": "a", "category": ["UI"]}\n\n{"summary": "b"}\n')
+        self.assertEqual(list(read_rows(filepath)), [{'summary': 'a', 'category': ['UI']}, {'summary': 'b'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+
+from requests.exceptions import ConnectionError
+
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+from pybacklogpy.Issue import Issue, IssueComment
+from pybacklogpy.metrics import RequestMetrics, endpoint_template
+from pybacklogpy.modules import RequestSender
+from pybacklogpy.retry import RetryPolicy
+from tests.utils import FakeTransport, make_response
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.config = BacklogComConfigure(space_key='kitadakyou', api_key='dummy_api_key')
+        self.metrics = RequestMetrics(buckets=(0.1, 1.0))
+        self.responses = []
+
+        def handler(method, url, kwargs):
+            response = self.responses.pop(0) if self.responses else make_response(body={'id': 1})
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        self.transport = FakeTransport(handler)
+        self.config.request_sender = RequestSender(self.config,
+                                                   transport=self.transport,
+                                                   retry_policy=RetryPolicy(max_retries=1, backoff_factor=0),
+                                                   metrics=self.metrics)
+
+    def test_endpoint_template(self):
+        self.assertEqual(endpoint_template('issues/TEST-1/comments/123'), 'issues/{id}/comments/{id}')
+        self.assertEqual(endpoint_template('projects/TEST/statuses'), 'projects/{id}/statuses')
+        self.assertEqual(endpoint_template('space/diskUsage'), 'space/diskUsage')
+        self.assertEqual(endpoint_template('projects/TEST/files/metadata/a/b/c'), 'projects/{id}/files/metadata/{id}')
+
+    def test_record_requests(self):
+        issue = Issue(self.config)
+        self.responses = [make_response(body={'id': 1}), make_response(status_code=404, body={'errors': []})]
+        issue.get_issue(issue_id_or_key='TEST-1')
+        issue.get_issue(issue_id_or_key='TEST-2')
+        IssueComment(self.config).get_comment_list(issue_id_or_key='TEST-1')
+
+        stats = self.metrics.snapshot()
+        issue_stats = stats[('GET', 'issues/{id}')]
+        self.assertEqual(issue_stats.count, 2)
+        self.assertEqual(issue_stats.errors, 1)
+        self.assertEqual(issue_stats.error_rate, 0.5)
+        self.assertEqual(issue_stats.status_codes, {200: 1, 404: 1})
+        self.assertEqual(issue_stats.response_bytes, len(b'{"id": 1}') + len(b'{"errors": []}'))
+        self.assertEqual(sum(issue_stats.latency_buckets), 2)
+        self.assertEqual(stats[('GET', 'issues/{id}/comments')].count, 1)
+
+    def test_record_retries_and_exceptions(self):
+        issue = Issue(self.config)
+        self.responses = [make_response(status_code=503), make_response(body={'id': 1})]
+        issue.get_issue(issue_id_or_key='TEST-1')
+        self.responses = [ConnectionError(), ConnectionError()]
+        with self.assertRaises(ConnectionError):
+            issue.get_issue(issue_id_or_key='TEST-1')
+
+        issue_stats = self.metrics.snapshot()[('GET', 'issues/{id}')]
+        self.assertEqual(issue_stats.count, 2)
+        self.assertEqual(issue_stats.retries, 2)
+        self.assertEqual(issue_stats.errors, 1)
+        self.assertEqual(issue_stats.status_codes, {200: 1, 'ConnectionError': 1})
+
+    def test_callback(self):
+        records = []
+        self.metrics.add_callback(records.append)
+        Issue(self.config).get_issue(issue_id_or_key='TEST-1')
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].endpoint, 'issues/{id}')
+        self.assertEqual(records[0].path, 'issues/TEST-1')
+        self.assertEqual(records[0].status_code, 200)
+
+    def test_prometheus(self):
+        Issue(self.config).get_issue(issue_id_or_key='TEST-1')
+        text = self.metrics.to_prometheus()
+        self.assertIn('# TYPE backlog_request_duration_seconds histogram', text)
+        self.assertIn('backlog_requests_total{endpoint="issues/{id}",method="GET",status="200"} 1', text)
+        self.assertIn('backlog_request_duration_seconds_bucket{endpoint="issues/{id}",le="+Inf",method="GET"} 1', text)
+        self.assertIn('backlog_request_duration_seconds_count{endpoint="issues/{id}",method="GET"} 1', text)
+        self.metrics.reset()
+        self.assertNotIn('issues/{id}', self.metrics.to_prometheus())
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(RequestSender(self.config, transport=FakeTransport()).metrics)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+
+from pybacklogpy.Issue import Issue, IssueComment, IssueType
+from pybacklogpy.Notification import Notification
+from pybacklogpy.SharedFile import SharedFile
+from pybacklogpy.User import User
+from pybacklogpy.Wiki import Wiki
+from pybacklogpy.mockserver import MockBacklogServer
+from pybacklogpy.modules import RequestSender
+from pybacklogpy.retry import RetryPolicy
+from pybacklogpy.transport import Transport
+
+
+class Test(unittest.TestCase):
+    def start_server(self, **kwargs) -> MockBacklogServer:
+        server = MockBacklogServer(**kwargs).start()
+        self.addCleanup(server.stop)
+        self.project = server.state.add_project('TEST', 'テスト')
+        self.config = server.configure()
+        transport = Transport()
+        self.addCleanup(transport.close)
+        self.config.request_sender = RequestSender(self.config, transport=transport,
+                                                   retry_policy=RetryPolicy(max_retries=0))
+        # サーバーのレート制限をそのまま確かめるため、クライアント側では待たない
+        self.config.request_sender.rate_limiter = None
+        return server
+
+    def add_issue(self, summary: str = '課題') -> dict:
+        issue_type_id = IssueType(self.config).get_issue_type_list(project_id_or_key='TEST').json()[0]['id']
+        response = Issue(self.config).add_issue(project_id=self.project['id'], summary=summary,
+                                                issue_type_id=issue_type_id, priority_id=3)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['issueType']['id'], issue_type_id)
+        return response.json()
+
+    def test_configure(self):
+        server = self.start_server()
+        self.assertEqual(self.config.scheme, 'http')
+        self.assertEqual(self.config.request_sender.api_url, 'http://{host}/api/v2/'.format(host=server.host))
+        self.assertEqual(User(self.config).get_own_user().json()['userId'], 'admin')
+
+    def test_issue_and_comment(self):
+        self.start_server()
+        issue = self.add_issue()
+        self.assertEqual(issue['issueKey'], 'TEST-1')
+        issue_api = Issue(self.config)
+        response = issue_api.update_issue(issue_id_or_key='TEST-1', status_id=4, comment='完了しました',
+                                          notified_user_id=[1])
+        self.assertEqual(response.json()['status']['name'], '完了')
+        self.add_issue('別の課題')
+        self.assertEqual(issue_api.count_issue().json()['count'], 2)
+        self.assertEqual([i['issueKey'] for i in issue_api.get_issue_list(status_id=[4]).json()], ['TEST-1'])
+
+        comments = IssueComment(self.config).get_comment_list(issue_id_or_key='TEST-1').json()
+        self.assertEqual([c['content'] for c in comments], ['完了しました'])
+        notification = Notification(self.config)
+        self.assertEqual(notification.count_notification().json()['count'], 1)
+        self.assertEqual(notification.get_notification().json()[0]['comment']['id'], comments[0]['id'])
+
+        self.assertTrue(issue_api.delete_issue(issue_id_or_key='TEST-1').ok)
+        self.assertEqual(issue_api.get_issue(issue_id_or_key='TEST-1').status_code, 404)
+
+    def test_wiki_and_shared_file(self):
+        server = self.start_server()
+        wiki = Wiki(self.config)
+        wiki_id = wiki.add_wiki_page(project_id=self.project['id'], name='Home', content='# Home').json()['id']
+        wiki.update_wiki_page(wiki_id=wiki_id, content='更新')
+        self.assertEqual(wiki.get_wiki_page(wiki_id=wiki_id).json()['content'], '更新')
+        self.assertEqual(wiki.count_wiki_page(project_id_or_key='TEST').json()['count'], 1)
+
+        shared_file = server.state.add_shared_file('TEST', '/docs/', 'document.txt', '内容'.encode('utf-8'))
+        files = SharedFile(self.config).get_list_of_shared_files(project_id_or_key='TEST', file_path='docs').json()
+        self.assertEqual([f['name'] for f in files], ['document.txt'])
+        with tempfile.TemporaryDirectory() as directory:
+            filepath, _ = SharedFile(self.config).get_file(project_id_or_key='TEST', shared_file_id=shared_file['id'],
+                                                           destination=directory)
+            self.assertEqual(os.path.basename(filepath), 'document.txt')
+            with open(filepath, encoding='utf-8') as f:
+                self.assertEqual(f.read(), '内容')
+
+    def test_rate_limit(self):
+        self.start_server(rate_limits={'read': 2})
+        user = User(self.config)
+        first = user.get_own_user()
+        self.assertEqual(first.headers['X-RateLimit-Limit'], '2')
+        self.assertEqual(first.headers['X-RateLimit-Remaining'], '1')
+        self.assertEqual(user.get_own_user().status_code, 200)
+        self.assertEqual(user.get_own_user().status_code, 429)
+        self.assertEqual(Issue(self.config).count_issue().status_code, 200, msg='別の種別のレート制限と共有されている')
+
+    def test_error_injection_and_authentication(self):
+        server = self.start_server(error_rate=1.0, error_status=503, random_seed=1)
+        self.assertEqual(User(self.config).get_own_user().status_code, 503)
+        server.error_rate = 0.0
+        self.config.request_sender.payload['apiKey'] = 'wrong'
+        self.assertEqual(User(self.config).get_own_user().status_code, 401)
+        self.assertEqual(server.request_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
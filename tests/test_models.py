@@ -0,0 +1,70 @@
+import unittest
+
+from pybacklogpy import models
+from tests.utils import make_response
+
+USER = {'id': 1, 'userId': 'admin', 'name': 'admin', 'roleType': 1, 'lang': 'ja', 'mailAddress': 'eguchi@nulab.example'}
+STATUS = {'id': 1, 'projectId': 1, 'name': '未対応', 'color': '#ed8077', 'displayOrder': 1000}
+
+
+def issue_data(issue_id: int) -> dict:
+    return {
+        'id': issue_id,
+        'projectId': 1,
+        'issueKey': 'BLG-{0}'.format(issue_id),
+        'summary': 'first issue',
+        'status': dict(STATUS),
+        'assignee': dict(USER),
+        'createdUser': dict(USER),
+        'category': [{'id': 10, 'name': 'Development', 'displayOrder': 0}],
+        'attachments': [],
+        'unknownKey': 'value',
+    }
+
+
+class Test(unittest.TestCase):
+    def test_from_dict(self):
+        issue = models.Issue.from_dict(issue_data(1))
+        self.assertEqual(issue.issue_key, 'BLG-1')
+        self.assertEqual(issue.project_id, 1)
+        self.assertIsNone(issue.due_date, msg='レスポンスに無いキーが None になっていない')
+        self.assertEqual(issue.extra, {'unknownKey': 'value'})
+        self.assertFalse(hasattr(issue, '__dict__'), msg='__slots__ が使われていない')
+
+    def test_lazy_nested(self):
+        issue = models.Issue.from_dict(issue_data(1))
+        self.assertIsInstance(issue._status, dict, msg='参照する前に入れ子のオブジェクトが変換されている')
+        self.assertIsInstance(issue.status, models.Status)
+        self.assertEqual(issue.status.name, '未対応')
+        self.assertIs(issue.status, issue.status, msg='変換したオブジェクトが保持されていない')
+        self.assertEqual(issue.category[0].name, 'Development')
+        self.assertEqual(issue.attachments, [])
+        self.assertIsNone(issue.resolution)
+
+    def test_from_list_shares_nested(self):
+        issues = models.Issue.from_list([issue_data(i) for i in range(3)])
+        self.assertIs(issues[0].status, issues[2].status, msg='同じ ID の入れ子のオブジェクトが共有されていない')
+        self.assertIs(issues[0].assignee, issues[1].created_user)
+        self.assertEqual(issues[1].assignee.user_id, 'admin')
+
+    def test_from_response(self):
+        response = make_response(body=[issue_data(1), issue_data(2)])
+        issues = models.Issue.from_response(response)
+        self.assertEqual([issue.id for issue in issues], [1, 2])
+
+        user = models.User.from_response(make_response(body=USER))
+        self.assertEqual(user.mail_address, 'eguchi@nulab.example')
+
+        with self.assertRaises(Exception):
+            models.Issue.from_response(make_response(status_code=404, body={'errors': []}))
+
+    def test_to_dict(self):
+        data = issue_data(1)
+        result = models.Issue.from_dict(data).to_dict()
+        self.assertEqual(result['unknownKey'], 'value')
+        self.assertEqual(result['status'], STATUS)
+        self.assertEqual(result['category'], data['category'])
+
+
+if __name__ == '__main__':
+    unittest.main()
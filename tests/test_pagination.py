@@ -0,0 +1,154 @@
+import unittest
+
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+from pybacklogpy.Issue import Issue, IssueComment
+from pybacklogpy.Notification import Notification
+from pybacklogpy.Project import Project
+from pybacklogpy.SharedFile import SharedFile
+from pybacklogpy.modules import RequestSender
+from tests.utils import FakeTransport, make_response
+
+
+def offset_handler(total: int):
+    def handler(method, url, kwargs):
+        offset = int(kwargs['params'].get('offset', 0))
+        count = int(kwargs['params'].get('count', 20))
+        return make_response(body=[{'id': i} for i in range(offset, min(offset + count, total))])
+    return handler
+
+
+def cursor_handler(ids: list):
+    """
+    minId / maxId を含まない範囲で返すサーバーを模倣する
+    """
+    def handler(method, url, kwargs):
+        params = kwargs['params']
+        count = int(params.get('count', 20))
+        items = [i for i in sorted(ids, reverse=params.get('order', 'desc') == 'desc')
+                 if ('minId' not in params or i > int(params['minId']))
+                 and ('maxId' not in params or i < int(params['maxId']))]
+        return make_response(body=[{'id': i} for i in items[:count]])
+    return handler
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.config = BacklogComConfigure(space_key='kitadakyou', api_key='dummy_api_key')
+
+    def set_transport(self, handler) -> FakeTransport:
+        transport = FakeTransport(handler)
+        self.config.request_sender = RequestSender(self.config, transport=transport)
+        return transport
+
+    def test_iter_issue_list(self):
+        transport = self.set_transport(offset_handler(250))
+        issue = Issue(self.config)
+        issues = issue.iter_issue_list(project_id=[1])
+        self.assertEqual(len(transport.calls), 0, msg='イテレーターを作っただけでリクエストが送られている')
+        self.assertEqual([i['id'] for i in issues], list(range(250)))
+        self.assertEqual([call[2]['params']['offset'] for call in transport.calls], [0, 100, 200])
+        self.assertEqual(transport.calls[0][2]['params']['projectId[]'], [1])
+
+    def test_iter_issue_list_prefetch(self):
+        transport = self.set_transport(offset_handler(200))
+        issue = Issue(self.config)
+        self.assertEqual([i['id'] for i in issue.iter_issue_list(count=50, prefetch=True)], list(range(200)))
+        self.assertEqual(sorted(call[2]['params']['offset'] for call in transport.calls), [0, 50, 100, 150, 200])
+
+    def test_export_issue_list(self):
+        def handler(method, url, kwargs):
+            if url.endswith('/count'):
+                return make_response(body={'count': 450})
+            return offset_handler(450)(method, url, kwargs)
+
+        transport = self.set_transport(handler)
+        result = Issue(self.config).export_issue_list(max_workers=3, project_id=[1], sort='created')
+        self.assertEqual([i['id'] for i in result.items], list(range(450)))
+        self.assertEqual((result.total, result.duplicate_ids, result.missing_count), (450, [], 0))
+        self.assertEqual(sorted(call[2]['params']['offset'] for call in transport.calls[1:]), [0, 100, 200, 300, 400])
+        self.assertEqual(transport.calls[0][2]['params']['projectId[]'], [1])
+
+    def test_get_issues_by_ids(self):
+        deleted = {5, 250}
+
+        def handler(method, url, kwargs):
+            ids = kwargs['params']['id[]']
+            self.assertLessEqual(len(ids), 100)
+            self.assertEqual(int(kwargs['params']['count']), len(ids))
+            # 課題一覧は ID の降順で返る
+            return make_response(body=[{'id': i} for i in sorted(ids, reverse=True) if i not in deleted])
+
+        transport = self.set_transport(handler)
+        ids = list(range(300, 0, -1)) + [10, 20]
+        result = Issue(self.config).get_issues_by_ids(ids, max_workers=3)
+        self.assertEqual(len(transport.calls), 3)
+        self.assertEqual(list(result.items), [i for i in range(300, 0, -1) if i not in deleted])
+        self.assertEqual(result.items[10], {'id': 10})
+        self.assertEqual(result.missing_ids, [250, 5])
+        with self.assertRaises(ValueError):
+            Issue(self.config).get_issues_by_ids(ids, chunk_size=101)
+
+    def test_export_issue_list_shifted_pages(self):
+        def handler(method, url, kwargs):
+            if url.endswith('/count'):
+                return make_response(body={'count': 200})
+            offset = int(kwargs['params']['offset'])
+            # 2ページ目の取得前に課題が1件追加され、境界の課題が重複し、最後の課題が欠落した状態
+            if offset == 100:
+                offset -= 1
+            return make_response(body=[{'id': i} for i in range(offset, offset + 100)])
+
+        self.set_transport(handler)
+        result = Issue(self.config).export_issue_list()
+        self.assertEqual(result.duplicate_ids, [99])
+        self.assertEqual(result.missing_count, 1)
+
+    def test_iter_list_of_shared_files(self):
+        transport = self.set_transport(offset_handler(1500))
+        shared_file = SharedFile(self.config)
+        files = list(shared_file.iter_list_of_shared_files(project_id_or_key='TEST', file_path=''))
+        self.assertEqual(len(files), 1500)
+        self.assertEqual(len(transport.calls), 2)
+
+    def test_iter_comment_list(self):
+        transport = self.set_transport(cursor_handler(list(range(1, 251))))
+        issue_comment = IssueComment(self.config)
+        comments = [c['id'] for c in issue_comment.iter_comment_list(issue_id_or_key='TEST-1')]
+        self.assertEqual(comments, list(range(250, 0, -1)))
+        self.assertEqual([call[2]['params'].get('maxId') for call in transport.calls], [None, 151, 51])
+
+    def test_iter_notification_asc_until_id(self):
+        transport = self.set_transport(cursor_handler(list(range(1, 251))))
+        notification = Notification(self.config)
+        notifications = [n['id'] for n in notification.iter_notification(order='asc', min_id=10, max_id=200)]
+        self.assertEqual(notifications, list(range(11, 200)))
+        self.assertEqual([call[2]['params'].get('minId') for call in transport.calls], [10, 110])
+
+    def test_iter_project_recent_updates(self):
+        transport = self.set_transport(cursor_handler(list(range(1, 51))))
+        project = Project(self.config)
+        activities = [a['id'] for a in project.iter_project_recent_updates(project_id_or_key='TEST', count=20)]
+        self.assertEqual(activities, list(range(50, 0, -1)))
+        self.assertEqual(transport.calls[0][1], 'https://kitadakyou.backlog.com/api/v2/projects/TEST/activities')
+
+        project.get_project(project_id_or_key='TEST')
+        self.assertEqual(transport.calls[-1][1], 'https://kitadakyou.backlog.com/api/v2/projects/TEST')
+
+    def test_iter_cursor_inclusive_server(self):
+        def inclusive_handler(method, url, kwargs):
+            max_id = int(kwargs['params'].get('maxId', 30))
+            return make_response(body=[{'id': i} for i in range(max_id, max(max_id - 10, 0), -1)])
+
+        self.set_transport(inclusive_handler)
+        notification = Notification(self.config)
+        notifications = [n['id'] for n in notification.iter_notification(count=10)]
+        self.assertEqual(notifications, list(range(30, 0, -1)), msg='境界の要素が重複している')
+
+    def test_error_response(self):
+        self.set_transport(lambda method, url, kwargs: make_response(status_code=401, body={'errors': []}))
+        with self.assertRaises(Exception):
+            list(Issue(self.config).iter_issue_list())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import time
+import unittest
+
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+from pybacklogpy.Issue import Issue
+from pybacklogpy.modules import RequestSender
+from pybacklogpy.ratelimit import ICON, READ, SEARCH, UPDATE, RateLimiter, TokenBucket, classify_request
+from tests.utils import FakeTransport, make_response
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.config = BacklogComConfigure(space_key='kitadakyou', api_key='dummy_api_key')
+
+    def test_classify_request(self):
+        self.assertEqual(classify_request('GET', 'issues'), SEARCH)
+        self.assertEqual(classify_request('GET', 'issues/count'), SEARCH)
+        self.assertEqual(classify_request('GET', 'issues/TEST-1'), READ)
+        self.assertEqual(classify_request('GET', 'users/1/icon'), ICON)
+        self.assertEqual(classify_request('GET', 'space/image'), ICON)
+        self.assertEqual(classify_request('POST', 'issues'), UPDATE)
+        self.assertEqual(classify_request('DELETE', 'issues/TEST-1'), UPDATE)
+
+    def test_shared_per_api_key(self):
+        other_config = BacklogComConfigure(space_key='other', api_key='dummy_api_key')
+        self.assertIs(RequestSender(self.config).rate_limiter, RequestSender(other_config).rate_limiter)
+        another_key = BacklogComConfigure(space_key='kitadakyou', api_key='another_api_key')
+        self.assertIsNot(RequestSender(self.config).rate_limiter, RequestSender(another_key).rate_limiter)
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(limit=2, window=1.0)
+        self.assertEqual(bucket.try_acquire(), 0)
+        self.assertEqual(bucket.try_acquire(), 0)
+        self.assertGreater(bucket.try_acquire(), 0, msg='上限を超えてトークンが取り出せている')
+
+    def test_update_from_headers(self):
+        bucket = TokenBucket(limit=600)
+        bucket.update(limit=150, remaining=1, reset=int(time.time()) + 30)
+        self.assertEqual(bucket.limit, 150)
+        self.assertEqual(bucket.try_acquire(), 0)
+        self.assertGreater(bucket.try_acquire(), 1, msg='残り回数が0なのにリセット時刻まで待たない')
+
+    def test_wait_on_429(self):
+        responses = [
+            make_response(status_code=429, headers={'Retry-After': '0'}),
+            make_response(body=[], headers={'X-RateLimit-Limit': '150', 'X-RateLimit-Remaining': '149'}),
+        ]
+        transport = FakeTransport(lambda method, url, kwargs: responses.pop(0))
+        self.config.request_sender = RequestSender(self.config, transport=transport, rate_limiter=RateLimiter())
+        response = Issue(self.config).get_issue_list()
+        self.assertTrue(response.ok, msg='429 の後に再送されていない')
+        self.assertEqual(len(transport.calls), 2)
+        self.assertEqual(self.config.request_sender.rate_limiter.buckets[SEARCH].limit, 150)
+
+
+if __name__ == '__main__':
+    unittest.main()
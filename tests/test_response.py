@@ -0,0 +1,75 @@
+import json
+import unittest
+
+from pybacklogpy import response as backlog_response
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+from pybacklogpy.Priority import Priority
+from pybacklogpy.cache import ResponseCache
+from pybacklogpy.modules import RequestSender
+from pybacklogpy.response import BacklogResponse, get_json_loads, set_json_loads
+from tests.utils import FakeTransport, make_response, response_to_json
+
+PRIORITIES = [{'id': 2, 'name': '高'}, {'id': 3, 'name': '中'}, {'id': 4, 'name': '低'}]
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.config = BacklogComConfigure(space_key='kitadakyou', api_key='dummy_api_key')
+        self.transport = FakeTransport(lambda method, url, kwargs: make_response(body=PRIORITIES))
+        self.config.request_sender = RequestSender(self.config, transport=self.transport)
+        self.decoded = []
+
+        def counting_loads(content):
+            self.decoded.append(content)
+            return json.loads(content.decode('utf-8'))
+
+        set_json_loads(counting_loads)
+
+    def tearDown(self):
+        set_json_loads(None)
+
+    def test_decode_once(self):
+        response = Priority(self.config).get_priority_list()
+        self.assertIsInstance(response, BacklogResponse)
+        self.assertEqual(response.json(), PRIORITIES)
+        self.assertIs(response.json(), response.json(), msg='デコード結果が保持されていない')
+        self.assertEqual(response_to_json(response), PRIORITIES)
+        self.assertEqual(len(self.decoded), 1, msg='本文が複数回デコードされている')
+        self.assertIs(response.text, response.text)
+
+    def test_cached_response(self):
+        self.config.request_sender.cache = ResponseCache()
+        priority = Priority(self.config)
+        first = priority.get_priority_list()
+        first.json()
+        second = priority.get_priority_list()
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.json(), PRIORITIES)
+        self.assertIs(second.content, first.content, msg='キャッシュしたレスポンスの本文を共有していない')
+        self.assertEqual(len(self.transport.calls), 1)
+
+    def test_mutate_cached_response(self):
+        self.config.request_sender.cache = ResponseCache()
+        priority = Priority(self.config)
+        first = priority.get_priority_list()
+        first.json().append({'id': 5, 'name': '最低'})
+        first.json()[0]['name'] = '変更'
+        second = priority.get_priority_list()
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.json(), PRIORITIES, msg='変更したデコード結果がキャッシュに残っている')
+        second.json().pop()
+        self.assertEqual(priority.get_priority_list().json(), PRIORITIES)
+
+    def test_default_backend(self):
+        set_json_loads(None)
+        self.assertEqual(get_json_loads()(b'{"name": "\\u9ad8"}'), {'name': '高'})
+        self.assertEqual(backlog_response._stdlib_loads('{"name": "高"}'.encode('utf-8')), {'name': '高'})
+
+    def test_json_kwargs(self):
+        response = BacklogResponse.wrap(make_response(body=PRIORITIES))
+        self.assertEqual(response.json(object_hook=lambda d: d['id']), [2, 3, 4])
+        self.assertEqual(self.decoded, [], msg='引数を指定した場合に差し替えた関数でデコードしている')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import unittest
+from requests import exceptions
+
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+from pybacklogpy.SharedFile import SharedFile
+from pybacklogpy.download import split_ranges
+from pybacklogpy.modules import RequestSender
+from tests.utils import FakeTransport, make_response
+
+CONTENT = bytes(range(256)) * 40
+
+
+class BrokenStream(io.BytesIO):
+    """
+    fail_after バイト読んだところで接続が切れるストリーム
+    """
+
+    def __init__(self, data: bytes, fail_after: int):
+        super(BrokenStream, self).__init__(data)
+        self.fail_after = fail_after
+
+    def read(self, size=-1):
+        if self.tell() >= self.fail_after:
+            raise exceptions.ConnectionError('接続が切れました')
+        return super(BrokenStream, self).read(min(size, self.fail_after - self.tell()))
+
+
+def range_handler(content=CONTENT, etag='"v1"', fail_after=None):
+    def handler(method, url, kwargs):
+        headers = {'Content-Disposition': "attachment;filename*=UTF-8''large.bin", 'ETag': etag}
+        m = re.match(r'bytes=(\d+)-(\d+)', (kwargs.get('headers') or {}).get('Range', ''))
+        if_range = (kwargs.get('headers') or {}).get('If-Range')
+        if not m or (if_range is not None and if_range != etag):
+            return make_response(body=content, headers=headers, url=url)
+        start, end = int(m.group(1)), int(m.group(2))
+        if start >= len(content):
+            headers['Content-Range'] = 'bytes */{0}'.format(len(content))
+            return make_response(status_code=416, headers=headers, url=url)
+        headers['Content-Range'] = 'bytes {0}-{1}/{2}'.format(start, end, len(content))
+        body = content[start:end + 1]
+        response = make_response(status_code=206, headers=headers, url=url)
+        if fail_after is not None and len(body) > 1:
+            response._content = False
+            response._content_consumed = False
+            response.raw = BrokenStream(body, fail_after)
+        else:
+            response._content = body
+        return response
+    return handler
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.config = BacklogComConfigure(space_key='kitadakyou', api_key='dummy_api_key')
+        self.transport = FakeTransport(range_handler())
+        self.config.request_sender = RequestSender(self.config, transport=self.transport)
+        self.directory = tempfile.mkdtemp()
+        self.destination = os.path.join(self.directory, 'large.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def get_file(self, **kwargs):
+        return SharedFile(self.config).get_file(project_id_or_key='TEST', shared_file_id=1, chunk_size=512, **kwargs)
+
+    def test_parallel_segments(self):
+        progress = []
+        filepath, response = self.get_file(destination=self.directory, segments=4,
+                                           sha256=hashlib.sha256(CONTENT).hexdigest(),
+                                           progress=lambda downloaded, total: progress.append(downloaded))
+        self.assertEqual(filepath, self.destination)
+        with open(filepath, mode='rb') as f:
+            self.assertEqual(f.read(), CONTENT, msg='分割してダウンロードしたファイルの内容が違う')
+        self.assertEqual(sorted(os.listdir(self.directory)), ['large.bin'], msg='途中経過のファイルが残っている')
+        ranges = sorted(call[2]['headers']['Range'] for call in self.transport.calls[1:])
+        self.assertEqual(ranges, ['bytes=0-2559', 'bytes=2560-5119', 'bytes=5120-7679', 'bytes=7680-10239'])
+        self.assertEqual(max(progress), len(CONTENT))
+
+    def test_resume_after_interruption(self):
+        self.config.request_sender.retry_policy = None
+        self.transport.handler = range_handler(fail_after=3000)
+        with self.assertRaises(exceptions.ConnectionError):
+            self.get_file(destination=self.destination, resume=True)
+        with open(self.destination + '.part.json', encoding='utf-8') as f:
+            state = json.load(f)
+        self.assertEqual(state['segments'], [[0, len(CONTENT), 3000]], msg='途中経過が記録されていない')
+
+        self.transport.calls = []
+        self.transport.handler = range_handler()
+        filepath, _ = self.get_file(destination=self.destination, resume=True)
+        self.assertEqual(self.transport.calls[1][2]['headers']['Range'], 'bytes=3000-10239',
+                         msg='続きからダウンロードしていない')
+        with open(filepath, mode='rb') as f:
+            self.assertEqual(f.read(), CONTENT)
+
+    def test_retry_within_call(self):
+        handler = range_handler(fail_after=1000)
+
+        def flaky(method, url, kwargs):
+            response = handler(method, url, kwargs)
+            if len(self.transport.calls) == 2:
+                self.transport.handler = range_handler()
+            return response
+
+        self.transport.handler = flaky
+        self.config.request_sender.retry_policy.backoff_factor = 0
+        filepath, _ = self.get_file(destination=self.destination, resume=True)
+        self.assertEqual(self.transport.calls[2][2]['headers']['Range'], 'bytes=1000-10239',
+                         msg='切断された位置から取得し直していない')
+        with open(filepath, mode='rb') as f:
+            self.assertEqual(f.read(), CONTENT)
+
+    def test_restart_when_file_changed(self):
+        self.config.request_sender.retry_policy = None
+        self.transport.handler = range_handler(fail_after=3000)
+        with self.assertRaises(exceptions.ConnectionError):
+            self.get_file(destination=self.destination, resume=True)
+
+        changed = CONTENT[::-1]
+        self.transport.calls = []
+        self.transport.handler = range_handler(content=changed, etag='"v2"')
+        filepath, _ = self.get_file(destination=self.destination, resume=True)
+        self.assertEqual(self.transport.calls[1][2]['headers']['Range'], 'bytes=0-10239',
+                         msg='サーバー上のファイルが変わったのに続きからダウンロードしている')
+        with open(filepath, mode='rb') as f:
+            self.assertEqual(f.read(), changed)
+
+    def test_sha256_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.get_file(destination=self.destination, resume=True, sha256='0' * 64)
+        self.assertEqual(os.listdir(self.directory), [], msg='検査に失敗したファイルが残っている')
+
+    def test_range_not_supported(self):
+        self.transport.handler = lambda method, url, kwargs: make_response(
+            body=CONTENT, headers={'Content-Disposition': "attachment;filename*=UTF-8''large.bin"}, url=url)
+        filepath, response = self.get_file(destination=self.directory, segments=4)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.transport.calls), 1)
+        with open(filepath, mode='rb') as f:
+            self.assertEqual(f.read(), CONTENT)
+
+    def test_empty_file(self):
+        self.transport.handler = range_handler(content=b'')
+        filepath, response = self.get_file(destination=self.directory, resume=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(filepath, self.destination)
+        self.assertEqual(os.path.getsize(filepath), 0)
+        self.assertNotIn('Range', self.transport.calls[-1][2].get('headers') or {})
+
+    def test_split_ranges(self):
+        self.assertEqual(split_ranges(10, 4), [[0, 3, 0], [3, 6, 0], [6, 9, 0], [9, 10, 0]])
+        self.assertEqual(split_ranges(2, 4), [[0, 1, 0], [1, 2, 0]])
+        self.assertEqual(split_ranges(0, 4), [[0, 0, 0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
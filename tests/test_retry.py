@@ -0,0 +1,70 @@
+import unittest
+
+from requests.exceptions import ConnectionError
+
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+from pybacklogpy.Issue import Issue
+from pybacklogpy.modules import RequestSender
+from pybacklogpy.retry import RetryPolicy
+from tests.utils import FakeTransport, make_response
+
+
+def sequence_handler(results: list):
+    def handler(method, url, kwargs):
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return handler
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.config = BacklogComConfigure(space_key='kitadakyou', api_key='dummy_api_key')
+
+    def set_transport(self, results: list, retry_policy: RetryPolicy) -> FakeTransport:
+        transport = FakeTransport(sequence_handler(results))
+        self.config.request_sender = RequestSender(self.config, transport=transport, retry_policy=retry_policy)
+        return transport
+
+    def test_retry_get(self):
+        transport = self.set_transport([make_response(status_code=503), ConnectionError(), make_response(body={})],
+                                       RetryPolicy(backoff_factor=0.01, jitter=False))
+        response = Issue(self.config).get_issue(issue_id_or_key='TEST-1')
+        self.assertTrue(response.ok, msg='一時的なエラーの後に再送されていない')
+        self.assertEqual(len(transport.calls), 3)
+        self.assertEqual(response.retry_count, 2)
+        self.assertEqual(response.retry_delays, [0.01, 0.02])
+
+    def test_retry_exhausted(self):
+        transport = self.set_transport([make_response(status_code=500)] * 3,
+                                       RetryPolicy(max_retries=2, backoff_factor=0))
+        response = Issue(self.config).get_issue(issue_id_or_key='TEST-1')
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(len(transport.calls), 3)
+        self.assertEqual(response.retry_count, 2)
+
+    def test_retry_exception_exhausted(self):
+        self.set_transport([ConnectionError(), ConnectionError()], RetryPolicy(max_retries=1, backoff_factor=0))
+        with self.assertRaises(ConnectionError) as cm:
+            Issue(self.config).get_issue(issue_id_or_key='TEST-1')
+        self.assertEqual(cm.exception.retry_count, 1)
+
+    def test_no_retry_post(self):
+        transport = self.set_transport([make_response(status_code=503), make_response(body={})],
+                                       RetryPolicy(backoff_factor=0))
+        response = Issue(self.config).add_issue(project_id=1, summary='test', issue_type_id=1, priority_id=3)
+        self.assertEqual(response.status_code, 503, msg='冪等でない POST が再送されている')
+        self.assertEqual(len(transport.calls), 1)
+
+    def test_retry_post_marked_idempotent(self):
+        transport = self.set_transport([make_response(status_code=503), make_response(body={})],
+                                       RetryPolicy(backoff_factor=0))
+        response = self.config.request_sender.send_post_request(path='notifications/markAsRead', request_param={},
+                                                                idempotent=True)
+        self.assertTrue(response.ok, msg='冪等と指定した POST が再送されていない')
+        self.assertEqual(len(transport.calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
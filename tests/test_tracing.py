@@ -0,0 +1,105 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+from pybacklogpy.Issue import Issue
+from pybacklogpy.SharedFile import SharedFile
+from pybacklogpy.modules import RequestSender
+from pybacklogpy.tracing import JsonLinesExporter, Tracer, TracingTransport
+from tests.utils import FakeTransport, make_response
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{"id": 1}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.config = BacklogComConfigure(space_key='kitadakyou', api_key='dummy_api_key')
+        self.spans = []
+        self.tracer = Tracer(exporter=self.spans.append)
+
+        def handler(method, url, kwargs):
+            if '/files/' in url:
+                return make_response(body=b'0123456789', headers={'Content-Disposition': 'attachment; filename=a.txt'})
+            return make_response(body={'id': 1}, headers={'Content-Type': 'application/json'})
+
+        self.transport = FakeTransport(handler)
+        self.config.request_sender = RequestSender(self.config, transport=self.transport, tracer=self.tracer)
+
+    def test_send_request_span(self):
+        Issue(self.config).get_issue(issue_id_or_key='TEST-1')
+        self.assertEqual(len(self.spans), 1)
+        span = self.spans[0]
+        self.assertEqual(span.name, 'send_get_request')
+        self.assertEqual(span.endpoint, 'issues/{id}')
+        self.assertEqual(span.status_code, 200)
+        self.assertEqual(span.response_bytes, len(b'{"id": 1}'))
+        self.assertIsNotNone(span.decode)
+        self.assertEqual(len(span.attempts), 1)
+        self.assertIsNotNone(span.attempts[0]['ttfb'])
+        self.assertTrue(self.transport.calls[0][2]['stream'], msg='ヘッダーと本文を分けて測れない')
+
+    def test_get_file_span(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filepath, _ = SharedFile(self.config).get_file(project_id_or_key='TEST', shared_file_id=1,
+                                                           destination=directory)
+            self.assertTrue(os.path.exists(filepath))
+        get_file_span = self.spans[-1]
+        self.assertEqual(get_file_span.name, 'get_file')
+        self.assertEqual(get_file_span.response_bytes, 10)
+        self.assertEqual(self.spans[0].parent_id, get_file_span.span_id)
+        self.assertEqual(self.spans[0].trace_id, get_file_span.trace_id)
+
+    def test_json_lines_exporter(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'trace.jsonl')
+            self.tracer.exporter = JsonLinesExporter(filepath)
+            Issue(self.config).get_issue(issue_id_or_key='TEST-1')
+            Issue(self.config).get_issue(issue_id_or_key='TEST-2')
+            with open(filepath, encoding='utf-8') as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual([line['path'] for line in lines], ['issues/TEST-1', 'issues/TEST-2'])
+        self.assertEqual(lines[0]['attempts'][0]['status_code'], 200)
+
+    def test_connection_reuse(self):
+        server = HTTPServer(('127.0.0.1', 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        transport = TracingTransport()
+        url = 'http://127.0.0.1:{port}/'.format(port=server.server_port)
+        try:
+            for _ in range(2):
+                with self.tracer.span('send_get_request', 'GET', 'space'):
+                    self.tracer.request(transport, 'GET', url)
+        finally:
+            transport.close()
+            server.shutdown()
+            server.server_close()
+        first, second = (span.attempts[0] for span in self.spans)
+        self.assertFalse(first['connection_reused'])
+        self.assertIsNotNone(first['connect'])
+        self.assertTrue(second['connection_reused'])
+        self.assertIsNone(second['connect'])
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(RequestSender(self.config, transport=FakeTransport()).tracer)
+
+
+if __name__ == '__main__':
+    unittest.main()
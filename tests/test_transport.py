@@ -0,0 +1,48 @@
+import unittest
+
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+from pybacklogpy.Issue import Issue, IssueComment
+from pybacklogpy.Priority import Priority
+from pybacklogpy.Wiki import Wiki
+from pybacklogpy.modules import RequestSender, get_request_sender
+from pybacklogpy.transport import Transport, get_default_transport
+from tests.utils import FakeTransport
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.config = BacklogComConfigure(space_key='kitadakyou', api_key='dummy_api_key')
+
+    def test_share_request_sender(self):
+        issue = Issue(self.config)
+        issue_comment = IssueComment(self.config)
+        wiki = Wiki(self.config)
+        self.assertIs(issue.rs, issue_comment.rs, msg='同じ設定から作ったクラスで RequestSender が共有されていない')
+        self.assertIs(issue.rs, wiki.rs, msg='同じ設定から作ったクラスで RequestSender が共有されていない')
+        self.assertIs(issue.rs.transport, get_default_transport(), msg='既定の Transport が共有されていない')
+
+        other_config = BacklogComConfigure(space_key='other', api_key='dummy_api_key')
+        self.assertIsNot(Issue(other_config).rs, issue.rs, msg='別の設定で RequestSender が共有されている')
+
+    def test_custom_transport(self):
+        transport = FakeTransport()
+        self.config.request_sender = RequestSender(self.config, transport=transport)
+        self.assertIs(get_request_sender(self.config).transport, transport)
+
+        Priority(self.config).get_priority_list()
+        method, url, kwargs = transport.calls[0]
+        self.assertEqual(method, 'GET')
+        self.assertEqual(url, 'https://kitadakyou.backlog.com/api/v2/priorities')
+        self.assertEqual(kwargs['params']['apiKey'], 'dummy_api_key')
+
+    def test_pool_settings(self):
+        transport = Transport(pool_connections=2, pool_maxsize=32, keep_alive=False)
+        adapter = transport.session.get_adapter('https://kitadakyou.backlog.com/')
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertEqual(transport.session.headers['Connection'], 'close')
+        transport.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
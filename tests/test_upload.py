@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from pybacklogpy.Attachment import Attachment
+from pybacklogpy.BacklogConfigure import BacklogComConfigure
+from pybacklogpy.modules import RequestSender
+from pybacklogpy.upload import MultipartStream
+from tests.utils import FakeTransport, make_response
+
+
+def parse_multipart(kwargs: dict) -> bytes:
+    """
+    送信された multipart/form-data の本文から、ファイルの内容を取り出す
+    """
+    body = kwargs['data'].read()
+    assert len(body) == int(kwargs['headers']['Content-Length'])
+    boundary = kwargs['headers']['Content-Type'].split('boundary=')[1].encode('ascii')
+    part = body.split(b'--' + boundary)[1]
+    return part.split(b'\r\n\r\n', 1)[1][:-2]
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.config = BacklogComConfigure(space_key='kitadakyou', api_key='dummy_api_key')
+        self.received = []
+        self.lock = threading.Lock()
+
+        def handler(method, url, kwargs):
+            content = parse_multipart(kwargs)
+            with self.lock:
+                self.received.append(content)
+                attachment_id = len(self.received)
+            return make_response(body={'id': attachment_id, 'name': 'file', 'size': len(content)})
+
+        self.transport = FakeTransport(handler)
+        self.config.request_sender = RequestSender(self.config, transport=self.transport)
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_file(self, name: str, content: bytes) -> str:
+        filepath = os.path.join(self.directory, name)
+        with open(filepath, mode='wb') as f:
+            f.write(content)
+        return filepath
+
+    def test_post_attachment_file(self):
+        filepath = self.write_file('build.log', b'log line\n' * 10000)
+        progress = []
+        response = Attachment(self.config).post_attachment_file(
+            filepath=filepath, filename='build.log', progress=lambda sent, total: progress.append((sent, total)))
+        self.assertTrue(response.ok)
+        self.assertEqual(self.received[0], b'log line\n' * 10000)
+        body = self.transport.calls[0][2]['data']
+        self.assertIsInstance(body, MultipartStream, msg='ストリームで送信していない')
+        self.assertIsNone(body._parts[1]._file, msg='ファイルが閉じられていない')
+        self.assertEqual(progress[-1], (len(body), len(body)))
+
+    def test_sources(self):
+        attachment = Attachment(self.config)
+        attachment.post_attachment_file(filepath=memoryview(b'memory'), filename='memory.txt')
+        with open(self.write_file('object.txt', b'file object'), mode='rb') as f:
+            attachment.post_attachment_file(filepath=f, filename='object.txt')
+            self.assertFalse(f.closed, msg='呼び出し元のファイルオブジェクトが閉じられている')
+        self.assertEqual(self.received, [b'memory', b'file object'])
+
+    def test_retry_rewinds_body(self):
+        handler = self.transport.handler
+
+        def unavailable_once(method, url, kwargs):
+            if len(self.transport.calls) == 1:
+                parse_multipart(kwargs)  # 本文を最後まで読んでから 503 を返す
+                return make_response(status_code=503)
+            return handler(method, url, kwargs)
+
+        self.transport.handler = unavailable_once
+        self.config.request_sender.retry_policy.backoff_factor = 0
+        body = MultipartStream('file', 'retry.txt', b'retry')
+        response = self.config.request_sender._send('POST', 'space/attachment', idempotent=True, data=body,
+                                                    headers={'Content-Type': body.content_type,
+                                                             'Content-Length': str(len(body))})
+        self.assertTrue(response.ok)
+        self.assertEqual(len(self.transport.calls), 2)
+        self.assertEqual(self.received, [b'retry'], msg='再送時に本文が先頭から送信されていない')
+
+    def test_post_attachment_files(self):
+        paths = [self.write_file('artifact{0}.bin'.format(i), bytes([i]) * (1000 * (i + 1))) for i in range(5)]
+        progress = []
+        attachment_ids = Attachment(self.config).post_attachment_files(
+            paths + [('extra.txt', b'extra')], max_workers=3,
+            progress=lambda sent, total: progress.append((sent, total)))
+        self.assertEqual(sorted(attachment_ids), [1, 2, 3, 4, 5, 6])
+        contents = [self.received[attachment_id - 1] for attachment_id in attachment_ids]
+        self.assertEqual(contents, [bytes([i]) * (1000 * (i + 1)) for i in range(5)] + [b'extra'],
+                         msg='添付ファイルの ID が渡した順番に並んでいない')
+        self.assertEqual(progress[-1][0], progress[-1][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,27 @@
 from datetime import datetime
 import json
+import os
 from requests import Response
-from typing import List, Tuple, Union
+from requests.structures import CaseInsensitiveDict
+from typing import Callable, List, Optional, Tuple, Union
 
 
 from pybacklogpy.Issue import Issue
 from pybacklogpy.Project import Project
 from pybacklogpy.User import User
 from pybacklogpy.Wiki import Wiki
+from pybacklogpy.cassette import use_cassette
+from pybacklogpy.transport import Transport
 from tests import data
 
+# BACKLOG_CASSETTE にファイルの PATH を指定すると、 Backlog との通信をカセットから再生する
+# BACKLOG_CASSETTE_MODE=record の場合は、実際に通信してカセットに記録し直す
+if os.environ.get('BACKLOG_CASSETTE'):
+    use_cassette(os.environ['BACKLOG_CASSETTE'],
+                 mode=os.environ.get('BACKLOG_CASSETTE_MODE', 'replay'),
+                 latency=float(os.environ.get('BACKLOG_CASSETTE_LATENCY', 0)),
+                 match_data=False)
+
 
 def get_myself_user_id() -> int:
     user = User()
@@ -79,4 +91,44 @@ def response_to_json(r: Response) -> Union[dict, List[dict]]:
     :param r: Response オブジェクト
     :return: List または Dict オブジェクト
     """
-    return json.loads(r.text)
+    return r.json()
+
+
+def make_response(status_code: int = 200,
+                  body: Union[bytes, list, dict] = b'',
+                  headers: Optional[dict] = None,
+                  url: str = '') -> Response:
+    """
+    ネットワークを使わずに Response オブジェクトを作る
+    :param status_code: ステータスコード
+    :param body: 本文 list または dict の場合は JSON にする
+    :param headers: レスポンスヘッダー
+    :param url: リクエストしたURL
+    :return: Response オブジェクト
+    """
+    if not isinstance(body, bytes):
+        body = json.dumps(body).encode('utf-8')
+    response = Response()
+    response.status_code = status_code
+    response._content = body
+    response._content_consumed = True
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.url = url
+    response.encoding = 'utf-8'
+    return response
+
+
+class FakeTransport(Transport):
+    """
+    実際には通信せず、handler が返した Response を返す Transport
+    送信されたリクエストは calls に (method, url, kwargs) の形で記録される
+    """
+
+    def __init__(self, handler: Optional[Callable[[str, str, dict], Response]] = None):
+        super(FakeTransport, self).__init__()
+        self.handler = handler if handler else (lambda method, url, kwargs: make_response(body=[]))
+        self.calls = []
+
+    def request(self, method: str, url: str, **kwargs) -> Response:
+        self.calls.append((method, url, kwargs))
+        return self.handler(method, url, kwargs)